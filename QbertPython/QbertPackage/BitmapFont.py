@@ -0,0 +1,179 @@
+'''
+This class represents a bitmap font read from a BMFont descriptor and its glyph atlas.
+
+The descriptor is parsed once and every glyph is cut from the atlas as a
+subsurface, so drawing a text is a single batch of blits with no rasterization.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import os
+import re
+import pygame
+
+class BitmapFont(object):
+    '''
+    Variables:
+    FIELD: The pattern of a descriptor field
+    FALLBACK: The character drawn for the characters missing in the font
+    scale: The scale applied to the atlas
+    lineHeight: The distance between lines
+    base: The distance from the top of a line to the base of the characters
+    glyphs: The surface, x offset, y offset and advance of every character
+    kernings: The advance adjustment of every pair of characters
+    '''
+    FIELD = re.compile(r'(\w+)=("[^"]*"|\S+)')      # The pattern of a descriptor field
+    FALLBACK = 0                                    # The character drawn for the characters missing in the font
+
+    def __init__(self, fileName, size = None):
+        '''
+        Creates a new BitmapFont reading the descriptor and its atlas.
+        @param self The current object
+        @param fileName The BMFont text descriptor file name.
+        @param size The size of the font, None to use the size of the atlas.
+        @return A new instance of the BitmapFont
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.glyphs = {}                                                # No glyphs yet
+        self.kernings = {}                                              # No kernings yet
+        pages = {}                                                      # The atlas of every page
+        chars = []                                                      # The character fields
+        with open(fileName) as descriptor:                              # Open the descriptor
+            for line in descriptor:                                     # Loop through the lines
+                tag, _, rest = line.strip().partition(" ")              # Get the line tag
+                fields = {key: value.strip('"') for key, value in BitmapFont.FIELD.findall(rest)}     # Get the fields
+                if tag == "info":                                       # The font information
+                    self.scale = 1.0 if size == None else size / abs(int(fields["size"]))  # Set the scale
+                elif tag == "common":                                   # The common values
+                    self.lineHeight = int(fields["lineHeight"]) * self.scale    # Set the line height
+                    self.base = int(fields["base"]) * self.scale        # Set the base
+                elif tag == "page":                                     # An atlas page
+                    pages[int(fields["id"])] = self.loadPage(os.path.join(os.path.dirname(fileName), fields["file"]))    # Load the atlas next to the descriptor
+                elif tag == "char":                                     # A character
+                    chars.append({key: int(value) for key, value in fields.items()})    # Keep it until every page is loaded
+                elif tag == "kerning":                                  # A kerning pair
+                    self.kernings[(int(fields["first"]), int(fields["second"]))] = int(fields["amount"]) * self.scale    # Add the kerning
+        for char in chars:                                              # Loop through the characters
+            rect = pygame.Rect(round(char["x"] * self.scale), round(char["y"] * self.scale),
+                               round(char["width"] * self.scale), round(char["height"] * self.scale))    # Get the glyph rectangle in the scaled atlas
+            page = pages[char["page"]]                                  # Get the atlas of the glyph
+            self.glyphs[char["id"]] = (page.subsurface(rect.clip(page.get_rect())),
+                                       char["xoffset"] * self.scale, char["yoffset"] * self.scale,
+                                       char["xadvance"] * self.scale)   # Cut the glyph
+
+    def loadPage(self, fileName):
+        '''
+        Loads an atlas page and scales it.
+        @param self The current object
+        @param fileName The image file name.
+        @return The atlas surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        page = pygame.image.load(fileName)                                              # Load the atlas
+        if pygame.display.get_surface() != None:                                        # Check if there is a screen
+            page = page.convert_alpha()                                                 # Use the screen format for faster blits
+        if self.scale != 1.0:                                                           # Check if the atlas has to be scaled
+            width, height = page.get_size()                                             # Get the atlas size
+            page = pygame.transform.smoothscale(page, (round(width * self.scale), round(height * self.scale)))   # Scale it once
+        return page                                                                     # Return the atlas
+
+    def getGlyph(self, character):
+        '''
+        Returns the glyph of a character.
+        @param self The current object
+        @param character The character code.
+        @return The surface, x offset, y offset and advance of the glyph.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        glyph = self.glyphs.get(character)                          # Get the glyph
+        if glyph == None:                                           # Check if the font has it
+            glyph = self.glyphs[BitmapFont.FALLBACK]                # Use the fallback glyph
+        return glyph                                                # Return the glyph
+
+    def layout(self, text, x, y):
+        '''
+        Places the glyphs of a text.
+        @param self The current object
+        @param text The text.
+        @param x The left of the text.
+        @param y The top of the text.
+        @return The list of glyph surfaces with their positions and the width of the text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        blits = []                                                  # No glyphs placed yet
+        left = x                                                    # Remember the left of the text
+        width = 0                                                   # The width of the text
+        previous = None                                             # The previous character
+        for character in map(ord, text):                            # Loop through the characters
+            if character == 10:                                     # Check if it is a new line
+                width = max(width, x - left)                        # Measure the line
+                x = left                                            # Go back to the left
+                y = y + self.lineHeight                             # Go to the next line
+                previous = None                                     # No kerning across lines
+                continue
+            surface, xOffset, yOffset, advance = self.getGlyph(character)   # Get the glyph
+            x = x + self.kernings.get((previous, character), 0)     # Apply the kerning
+            if surface.get_width() > 0:                             # Check if the glyph draws something
+                blits.append((surface, (round(x + xOffset), round(y + yOffset))))   # Place the glyph
+            x = x + advance                                         # Advance to the next character
+            previous = character                                    # Remember the character
+        return blits, max(width, x - left)                          # Return the glyphs and the width
+
+    def size(self, text):
+        '''
+        Returns the size of a text.
+        @param self The current object
+        @param text The text.
+        @return The width and height of the text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        blits, width = self.layout(text, 0, 0)                                      # Place the glyphs
+        return (round(width), round(self.lineHeight * (text.count("\n") + 1)))     # Return the size
+
+    def draw(self, surface, text, position):
+        '''
+        Draws a text in a single batch of blits.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param text The text.
+        @param position The top left of the text.
+        @return The rectangle of the text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        blits, width = self.layout(text, position[0], position[1])                 # Place the glyphs
+        surface.blits(blits, False)                                                 # Draw them all at once
+        return pygame.Rect(position, (round(width), round(self.lineHeight * (text.count("\n") + 1))))     # Return the rectangle
+
+    def render(self, text):
+        '''
+        Renders a text on a new transparent surface.
+        @param self The current object
+        @param text The text.
+        @return The text surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        surface = pygame.Surface(self.size(text), pygame.SRCALPHA)  # Create the surface
+        self.draw(surface, text, (0, 0))                            # Draw the text
+        return surface                                              # Return the surface
@@ -6,26 +6,31 @@ This class represents a graphical block object for the gameplay in qbert.
 @since: 13 nov. 2022
 '''
 import pygame
+from QbertPackage import QbertView
+from QbertPackage import QbertQuality
 
 class BoardBlock(object):
     '''
     Variables:
-    verticesFront: The front square vertexes
-    verticesBack: The back square vertexes
-    verticesTop: The top square vertexes
+    verticesFront: The front square vertexes in design pixels
+    verticesBack: The back square vertexes in design pixels
+    verticesTop: The top square vertexes in design pixels
+    verticesSides: The vertexes of the front and back squares as a single face in design pixels
+    location: The location in design pixels
     '''
 
     def __init__(self, location):
         '''
         BoardBlock constructor given its location.
         @param self This object
-        @param location The location of this instance.
+        @param location The location of this instance in design pixels.
         @return A new instance of the BoardBlock class.
 
         @author: Dario Urdapilleta
         @version 1.0
         @since 13 nov. 2022
         '''
+        self.location = location                                        # Set the location
         self.verticesFront = ((80 + location.x, 20 + location.y),      # The front square vertexes
                               (80 + location.x, 100 + location.y),
                               (0 + location.x, 80 + location.y),
@@ -38,21 +43,73 @@ class BoardBlock(object):
                               (165 + location.x, -4 + location.y),
                               (83 + location.x, -25 + location.y),
                               (0 + location.x, -4 + location.y))
+        self.verticesSides = (self.verticesFront[3], self.verticesFront[2], self.verticesFront[1],    # The outline of both sides, drawn when the blocks are simplified
+                              self.verticesBack[2], self.verticesBack[3], self.verticesBack[0])
     
-    def draw(self, screen, active):
+    def draw(self, screen, active, offset = (0, 0)):
         '''
         Draws the block.
         @param self This object
         @param screen The game screen.
         @param active If the block should be on or off.
+        @param offset The distance to move the block in render pixels.
 
         @author: Dario Urdapilleta
         @version 1.0
         @since 13 nov. 2022
         '''
-        pygame.draw.polygon(screen, (222, 173, 190), self.verticesFront)    # Draw the front square
-        pygame.draw.polygon(screen, (102, 119, 136), self.verticesBack)     # Draw the back square
+        top = self.moveVertices(self.verticesTop, offset)                   # Move the top square
+        if QbertQuality.simplifiesBlocks():                                 # Check if the sides are a single face
+            pygame.draw.polygon(screen, (222, 173, 190), self.moveVertices(self.verticesSides, offset))   # Draw both sides at once
+        else:
+            pygame.draw.polygon(screen, (222, 173, 190), self.moveVertices(self.verticesFront, offset))   # Draw the front square
+            pygame.draw.polygon(screen, (102, 119, 136), self.moveVertices(self.verticesBack, offset))    # Draw the back square
         if active:                                                          # Check if the cube is active
-            pygame.draw.polygon(screen, (34, 255, 136), self.verticesTop)   # Draw the top square
+            pygame.draw.polygon(screen, (34, 255, 136), top)                # Draw the top square
         else:
-            pygame.draw.polygon(screen, (255, 34, 136), self.verticesTop)   # Draw the top square
\ No newline at end of file
+            pygame.draw.polygon(screen, (255, 34, 136), top)                # Draw the top square
+
+    def moveVertices(self, vertices, offset):
+        '''
+        Converts vertexes to render pixels and moves them.
+        @param self This object
+        @param vertices The vertexes in design pixels.
+        @param offset The distance to move them in render pixels.
+        @return The list of vertexes in render pixels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return [(x + offset[0], y + offset[1]) for x, y in map(QbertView.scalePoint, vertices)]    # Scale and move the vertexes
+
+    def getBounds(self):
+        '''
+        Returns the rectangle that covers the block.
+        @param self This object
+        @return The rectangle in render pixels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        vertices = [QbertView.scalePoint(vertex) for vertex in self.verticesFront + self.verticesBack + self.verticesTop]    # Get all the vertexes in render pixels
+        left = min(x for x, y in vertices)                                              # Get the left
+        top = min(y for x, y in vertices)                                               # Get the top
+        return pygame.Rect(left, top, max(x for x, y in vertices) - left + 1, max(y for x, y in vertices) - top + 1)     # Return the rectangle
+
+    def render(self, active):
+        '''
+        Draws the block on its own surface.
+        @param self This object
+        @param active If the block should be on or off.
+        @return The block surface, to be placed at the top left of its bounds.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        bounds = self.getBounds()                                                       # Get the rectangle of the block
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)                          # Create a transparent surface
+        self.draw(surface, active, (-bounds.left, -bounds.top))                         # Draw the block moved to the surface
+        return surface                                                                  # Return the surface
@@ -0,0 +1,160 @@
+'''
+This class represents the thread that runs the simulation apart from the renderer.
+
+The main thread keeps pumping the pygame events, because SDL wants them on the
+thread that opened the display, and hands them to this thread. This thread
+handles them and updates the game at a fixed tick rate, then publishes a
+QbertSnapshot. The renderer draws the latest snapshot whenever it is ready, so
+a slow present no longer delays the simulation.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import queue
+import threading
+import time
+from QbertPackage import QbertSnapshot
+from QbertPackage import QbertTrace
+
+class GameThread(object):
+    '''
+    Variables:
+    TICK_RATE: The simulation updates per second
+    MAX_CATCH_UP: The most ticks run at once after a stall
+    game: The game
+    events: The events waiting to be handled
+    snapshot: The latest snapshot
+    published: The event set when a new snapshot is published
+    running: True while the thread runs
+    error: The exception that stopped the thread
+    thread: The simulation thread
+    '''
+    TICK_RATE = 60          # The simulation updates per second
+    MAX_CATCH_UP = 5        # The most ticks run at once after a stall
+
+    def __init__(self, game):
+        '''
+        Creates a new GameThread and publishes the first snapshot.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the GameThread
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game = game                                                    # Set the game
+        self.events = queue.SimpleQueue()                                   # Create the event queue
+        self.tick = 0                                                       # No ticks yet
+        self.snapshot = QbertSnapshot.QbertSnapshot(game, self.tick)        # Take the first snapshot
+        self.published = threading.Event()                                  # Create the publish event
+        self.running = False                                                # The thread is not started
+        self.error = None                                                   # No errors yet
+        self.thread = threading.Thread(target = self.run, name = "GameThread", daemon = True)     # Create the thread
+
+    def start(self):
+        '''
+        Starts the simulation.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.running = True                 # The thread runs
+        self.thread.start()                 # Start the thread
+
+    def stop(self):
+        '''
+        Stops the simulation and waits for the thread.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.running = False                # Ask the thread to stop
+        if self.thread.is_alive() and self.thread != threading.current_thread():     # Check if there is a thread to wait for
+            self.thread.join()              # Wait for it
+
+    def post(self, events):
+        '''
+        Hands events to the simulation thread.
+        @param self The current object
+        @param events The pygame events.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for event in events:                # Loop through the events
+            self.events.put(event)          # Queue the event
+
+    def getSnapshot(self, timeout):
+        '''
+        Waits for a snapshot newer than the last one returned.
+        @param self The current object
+        @param timeout The longest time to wait.
+        @return The latest snapshot, the same one if nothing new was published.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.published.wait(timeout):    # Wait for a new snapshot
+            self.published.clear()          # Wait again next time
+        if self.error != None:              # Check if the simulation failed
+            raise self.error                # Fail in the main thread
+        return self.snapshot                # Return the latest snapshot
+
+    def step(self, tickTime):
+        '''
+        Handles the waiting events, updates the game once and publishes a snapshot.
+        @param self The current object
+        @param tickTime The time of a tick.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with QbertTrace.span("tick", "simulation", budgeted = True):                    # Time the whole tick
+            with QbertTrace.span("input", "simulation"):                                # Time the input
+                while True:                                                             # Loop through the waiting events
+                    try:
+                        event = self.events.get_nowait()                                # Get the next event
+                    except queue.Empty:
+                        break                                                           # No more events
+                    self.game.handleEvent(event)                                        # Handle the event
+            with QbertTrace.span("update", "simulation"):                               # Time the update
+                self.game.update(tickTime)                                              # Update the game
+            self.tick = self.tick + 1                                                   # Count the tick
+            with QbertTrace.span("snapshot", "simulation"):                             # Time the snapshot
+                self.snapshot = QbertSnapshot.QbertSnapshot(self.game, self.tick)       # Publish the new snapshot
+        self.published.set()                                                            # Wake up the renderer
+
+    def run(self):
+        '''
+        Runs the simulation at the tick rate until stopped.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        tickTime = 1 / GameThread.TICK_RATE                                         # Get the time of a tick
+        nextTick = time.perf_counter()                                              # The first tick is now
+        try:
+            while self.running and self.game.running:                               # Loop until stopped
+                now = time.perf_counter()                                           # Get the time
+                if now - nextTick > tickTime * GameThread.MAX_CATCH_UP:             # Check if the simulation fell too far behind
+                    nextTick = now                                                  # Drop the lost time instead of running a burst
+                while nextTick <= now and self.game.running:                        # Run the ticks that are due
+                    self.step(tickTime)                                             # Run a tick
+                    nextTick = nextTick + tickTime                                  # Schedule the next one
+                time.sleep(max(0, nextTick - time.perf_counter()))                  # Wait for the next tick
+        except BaseException as error:
+            self.error = error                                                      # Keep it for the main thread
+        finally:
+            self.running = False                                                    # The thread stopped
+            self.published.set()                                                    # Wake up the renderer
@@ -0,0 +1,287 @@
+'''
+This class represents the connection of a cabinet to the global LeaderboardServer.
+
+The client runs its own asyncio loop in a background thread. The game only queues
+records and reads the last top scores fetched, so it never waits on the network.
+The records are sent in batches over a small pool of persistent connections, and
+the top scores are fetched in the background.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import asyncio
+import json
+import sys
+import threading
+from QbertPackage import PlayerRecord
+
+class LeaderboardClient(object):
+    '''
+    Variables:
+    BATCH_INTERVAL: The time between submissions
+    REFRESH_INTERVAL: The time between top score fetches
+    TIMEOUT: The longest time a request can take
+    MAX_PENDING: The most records kept while the server can't be reached
+    host: The server host
+    port: The server port
+    poolSize: The number of connections kept open
+    topAmount: The number of top scores fetched
+    topScores: The last top scores fetched, None until the first fetch
+    version: A number that changes every time the top scores change
+    pending: The records waiting to be sent, used only by the client thread
+    loop: The client's event loop
+    thread: The client thread
+    '''
+    BATCH_INTERVAL = 0.2        # The time between submissions
+    REFRESH_INTERVAL = 10       # The time between top score fetches
+    TIMEOUT = 5                 # The longest time a request can take
+    MAX_PENDING = 1000          # The most records kept while the server can't be reached
+
+    def __init__(self, host, port, poolSize = 2, topAmount = 8):
+        '''
+        Creates a new LeaderboardClient and starts its thread.
+        @param self The current object
+        @param host The server host.
+        @param port The server port.
+        @param poolSize The number of connections kept open.
+        @param topAmount The number of top scores fetched.
+        @return A new instance of the LeaderboardClient
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.host = host                                                    # Set the host
+        self.port = port                                                    # Set the port
+        self.poolSize = poolSize                                            # Set the pool size
+        self.topAmount = topAmount                                          # Set the top amount
+        self.topScores = None                                               # Nothing fetched yet
+        self.version = 0                                                    # Set the first version
+        self.pending = []                                                   # Nothing to send yet
+        self.loop = asyncio.new_event_loop()                                # Create the event loop
+        self.ready = threading.Event()                                      # Create the event that tells the loop is running
+        self.thread = threading.Thread(target = self.run, name = "LeaderboardClient", daemon = True)   # Create the thread
+        self.thread.start()                                                 # Start the thread
+        self.ready.wait()                                                   # Wait for the loop objects to exist
+
+    def submit(self, record):
+        '''
+        Queues a record to be sent, never waits.
+        @param self The current object
+        @param record The PlayerRecord.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.loop.call_soon_threadsafe(self.addPending, [record])      # Hand the record to the client thread
+
+    def submitRecords(self, records):
+        '''
+        Queues several records to be sent, never waits.
+        @param self The current object
+        @param records The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.loop.call_soon_threadsafe(self.addPending, list(records)) # Hand the records to the client thread
+
+    def refresh(self):
+        '''
+        Asks the client to fetch the top scores as soon as possible, never waits.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.loop.call_soon_threadsafe(self.refreshNow.set)            # Wake up the refresh loop
+
+    def getTopScores(self):
+        '''
+        Returns the last top scores fetched.
+        @param self The current object
+        @return The list of PlayerRecords, or None if they were never fetched.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.topScores          # Return the cached scores
+
+    def close(self, timeout = 2):
+        '''
+        Sends the pending records and stops the client.
+        @param self The current object
+        @param timeout The longest time to wait for the records to be sent.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.thread.is_alive():                                      # Check if the client is running
+            self.loop.call_soon_threadsafe(self.stopping.set)           # Ask the loop to stop
+            self.thread.join(timeout)                                   # Wait for the last batch
+
+    def addPending(self, records):
+        '''
+        Adds records to the pending list, called in the client thread.
+        @param self The current object
+        @param records The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.pending.extend(records)                                    # Add the records
+        del self.pending[:-LeaderboardClient.MAX_PENDING]               # Drop the oldest ones if the server is gone for too long
+
+    def run(self):
+        '''
+        Runs the client's event loop.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        asyncio.set_event_loop(self.loop)                               # Use the client's loop in this thread
+        try:
+            self.loop.run_until_complete(self.main())                   # Run until stopped
+        finally:
+            self.loop.close()                                           # Close the loop
+
+    async def main(self):
+        '''
+        Sends the batches and fetches the top scores until the client is closed.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.pool = asyncio.Queue()                                     # Create the idle connection pool
+        self.opened = 0                                                 # No connections yet
+        self.stopping = asyncio.Event()                                 # Create the stop event
+        self.refreshNow = asyncio.Event()                               # Create the refresh event
+        self.ready.set()                                                # Let the game continue
+        tasks = [asyncio.ensure_future(self.batchLoop()), asyncio.ensure_future(self.refreshLoop())]   # Start the loops
+        await self.stopping.wait()                                      # Wait until the client is closed
+        for task in tasks:                                              # Loop through the tasks
+            task.cancel()                                               # Stop the task
+        await asyncio.gather(*tasks, return_exceptions = True)          # Wait for them to stop
+        await self.sendPending()                                        # Send the last batch
+        while not self.pool.empty():                                    # Loop through the idle connections
+            reader, writer = self.pool.get_nowait()                     # Get the connection
+            writer.close()                                              # Close it
+
+    async def batchLoop(self):
+        '''
+        Sends the pending records every batch interval.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        while True:                                                     # Loop until cancelled
+            await asyncio.sleep(LeaderboardClient.BATCH_INTERVAL)       # Wait for the next batch
+            if await self.sendPending():                                # Check if something was sent
+                self.refreshNow.set()                                   # Fetch the new top scores
+
+    async def refreshLoop(self):
+        '''
+        Fetches the top scores every refresh interval or when asked.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        while True:                                                     # Loop until cancelled
+            try:
+                response = await self.request({"op": "top", "limit": self.topAmount})      # Fetch the top scores
+                self.topScores = [PlayerRecord.PlayerRecord(name, score) for name, score in response["records"]]    # Replace the cached scores
+                self.version = self.version + 1                         # Let the game know they changed
+            except (OSError, ValueError, KeyError, asyncio.TimeoutError) as error:
+                print("Leaderboard unavailable: %s" % error, file = sys.stderr)   # Report it and try again later
+            try:
+                await asyncio.wait_for(self.refreshNow.wait(), LeaderboardClient.REFRESH_INTERVAL)   # Wait for the next refresh
+            except asyncio.TimeoutError:
+                pass                                                    # Time to refresh
+            self.refreshNow.clear()                                     # Reset the refresh event
+
+    async def sendPending(self):
+        '''
+        Sends all the pending records in one request.
+        @param self The current object
+        @return True if records were sent.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not self.pending:                                            # Check if there is something to send
+            return False                                                # Nothing was sent
+        records = self.pending                                          # Take the pending records
+        self.pending = []                                               # Start a new batch
+        try:
+            await self.request({"op": "submit", "records": [[record.getName(), record.getScore()] for record in records]})    # Send the batch
+            return True                                                 # The batch was sent
+        except (OSError, asyncio.TimeoutError):
+            self.pending = records + self.pending                       # Keep them before the new ones for the next batch
+            del self.pending[:-LeaderboardClient.MAX_PENDING]           # Drop the oldest ones if the server is gone for too long
+            return False                                                # Nothing was sent
+        except (ValueError, KeyError) as error:
+            print("Leaderboard rejected the scores: %s" % error, file = sys.stderr)  # The server will never take them
+            return False                                                # Nothing was sent
+
+    async def request(self, message):
+        '''
+        Sends a request on a pooled connection and waits for the response.
+        @param self The current object
+        @param message The request dictionary.
+        @return The response dictionary.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        reader, writer = await self.acquire()                                               # Get a connection
+        try:
+            writer.write(json.dumps(message).encode() + b"\n")                              # Send the request
+            await writer.drain()                                                            # Wait for it to be sent
+            line = await asyncio.wait_for(reader.readline(), LeaderboardClient.TIMEOUT)     # Wait for the response
+            if not line:                                                                    # Check if the server closed the connection
+                raise ConnectionError("the leaderboard closed the connection")              # Report it
+            response = json.loads(line)                                                     # Parse the response
+        except BaseException:
+            writer.close()                                                                  # Drop the broken connection
+            self.opened = self.opened - 1                                                   # Forget it
+            raise                                                                           # Let the caller handle it
+        self.pool.put_nowait((reader, writer))                                              # Return the connection to the pool
+        if not response.get("ok"):                                                          # Check if the request failed
+            raise ValueError(response.get("error"))                                         # Report it
+        return response                                                                     # Return the response
+
+    async def acquire(self):
+        '''
+        Returns an idle connection, opening one if the pool is not full.
+        @param self The current object
+        @return The reader and writer of the connection.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.pool.empty() and self.opened < self.poolSize:                               # Check if a new connection can be opened
+            self.opened = self.opened + 1                                                   # Count it
+            try:
+                return await asyncio.wait_for(asyncio.open_connection(self.host, self.port), LeaderboardClient.TIMEOUT)  # Open it
+            except BaseException:
+                self.opened = self.opened - 1                                               # It was not opened
+                raise                                                                       # Let the caller handle it
+        return await self.pool.get()                                                        # Wait for an idle connection
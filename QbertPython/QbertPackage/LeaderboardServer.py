@@ -0,0 +1,265 @@
+'''
+This class represents the global leaderboard server shared by the cabinets of every venue.
+
+It speaks JSON lines over TCP. A cabinet sends {"op": "submit", "records": [["ABC", 120]]},
+{"op": "top", "limit": 8} or {"op": "rank", "score": 120} and gets one JSON line back.
+Submissions are acknowledged as soon as they are queued and written in batches by a
+single database thread, and the top scores are answered from memory.
+
+Usage:
+python -m QbertPackage.LeaderboardServer --port 7777 --database leaderboard.db
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import asyncio
+import bisect
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from QbertPackage import LeaderboardStore
+from QbertPackage import PlayerRecord
+
+class LeaderboardServer(object):
+    '''
+    Variables:
+    FLUSH_INTERVAL: The time between database writes
+    TOP_CACHE: The number of top scores kept in memory
+    MAX_BATCH: The most records accepted in a single submission
+    store: The LeaderboardStore
+    executor: The single thread that uses the database
+    pending: The records waiting to be written
+    topScores: The top scores as [name, score] pairs
+    server: The asyncio server
+    connections: The number of cabinets connected
+    '''
+    FLUSH_INTERVAL = 0.1        # The time between database writes
+    TOP_CACHE = 100             # The number of top scores kept in memory
+    MAX_BATCH = 1000            # The most records accepted in a single submission
+
+    def __init__(self, fileName):
+        '''
+        Creates a new LeaderboardServer.
+        @param self The current object
+        @param fileName The database file name.
+        @return A new instance of the LeaderboardServer
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.executor = ThreadPoolExecutor(1, "LeaderboardStore")                  # Create the database thread
+        self.store = self.executor.submit(LeaderboardStore.LeaderboardStore, fileName).result()     # Open the database in its thread
+        self.pending = []                                                           # Nothing pending yet
+        self.topScores = self.executor.submit(self.readTopScores).result()         # Read the top scores
+        self.server = None                                                          # The server is not started
+        self.connections = 0                                                        # No cabinets yet
+
+    def readTopScores(self):
+        '''
+        Reads the top scores from the database, called in the database thread.
+        @param self The current object
+        @return The top scores as [name, score] pairs.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return [[record.getName(), record.getScore()] for record in self.store.getTopScores(LeaderboardServer.TOP_CACHE)]  # Convert the records
+
+    def writeRecords(self, records):
+        '''
+        Writes a batch of records and returns the new top scores, called in the database thread.
+        @param self The current object
+        @param records The list of PlayerRecords.
+        @return The top scores as [name, score] pairs, or None if they couldn't be read after the write.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.store.addRecords(records)          # Write the records in one transaction, an error leaves none written
+        try:
+            return self.readTopScores()         # Read the new top scores
+        except Exception as error:
+            print("Leaderboard failed to read the top scores: %s" % error, file = sys.stderr)  # Report it
+            return None                         # The records are written, keep the top scores in memory
+
+    async def start(self, host, port):
+        '''
+        Starts listening and writing.
+        @param self The current object
+        @param host The host to listen on.
+        @param port The port to listen on.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.server = await asyncio.start_server(self.handleCabinet, host, port, backlog = 4096)   # Start the server
+        self.flusher = asyncio.get_running_loop().create_task(self.flushLoop())   # Start writing the batches
+
+    async def close(self):
+        '''
+        Stops the server after writing the pending records.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.server.close()                     # Stop accepting cabinets
+        await self.server.wait_closed()         # Wait for the server to stop
+        self.flusher.cancel()                   # Stop the flush loop
+        await self.flush()                      # Write what is left
+        self.executor.submit(self.store.close).result()     # Close the database
+        self.executor.shutdown()                # Stop the database thread
+
+    async def flushLoop(self):
+        '''
+        Writes the pending records every flush interval.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        while True:                                                     # Loop until cancelled
+            await asyncio.sleep(LeaderboardServer.FLUSH_INTERVAL)       # Wait for the next batch
+            await self.flush()                                          # Write the batch
+
+    async def flush(self):
+        '''
+        Writes the pending records in a single transaction, keeps them pending if the write fails.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.pending:                                                # Check if there is something to write
+            records = self.pending                                      # Take the pending records
+            self.pending = []                                           # Start a new batch
+            try:
+                topScores = await asyncio.get_running_loop().run_in_executor(self.executor, self.writeRecords, records)   # Write them
+            except Exception as error:
+                print("Leaderboard failed to write %d records: %s" % (len(records), error), file = sys.stderr)   # Report it
+                self.pending = records + self.pending                   # Write them with the next batch
+                return                                                  # Try again on the next flush
+            if topScores == None:                                       # Check if the top scores couldn't be read
+                return                                                  # The ones in memory already have the records
+            for record in self.pending:                                 # Loop through the records queued while writing
+                self.addTopScore(topScores, record)                     # Keep them in the top scores
+            self.topScores = topScores                                  # Replace the top scores
+
+    def addTopScore(self, topScores, record):
+        '''
+        Adds a record to the top scores kept in memory.
+        @param self The current object
+        @param topScores The top scores as [name, score] pairs.
+        @param record The PlayerRecord.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        bisect.insort(topScores, [record.getName(), record.getScore()], key = lambda entry: -entry[1])     # Insert it after the higher or equal scores
+        del topScores[LeaderboardServer.TOP_CACHE:]                     # Keep only the cached amount
+
+    async def handleCabinet(self, reader, writer):
+        '''
+        Answers the requests of a cabinet until it disconnects.
+        @param self The current object
+        @param reader The stream reader.
+        @param writer The stream writer.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.connections = self.connections + 1                             # Count the cabinet
+        try:
+            while True:                                                     # Loop through the requests
+                line = await reader.readline()                              # Read a request
+                if not line:                                                # Check if the cabinet disconnected
+                    break                                                   # Stop serving it
+                try:
+                    response = await self.answer(json.loads(line))          # Answer the request
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"ok": False, "error": str(error)}           # Report the bad request
+                writer.write(json.dumps(response).encode() + b"\n")         # Send the response
+                await writer.drain()                                        # Wait if the cabinet reads slowly
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass                                                            # The cabinet went away or sent a line too long
+        finally:
+            self.connections = self.connections - 1                         # Forget the cabinet
+            writer.close()                                                  # Close the connection
+
+    async def answer(self, request):
+        '''
+        Answers a request.
+        @param self The current object
+        @param request The request dictionary.
+        @return The response dictionary.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        operation = request["op"]                                                       # Get the operation
+        if operation == "submit":                                                       # Handle a submission
+            records = request["records"][:LeaderboardServer.MAX_BATCH]                  # Get the records
+            for name, score in records:                                                 # Loop through the records
+                record = PlayerRecord.PlayerRecord(str(name)[:3].ljust(3), int(score))  # Create the record
+                self.pending.append(record)                                             # Queue the record
+                self.addTopScore(self.topScores, record)                                # Show it in the top scores right away
+            return {"ok": True, "queued": len(records)}                                 # Acknowledge it
+        elif operation == "top":                                                        # Handle a top scores request
+            return {"ok": True, "records": self.topScores[:int(request.get("limit", 8))]}     # Answer from memory
+        elif operation == "rank":                                                       # Handle a rank request
+            rank = await asyncio.get_running_loop().run_in_executor(self.executor, self.store.getRank, int(request["score"]))    # Count in the database
+            return {"ok": True, "rank": rank}                                           # Return the rank
+        return {"ok": False, "error": "unknown operation"}                               # The operation doesn't exist
+
+async def serve(host, port, fileName):
+    '''
+    Runs a LeaderboardServer until it is interrupted.
+    @param host The host to listen on.
+    @param port The port to listen on.
+    @param fileName The database file name.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    server = LeaderboardServer(fileName)                            # Create the server
+    await server.start(host, port)                                  # Start it
+    print("Leaderboard listening on %s:%d" % (host, port))          # Let the operator know
+    try:
+        await asyncio.Event().wait()                                # Serve forever
+    finally:
+        await server.close()                                        # Write what is left
+
+def main(argv = None):
+    '''
+    Runs the leaderboard server from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    parser = argparse.ArgumentParser(prog = "LeaderboardServer", description = "Serves the global high scores.")
+    parser.add_argument("--host", default = "127.0.0.1", help = "The host to listen on")
+    parser.add_argument("--port", type = int, default = 7777, help = "The port to listen on")
+    parser.add_argument("--database", default = "leaderboard.db", help = "The SQLite database file")
+    arguments = parser.parse_args(argv)                             # Parse the arguments
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.database))     # Run the server
+    except KeyboardInterrupt:
+        pass                                                        # Stopped by the operator
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+'''
+This class represents the full score history stored in an indexed SQLite database.
+
+Every saved score is kept for the season statistics. The records are indexed by
+score so inserting and reading the top scores stay logarithmic, and the best score
+of every set of initials is kept in its own table. The rank of a score comes from
+a binary indexed tree of the number of records by score: every node holds the
+count of a range of scores, so a rank adds the few nodes that cover the scores up
+to it and a new record updates the few nodes that cover its score, a fixed number
+of primary key lookups however many records and distinct scores there are.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import sqlite3
+import threading
+import time
+from collections import Counter
+from QbertPackage import PlayerRecord
+
+class LeaderboardStore(object):
+    '''
+    Variables:
+    SCHEMA: The statements that create the tables and indexes
+    TREE_SIZE: The number of scores the rank tree covers, higher scores count as the highest one
+    fileName: The database file name
+    connection: The database connection
+    lock: The lock that lets a single thread use the connection at a time
+    '''
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, name TEXT NOT NULL, score INTEGER NOT NULL, saved REAL NOT NULL)",
+              "CREATE INDEX IF NOT EXISTS recordsByScore ON records (score DESC, id)",
+              "CREATE TABLE IF NOT EXISTS rankTree (node INTEGER PRIMARY KEY, count INTEGER NOT NULL)",
+              "CREATE TABLE IF NOT EXISTS bestScores (name TEXT PRIMARY KEY, score INTEGER NOT NULL)")
+    TREE_SIZE = 2 ** 31
+
+    def __init__(self, fileName):
+        '''
+        Opens or creates the leaderboard database.
+        @param self The current object
+        @param fileName The database file name.
+        @return A new instance of the LeaderboardStore
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.fileName = fileName                                                # Set the file name
+        self.lock = threading.Lock()                                            # The score writer and the game share the connection
+        self.connection = sqlite3.connect(fileName, timeout = 10, check_same_thread = False)     # Open the database
+        self.connection.execute("PRAGMA journal_mode = WAL")                    # Let the readers work while a cabinet writes
+        self.connection.execute("PRAGMA synchronous = NORMAL")                  # Sync on checkpoints only
+        with self.connection:                                                   # Commit at the end
+            self.connection.execute("BEGIN IMMEDIATE")                          # Take the write lock before checking, so a single cabinet fills the tree
+            for statement in LeaderboardStore.SCHEMA:                           # Loop through the schema
+                self.connection.execute(statement)                              # Create the table or index
+            if self.connection.execute("SELECT 1 FROM rankTree LIMIT 1").fetchone() == None:  # Check if the tree is new
+                self.addToTree(self.connection.execute("SELECT score, COUNT(*) FROM records GROUP BY score"))   # Count the records saved before it
+
+    def treeNode(self, score):
+        '''
+        Returns the position of a score in the rank tree.
+        @param self The current object
+        @param score The score.
+        @return The position, from 1 to the size of the tree.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return min(max(score, 0), LeaderboardStore.TREE_SIZE - 1) + 1     # The tree starts at 1
+
+    def addToTree(self, counts):
+        '''
+        Adds records to the nodes of the rank tree that cover their scores, in the current transaction.
+        @param self The current object
+        @param counts The pairs of a score and its number of new records.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        nodes = Counter()                                                       # The count added to every node
+        for score, count in counts:                                             # Loop through the scores
+            node = self.treeNode(score)                                         # Get the position of the score
+            while node <= LeaderboardStore.TREE_SIZE:                           # Loop up to the root
+                nodes[node] += count                                            # The node covers the score
+                node += node & -node                                            # Go to the next node that covers it
+        self.connection.executemany("INSERT INTO rankTree (node, count) VALUES (?, ?) "
+                                    "ON CONFLICT (node) DO UPDATE SET count = count + excluded.count", nodes.items())
+
+    def countUpTo(self, score):
+        '''
+        Returns the number of records with a score up to a score and the number of records, while holding the lock.
+        @param self The current object
+        @param score The score.
+        @return The records up to the score and all the records.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        nodes = []                                                              # The nodes that cover the scores up to the score
+        node = self.treeNode(score)                                             # Get the position of the score
+        while node > 0:                                                         # Loop down to the start
+            nodes.append(node)                                                  # The node covers a range before the score
+            node -= node & -node                                                # Go to the range before it
+        counts = dict(self.connection.execute("SELECT node, count FROM rankTree WHERE node IN (%s)" % ",".join("?" * (len(nodes) + 1)),
+                                              nodes + [LeaderboardStore.TREE_SIZE]))        # Read them and the root in a single lookup
+        return sum(counts.get(node, 0) for node in nodes), counts.get(LeaderboardStore.TREE_SIZE, 0)
+
+    def close(self):
+        '''
+        Closes the database.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                     # Wait for the other thread
+            self.connection.close()         # Close the connection
+
+    def addRecord(self, record):
+        '''
+        Adds a record to the history.
+        @param self The current object
+        @param record The PlayerRecord.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.addRecords([record])       # Add a single record
+
+    def addRecords(self, records):
+        '''
+        Adds several records to the history in a single transaction.
+        @param self The current object
+        @param records The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        now = time.time()                                                                       # Get the save time
+        rows = [(record.getName(), record.getScore()) for record in records]                    # Get the rows
+        with self.lock, self.connection:                                                        # Wait for the other thread and start a transaction
+            self.connection.executemany("INSERT INTO records (name, score, saved) VALUES (?, ?, ?)", [row + (now,) for row in rows])
+            self.addToTree(Counter(row[1] for row in rows).items())                             # Count the scores in the rank tree
+            self.connection.executemany("INSERT INTO bestScores (name, score) VALUES (?, ?) "
+                                        "ON CONFLICT (name) DO UPDATE SET score = max(score, excluded.score)", rows)
+
+    def getTopScores(self, amount):
+        '''
+        Returns the best records, ties in the order they were saved.
+        @param self The current object
+        @param amount The number of records.
+        @return The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                                                                         # Wait for the other thread
+            rows = self.connection.execute("SELECT name, score FROM records ORDER BY score DESC, id LIMIT ?", (amount,)).fetchall()   # Read the index in order
+        return [PlayerRecord.PlayerRecord(name, score) for name, score in rows]                # Create the records
+
+    def getRank(self, score):
+        '''
+        Returns the rank a score has or would have in the history.
+        @param self The current object
+        @param score The score.
+        @return The rank, 1 is the best.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                                                                         # Wait for the other thread
+            upTo, total = self.countUpTo(score)                                                 # Count the records up to the score
+        return total - upTo + 1                                                                 # The score goes after the better ones
+
+    def getBestScore(self, name):
+        '''
+        Returns the best score of a set of initials.
+        @param self The current object
+        @param name The initials.
+        @return The best score, or None if the initials never saved a score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                                                                         # Wait for the other thread
+            row = self.connection.execute("SELECT score FROM bestScores WHERE name = ?", (name,)).fetchone()   # Look up the initials
+        return None if row == None else row[0]                                                  # Return the score
+
+    def getCount(self):
+        '''
+        Returns the number of records in the history.
+        @param self The current object
+        @return The number of records.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                                                                         # Wait for the other thread
+            row = self.connection.execute("SELECT count FROM rankTree WHERE node = ?", (LeaderboardStore.TREE_SIZE,)).fetchone()  # The root counts every score
+        return 0 if row == None else row[0]                                                     # Return the count
@@ -12,310 +12,423 @@ import os
 from QbertPackage import QbertLevel
 from QbertPackage import QbertPlayer
 from QbertPackage import PlayerRecord
-from enum import Enum
+from QbertPackage import ScoreLog
+from QbertPackage import ScoreWriter
+from QbertPackage import QbertInput
+from QbertPackage import QbertScenes
+from QbertPackage import BitmapFont
+from QbertPackage import QbertView
+from QbertPackage import GameThread
+from QbertPackage import QbertTrace
+from QbertPackage import QbertQuality
+from QbertPackage import QbertEvents
+from QbertPackage import QbertProgression
+from QbertPackage.QbertScenes import GameState
 import time
-from pickle import FALSE
-
-class GameState(Enum):      # All the different game states
-    TITLE_SCREEN = 0
-    GAMEPLAY = 1
-    PAUSE = 2
-    GAME_OVER = 3
-    SCORE_TABLE = 4
-    NEXT_LEVEL = 5
-    
+import bisect
+import random
+import atexit
+import sys
+
 class Qbert():
     '''
     Variables:
     MAX_DISPLAY_SCORE: The max amount of records to display
-    LIFE_BONUS: The amount of score needed to gain a new life
     TITLE_OPTIONS: The number of menu options in the title screen
     NW: Constant for the North West Direction
     NE: Constant for the North East Direction
     SE: Constant for the South East Direction
     SW: Constant for the South West Direction
     highScores: The list of highScores
-    previousLivesInrement: The last time a used received a bonus
+    scoreLog: The high score file
+    leaderboard: The full score history, opened by the score writer thread when it is first used
+    leaderboardName: The file of the score history
+    rank: The rank of the last game's score in the history, 0 until it is looked up
+    rankScore: The score whose rank is looked up
+    scoreWriter: The thread that saves the scores
+    leaderboardClient: The connection to the global leaderboard, None when playing alone
+    tableVersion: The version of the global scores in the score table
+    memoryMonitor: The memory diagnostics, None when they are off
+    profiler: The deep profiling captures, None when they are off
+    tracer: The TraceRecorder of the frame spans, None when the tracing is off
+    spectators: The SpectatorServer that streams the game, None when nobody can watch
+    renderSize: The render resolution chosen for the cabinet, the quality may draw at a part of it
+    governor: The QualityGovernor that adapts the quality to the frame times, None when the quality is fixed
+    events: The EventBus the level and the game state changes are published to
+    progress: The GameProgress that gives the life bonus and tells when a level ends
     initials: The latest initials used
     menuSelection: The element selected in the menu
-    buttonIsPressed: A boolean that tells if the user pressed a button
+    inputBuffer: The moves pressed while the player is jumping
+    scenes: The scene of every game state
     gameState: The current game state
     lastTime: The last time the game was updated
+    running: True until the game is quit
+    lastSnapshot: The last snapshot drawn
+    renderedState: The game state of the last snapshot drawn
     background: The background texture
     title: The title texture
     playerTexture: The characters texture
     font: The game's font
+    bitmapFont: The bitmap font used for the texts that change often
     level: The current level number
     score: The current score used to keep track between levels
     initialSelected: The position of the initials selected
     currentLevel: The current level object
     player: The player
+    autopilot: The autopilot that plays the demo and assists the player, None until it is first used
+    autopilotEnabled: True if the autopilot assists the player
+    attractMode: True if the demo is playing
+    endlessMode: True if the game goes from level to level without screens and its score is not saved
+    endlessLevel: The level endless games start at
+    idleTime: The time the title screen has been idle
+    ticks: The number of simulation ticks run
+    simulationTime: The time simulated
+    clock: The clock used to time the moves
+    recording: The SessionRecording of the session, None when it is not recorded
+    recordingPath: The file the recording is saved to
     '''
     MAX_DISPLAY_SCORE = 8                              # The max amount of records to display
-    LIFE_BONUS = 1000                                  # The amount of score needed to gain a new life
-    TITLE_OPTIONS = 3                                  # The number of menu options in the title screen
+    TITLE_OPTIONS = 4                                  # The number of menu options in the title screen
     NW = 0                                             # Constant for the North West Direction
     NE = 1                                             # Constant for the North East Direction
     SE = 2                                             # Constant for the South East Direction
     SW = 3                                             # Constant for the South West Direction
+    ATTRACT_DELAY = 20                                 # The seconds idle in the title screen before the demo starts
+    ENDLESS_LEVEL = 1                                  # The level endless games start at by default
     
-    def __init__(self):
+    def __init__(self, scoreDirectory = "", replay = None):
         '''
         The QbertPackage constructor.
         
         @param self The current object
+        @param scoreDirectory The directory of the score files.
+        @param replay The SessionRecording to play again, None to play.
         @return A new instance of the QbertPackage class.
         
         @author: Dario Urdapilleta
         @version 1.0
         @since 12 nov. 2022
         '''
+        self.memoryMonitor = None                           # The memory diagnostics are off by default
+        interval = os.environ.get("BLOBERT_MEMORY")         # Get the seconds between memory reports
+        if interval:                                        # Check if the memory diagnostics are on
+            from QbertPackage import QbertMemory            # Load tracemalloc only when it is used
+            self.memoryMonitor = QbertMemory.MemoryMonitor(float(interval))     # Start tracing the allocations
+        self.profiler = None                                # The profiling captures are off by default
+        frames = os.environ.get("BLOBERT_PROFILE")          # Get the frames of a profiling capture
+        if frames:                                          # Check if the profiling captures are on
+            from QbertPackage import QbertProfiler          # Load cProfile only when it is used
+            self.profiler = QbertProfiler.ProfileCapture(int(frames), os.environ.get("BLOBERT_PROFILE_DIR", "profiles"), bool(os.environ.get("BLOBERT_PROFILE_STACKS")))  # Wait for the hotkey
+        self.tracer = None                                  # The tracing is off by default
+        capacity = os.environ.get("BLOBERT_TRACE")          # Get the number of spans kept
+        if capacity:                                        # Check if the tracing is on
+            budget = float(os.environ.get("BLOBERT_TRACE_BUDGET", 1000 / GameThread.GameThread.TICK_RATE)) / 1000     # Get the frame budget in seconds
+            self.tracer = QbertTrace.start(int(capacity), budget, os.environ.get("BLOBERT_TRACE_DIR", "traces"))     # Start recording the spans
+        self.spectators = None                              # Nobody watches by default
+        address = os.environ.get("BLOBERT_SPECTATE")        # Get the spectator port as port or host:port
+        if address:                                         # Check if the game is streamed to spectators
+            host, port = address.rsplit(":", 1) if ":" in address else ("0.0.0.0", address)    # Listen on every interface without a host
+            from QbertPackage import QbertSpectator         # Load asyncio only when it is used
+            self.spectators = QbertSpectator.SpectatorServer(host, int(port))                 # Start the broadcaster
         self.highScores = []                                # Set initial value to the scores
-        self.previousLivesInrement = 0                      # Sets the previous lives increment to 0
         self.initials = ['A', 'A', 'A']                     # Create the initials
+        self.scoreLog = ScoreLog.ScoreLog(os.path.join(scoreDirectory, "scores.dat"), Qbert.MAX_DISPLAY_SCORE)    # Open the score file
+        self.leaderboardName = os.path.join(scoreDirectory, "scores.db")   # Get the score history file
+        self.leaderboard = None                             # The history is opened when it is first used
+        self.rank = 0                                       # There is no rank yet
+        self.rankScore = None                               # No rank looked up yet
+        self.scoreWriter = ScoreWriter.ScoreWriter([self.scoreLog.appendRecords, self.saveHistory])     # Start the thread that saves the scores
+        atexit.register(self.scoreWriter.close)             # Save the queued scores however the game exits
+        self.leaderboardClient = None                       # Play alone by default
+        self.tableVersion = 0                               # No global scores yet
+        address = os.environ.get("BLOBERT_LEADERBOARD")     # Get the global leaderboard address as host:port
+        if address:                                         # Check if the cabinet is part of a venue
+            host, port = address.rsplit(":", 1)             # Split the address
+            from QbertPackage import LeaderboardClient      # Load asyncio only when it is used
+            self.leaderboardClient = LeaderboardClient.LeaderboardClient(host, int(port), topAmount = Qbert.MAX_DISPLAY_SCORE)    # Connect in the background
+            atexit.register(self.leaderboardClient.close)   # Send the queued scores however the game exits
         self.loadScores()                                   # Loads the scores from the file
         self.menuSelection = 0                              # Sets the initial value of the menu selection to 0
-        self.buttonIsPressed = False                        # Sets the initial value of a button pressed to false
+        self.initialSelected = 0                            # Sets the initial value of the initial selected to 0
+        self.level = 0                                      # There is no level before the first game
+        self.currentLevel = None                            # There is no level before the first game
+        self.events = QbertEvents.EventBus()                # Create the bus of the changes
+        self.progress = QbertProgression.GameProgress(self.events)     # Follow the levels published to the bus
+        self.running = True                                 # The game is running
+        self.lastSnapshot = None                            # Nothing drawn yet
+        self.renderedState = None                           # No scene drawn yet
         self.gameState = GameState.TITLE_SCREEN             # Sets the initial game state to TITLE_SCREEN
         self.lastTime = time.time()                         # Set the last time
-        self.background = pygame.image.load("Qbert.png")    # Loads the background texture
-        self.title = pygame.image.load("Title.png")         # Loads the title texture
-        self.playerTexture = pygame.image.load("AnimationSpritelist.png") # Loads the player texture
-        self.font = pygame.font.Font('SyneMono-Regular.ttf', 60)    # Laod the font
+        self.renderSize = QbertView.renderSize              # Remember the resolution chosen for the cabinet
+        self.loadAssets()                                   # Load the textures and the fonts at the render resolution
+        self.playerTexture = pygame.image.load(QbertView.getAssetPath("AnimationSpritelist.png")) # Loads the player texture
+        self.governor = None                                # The quality is fixed unless the governor chooses it
+        quality = os.environ.get("BLOBERT_QUALITY", "auto") # Get the quality level, or auto to adapt it to the cabinet
+        if quality == "auto":                               # Check if the quality adapts
+            budget = float(os.environ.get("BLOBERT_QUALITY_BUDGET", 750 / GameThread.GameThread.TICK_RATE)) / 1000    # Get the drawing budget in seconds, the rest of the frame is for the loop
+            self.governor = QbertQuality.QualityGovernor(budget)    # Watch the frame times
+        self.autopilot = None                               # The autopilot is created when it is first used
+        self.ticks = 0                                      # No ticks yet
+        self.simulationTime = 0                             # No time simulated yet
+        self.clock = time.perf_counter                      # Time the moves with the wall clock
+        self.recording = None                               # The session is not recorded by default
+        self.recordingPath = os.environ.get("BLOBERT_RECORD")   # Get the file to record the session to
+        if replay != None:                                  # Check if a session is played again
+            from QbertPackage import QbertReplay            # Load the recordings only when they are used
+            random.seed(replay.seed)                        # Get the same enemies
+            self.autopilot = QbertReplay.ReplayAutopilot(replay)    # Make the same decisions
+            self.clock = self.getSimulationTime             # Time the moves with the simulation
+        elif self.recordingPath:                            # Check if the session is recorded
+            from QbertPackage import QbertReplay            # Load the recordings only when they are used
+            self.recording = QbertReplay.SessionRecording(random.randrange(1 << 32))    # Choose the seed
+            random.seed(self.recording.seed)                # Seed the enemies
+            self.getAutopilot().random.seed(self.recording.seed)    # Seed the autopilot
+            self.autopilot = QbertReplay.RecordingAutopilot(self.autopilot, self.recording)   # Record its decisions
+            self.clock = self.getSimulationTime             # Time the moves with the simulation
+        self.autopilotEnabled = False                       # The autopilot starts disabled
+        self.attractMode = False                            # The demo starts stopped
+        self.endlessMode = False                            # The endless mode starts stopped
+        self.endlessLevel = int(os.environ.get("BLOBERT_ENDLESS_LEVEL", Qbert.ENDLESS_LEVEL))     # Get the level endless games start at
+        self.idleTime = 0                                   # Reset the idle time
+        self.inputBuffer = QbertInput.InputBuffer()         # Create the input buffer
+        self.scenes = {GameState.TITLE_SCREEN: QbertScenes.TitleScene(self),        # Create the scene of every game state
+                       GameState.SCORE_TABLE: QbertScenes.ScoreTableScene(self),
+                       GameState.GAMEPLAY: QbertScenes.GameplayScene(self),
+                       GameState.PAUSE: QbertScenes.PauseScene(self),
+                       GameState.NEXT_LEVEL: QbertScenes.NextLevelScene(self),
+                       GameState.GAME_OVER: QbertScenes.GameOverScene(self)}
+        if self.governor == None:                           # Check if the quality is fixed
+            self.setQuality(int(quality))                   # Draw at that quality
+        self.setState(GameState.TITLE_SCREEN)               # Show the title screen
         
           
-    def input(self):
+    def handleEvent(self, event):
         '''
-        Handles the keyboard input.
+        Handles an event using the action map of the current game state, called in the simulation thread.
         @param self The current object
+        @param event The pygame event.
 
         @author: Dario Urdapilleta
         @version 1.0
         @since 12 nov. 2022
         '''
-        for event in pygame.event.get():                                        # Loop on the events
-            if event.type == pygame.QUIT:                                       # Check is the event request to quit
-                pygame.quit()                                                   # Quit Pygame
-                exit()                                                          # Quit the application
-            elif event.type == pygame.KEYDOWN:                                  # Check if a key was pressed
-                key = event.key                                                 # Get the key
-                if key == pygame.K_ESCAPE:                                      # Check if the key is ESCAPE
-                    pygame.quit()                                               # Quit Pygame
-                    exit()                                                      # Quit the application
-                if self.gameState == GameState.TITLE_SCREEN:                    # For the TITLE_SCREEN
-                    if not self.buttonIsPressed:                                # Make sure no button is pressed
-                        if key == pygame.K_UP:                                  # Handle if the UP key is pressed
-                            if self.menuSelection > 0:                          # Make sure the selected element is greater than 0
-                                self.buttonIsPressed = True                     # Let the class know a button was pressed
-                                self.menuSelection = self.menuSelection - 1     # Reduce the menu selection by 1
-                        elif key == pygame.K_DOWN:                              # Handle the DOWN key
-                            if self.menuSelection < self.TITLE_OPTIONS - 1:     # Make sure the selected element is greater than 0
-                                self.buttonIsPressed = True                     # Let the class know a button was pressed
-                                self.menuSelection = self.menuSelection + 1     # Increment the menu selection
-                        elif key == pygame.K_RETURN:                            # Handle pressing the ENTER key
-                            self.buttonIsPressed = True                         # Let the class know a button was pressed
-                            if self.menuSelection == 0:                         # Start game was selected
-                                self.level = 1                                  # Set the initial level to 1
-                                self.score = 0                                  # Set the initial score to 0
-                                self.player = QbertPlayer.QbertPlayer(self.playerTexture)  # Create a new Player
-                                self.loadLevel()                                # Load a new level
-                                self.gameState = GameState.GAMEPLAY             # Change the game state to GAMEPLAY
-                            elif self.menuSelection == 1:                       # High score option was selected
-                                self.gameState = GameState.SCORE_TABLE          # Change the game state to SCORE_TABLE
-                            elif self.menuSelection == 2:                       # High score option was selected
-                                pygame.quit()                                   # Quit Pygame
-                                exit()                                          # Quit the application
-                elif self.gameState == GameState.SCORE_TABLE:                   # For the SCORE_TABLE
-                    if not self.buttonIsPressed:                                # Make sure no button is pressed
-                        if key == pygame.K_RETURN:                              # Handle pressing the ENTER key
-                            self.gameState = GameState.TITLE_SCREEN;            # Return to the TITLE_SCREEN
-                            self.buttonIsPressed = True                         # Let the class know a button was pressed
-                elif self.gameState == GameState.GAME_OVER:                     # Handle input in the GAME_OVER screen
-                    if not self.buttonIsPressed:                                # Make sure no button is pressed
-                        if key == pygame.K_RETURN:                              # Handle pressing the ENTER key
-                            self.saveScore(self.initials, self.currentLevel.getCurrentScore())      # Save the current score in the score list and file
-                            self.gameState = GameState.TITLE_SCREEN             # Change the game state to the TITLE_SCREEN
-                            self.buttonIsPressed = True                         # Let the class know a button was pressed
-                        elif key == pygame.K_LEFT:                              # Handle pressing the LEFT key
-                            if self.initialSelected > 0:                       # Handle pressing the LEFT key
-                                self.buttonIsPressed = True                     # Let the class know a button was pressed
-                                self.initialSelected = self.initialSelected - 1 # Reduce the selected initial by 1
-                        elif key == pygame.K_RIGHT:                             # Handle pressing the RIGHT button
-                            if self.initialSelected < 2:                        # Handle pressing the LEFT key
-                                self.buttonIsPressed = True                     # Let the class know a button was pressed
-                                self.initialSelected = self.initialSelected + 1 # Increment the initial selected
-                        elif key == pygame.K_UP:                                # Handle if the UP key is pressed
-                            if self.initials[self.initialSelected] >= 'Z':      # Check if the current letter is Z or more
-                                self.initials[self.initialSelected] = 'A'       # Change it to A
-                            else:
-                                self.initials[self.initialSelected] = chr(ord(self.initials[self.initialSelected])+1)        # Otherwise, increment it by 1
-                                self.buttonIsPressed = True                     # Let the class know a button was pressed
-                        elif key == pygame.K_DOWN:                              # Handle the DOWN key
-                            if self.initials[self.initialSelected] <= 'A':      # Check if the current is A or lower
-                                self.initials[self.initialSelected] = 'Z'       # Set it to Z
-                            else:
-                                self.initials[self.initialSelected] = chr(ord(self.initials[self.initialSelected])-1)   # Decrease the letter by 1
-                                self.buttonIsPressed = True                     # Let the class know a button was pressed
-                elif self.gameState == GameState.GAMEPLAY:                      # Handle input in the GAMEPLAY screen
-                    if not self.buttonIsPressed:                                # Make sure no button is pressed
-                        if not self.player.isMoving:                            # Make sure the player is not moving
-                            if key == pygame.K_q:                               # Handle pressing the Q key
-                                self.currentLevel.movePlayer(Qbert.NW)          # Move the player North West
-                            elif key == pygame.K_w:                             # Handle pressing the W key
-                                self.currentLevel.movePlayer(Qbert.NE)          # Move the player North East
-                            elif key == pygame.K_s:                             # Handle pressing the S key
-                                self.currentLevel.movePlayer(Qbert.SE)          # Move the player South East
-                            elif key == pygame.K_a:                             # Handle pressing the W key
-                                self.currentLevel.movePlayer(Qbert.SW)          # Move the player South West
-                        if key == pygame.K_p:                                   # Handle pressing the P key
-                            self.gameState = GameState.PAUSE;                   # Change the game state to GAMEPLAY
-                            self.buttonIsPressed = True                         # Let the class know a button was pressed
-                elif self.gameState == GameState.NEXT_LEVEL:                    # Handle the input in the NEXT_LEVEL screen
-                    if not self.buttonIsPressed:                                # Make sure no button is pressed
-                        if key == pygame.K_RETURN:                              # Handle pressing the ENTER key
-                            self.score = self.currentLevel.getCurrentScore()    # Update the score with the previous level score
-                            self.level = self.level + 1                         # Increment the level
-                            self.loadLevel()                                    # Load a new Level
-                            self.gameState = GameState.GAMEPLAY                 # Change the game state to GAMEPLAY
-                elif self.gameState == GameState.PAUSE:                         # Handle when the input on the PAUSE screen
-                    if not self.buttonIsPressed:                                # Make sure no button is pressed
-                        if key == pygame.K_p:                                   # Handle pressing the P key
-                            self.gameState = GameState.GAMEPLAY;                # Change the game state to GAMEPLAY
-                            self.buttonIsPressed = True                         # Let the class know a button was pressed
-        if  sum(pygame.key.get_pressed()) == 0:                                 # Make sure no important key is pressed
-            self.buttonIsPressed = False                                        # Let the class know no button is pressed
+        if event.type == pygame.QUIT:                                           # Check is the event request to quit
+            self.quit()                                                         # Save the scores and quit the application
+        elif event.type == pygame.KEYDOWN:                                      # Check if a key was pressed
+            key = event.key                                                     # Get the key
+            if key == pygame.K_ESCAPE:                                          # Check if the key is ESCAPE
+                self.quit()                                                     # Save the scores and quit the application
+            if self.profiler != None and key == self.profiler.HOTKEY:           # Check if the key starts or stops a profiling capture
+                self.profiler.toggle()                                          # Toggle the capture
+                return                                                          # The key is not part of the game
+            if key == QbertTrace.HOTKEY and self.tracer != None:                # Check if the key writes the trace
+                self.tracer.dump("requested")                                   # Write the last spans
+                return                                                          # The key is not part of the game
+            if self.recording != None:                                          # Check if the session is recorded
+                self.recording.recordKey(self.ticks, key)                       # Record the key
+            self.idleTime = 0                                                   # Reset the idle time
+            if self.attractMode:                                                # Any key stops the demo
+                self.attractMode = False                                        # Stop the demo
+                self.setState(GameState.TITLE_SCREEN)                           # Return to the TITLE_SCREEN
+            else:
+                action = self.scenes[self.gameState].actions.get(key)           # Look up the action of the key
+                if action != None:                                              # Check if the key does something in this state
+                    action()                                                    # Do the action
+
+    def nextLevel(self):
+        '''
+        Loads the next level.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.score = self.currentLevel.getCurrentScore()    # Update the score with the previous level score
+        self.level = self.level + 1                         # Increment the level
+        self.loadLevel()                                    # Load a new Level
+        self.setState(GameState.GAMEPLAY)                   # Change the game state to GAMEPLAY
     
     def update(self, gameTime):
         '''
-        Draws for the camera.
+        Updates the current scene, called in the simulation thread.
         @param self The current object
+        @param gameTime The time since the last update.
 
         @author: Dario Urdapilleta
         @version 1.0
         @since 12 nov. 2022
         '''
-        if self.gameState == GameState.GAMEPLAY:                                # When the game state is GAMEPLAY
-            self.currentLevel.update(gameTime)                                  # Update the current level
-            if self.currentLevel.getCurrentScore() - self.previousLivesInrement > Qbert.LIFE_BONUS:      # If the player's score has gone above the life bonus
-                self.player.oneUp()                                             # Add one life to the player
-                self.previousLivesInrement = self.currentLevel.getCurrentScore()       # Update the next life increment step
-            if self.currentLevel.gameCompleted():                               # If the game is completed
-                self.gameState = GameState.NEXT_LEVEL                           # Change the state to the NEXT_LEVEL
-            if self.player.isDead():                                            # if the player is dead
-                self.initialSelected = 0                                        # Set the initial selected to the first letter
-                self.gameState = GameState.GAME_OVER                            # Change the game state to the GAME_OVER state
+        self.scenes[self.gameState].update(gameTime)                            # Update the current scene
+        self.ticks = self.ticks + 1                                             # Count the tick
+        self.simulationTime = self.simulationTime + gameTime                    # Add the time simulated
+        if self.profiler != None:                                               # Check if the profiling captures are on
+            self.profiler.tick()                                                # Follow the renderer's capture
+        if self.spectators != None:                                             # Check if the game is streamed to spectators
+            self.spectators.publish(self, self.ticks)                           # Send the tick
 
-    def draw(self):
+    def getSimulationTime(self):
         '''
-        Draws for the camera.
+        Returns the time simulated, the clock of the recorded sessions.
         @param self The current object
+        @return The time simulated in seconds.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.simulationTime                                              # Return the time simulated
+
+    def draw(self, snapshot):
+        '''
+        Draws a snapshot for the camera, called in the main thread.
+        When the snapshot shows a new scene, the scenes it can go to are warmed and the others are freed.
+        @param self The current object
+        @param snapshot The QbertSnapshot to draw.
 
         @author: Dario Urdapilleta
         @version 1.0
         @since 12 nov. 2022
         '''
-        screen.fill((0, 0, 0))                                                  # Clear the screen
-        screen.blit(self.background, self.background.get_rect())                # Render the Background for all states
-        if self.gameState == GameState.TITLE_SCREEN:                            # For the TITLE_SCREEN 
-            backSquare = pygame.Surface((405,290), pygame.SRCALPHA)             # Create a square
-            backSquare.fill((0,0,0,200))                                        # Set the color with alpha
-            screen.blit(backSquare, (750,560))                                  # Display the square
-            backSquare = pygame.Surface((405,90), pygame.SRCALPHA)              # Create a square for the selection
-            backSquare.fill((120,100,30,220))                                   # Set the color with alpha
-            screen.blit(backSquare, (750,560 + (self.menuSelection * 100)))     # Display the square
-            screen.blit(self.title, (420,200))                                  # Render the Background for all states
-            text = self.font.render('New Game', True, (255,255,255))            # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (960, 600)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            text = self.font.render('High Score', True, (255,255,255))          # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (960, 700)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            text = self.font.render('Quit Game', True, (255,255,255))           # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (960, 800)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-        elif self.gameState == GameState.SCORE_TABLE:                           # For the SCORE_TABLE
-            backSquare = pygame.Surface((1920,1080), pygame.SRCALPHA)           # Create a square
-            backSquare.fill((0,0,0,200))                                        # Set the color with alpha
-            screen.blit(backSquare, (0,0))                                      # Display the square
-            text = self.font.render('HIGH SCORES', True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 100)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            recordsDisplayed = 0                                                # Variable to count the records displayed
-            for scoreCounter in self.highScores:                                # Loop through the highscores
-                if(recordsDisplayed < Qbert.MAX_DISPLAY_SCORE):                # Make sure there's room for this record
-                    text = self.font.render(scoreCounter.getName() + " " + str(scoreCounter.getScore()), True, (255,255,255))         # Get the text
-                    textRect = text.get_rect()                                  # Get the text rectangle
-                    textRect.center = (980, 200 + (recordsDisplayed * 100))     # Get the rect center
-                    screen.blit(text, textRect)                                 # Blit the text
-                recordsDisplayed = recordsDisplayed + 1                         # Increase the record displayed
-            text = self.font.render('Press ENTER to return to the Title Screen.', True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 980)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-        elif self.gameState == GameState.NEXT_LEVEL:                            # Draw the NEXT_LEVEL
-            backSquare = pygame.Surface((910,310), pygame.SRCALPHA)             # Create a square
-            backSquare.fill((0,0,0,200))                                        # Set the color with alpha
-            screen.blit(backSquare, (510,370))                                  # Display the square
-            text = self.font.render("LEVEL " + str(self.level) + " COMPLETED!", True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 450)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            text = self.font.render("Press ENTER to continue.", True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 610)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-        elif self.gameState == GameState.GAME_OVER:                             # Draw the GAME_OVER
-            backSquare = pygame.Surface((1170,510), pygame.SRCALPHA)            # Create a square
-            backSquare.fill((0,0,0,200))                                        # Set the color with alpha
-            screen.blit(backSquare, (380,300))                                  # Display the square
-            backSquare = pygame.Surface((30,60), pygame.SRCALPHA)               # Create a square for the selection
-            backSquare.fill((120,100,30,220))                                   # Set the color with alpha
-            screen.blit(backSquare, (1179 + self.initialSelected * 34,570))     # Display the square
-            text = self.font.render("GAME OVER!", True, (255,255,255))          # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 400)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            text = self.font.render("Your score was: " + str(self.currentLevel.getCurrentScore()), True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 500)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            text = self.font.render("Your initials: "+"".join(self.initials), True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 600)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-            text = self.font.render("Press ENTER to save your score.", True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 700)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-        elif self.gameState == GameState.PAUSE:                                 # Draw the PAUSE
-            backSquare = pygame.Surface((1920,1080), pygame.SRCALPHA)           # Create a square
-            backSquare.fill((0,0,0,200))                                        # Set the color with alpha
-            screen.blit(backSquare, (0,0))                                      # Display the square
-            text = self.font.render("PAUSED", True, (255,255,255))         # Get the text
-            textRect = text.get_rect()                                          # Get the text rectangle
-            textRect.center = (980, 580)                                        # Get the rect center
-            screen.blit(text, textRect)                                         # Blit the text
-        elif self.gameState == GameState.GAMEPLAY:                              # Draw the GAMEPLAY
-            backSquare = pygame.Surface((700,210), pygame.SRCALPHA)             # Create a square
-            backSquare.fill((0,0,0,200))                                        # Set the color with alpha
-            screen.blit(backSquare, (20,30))                                    # Display the square
-            self.currentLevel.drawPlayer(screen, True)                          # Render the player only if it is falling behind
-            self.currentLevel.drawEnemies(screen, True)                         # Render the enemies falling behind
-            self.currentLevel.drawBlocks(screen)                                # Draw the platforms
-            self.currentLevel.drawPlayer(screen, False)                         # Render the player if it is in fron of the platforms
-            self.currentLevel.drawEnemies(screen, False)                        # Render the enemies that are in fron of the platforms
-            text = self.font.render("Score: " + str(self.currentLevel.getCurrentScore()), True, (255,255,255))         # Get the text
-            screen.blit(text, (50,30))                                          # Blit the text
-            text = self.font.render("Level: " + str(self.level), True, (255,255,255))         # Get the text
-            screen.blit(text, (50,90))                                          # Blit the text
-            text = self.font.render("Lives: " + str(self.currentLevel.playersLives()), True, (255,255,255))         # Get the text
-            screen.blit(text, (50,150))                                         # Blit the text
-        pygame.display.flip()                                                   # Flip the display
-        
+        if snapshot is self.lastSnapshot:                                       # Check if the snapshot was already drawn
+            return                                                              # Nothing changed
+        self.lastSnapshot = snapshot                                            # Remember the snapshot
+        start = time.perf_counter()                                             # Start timing the frame
+        with QbertTrace.span("frame", "render", budgeted = True):               # Time the whole frame
+            scene = self.scenes[snapshot.gameState]                             # Get the scene
+            if snapshot.gameState != self.renderedState:                        # Check if the scene changed
+                with QbertTrace.span("changeScene", "render"):                  # Time the layers built and freed
+                    self.renderedState = snapshot.gameState                     # Remember the scene
+                    for state, other in self.scenes.items():                    # Loop through the scenes
+                        if state == snapshot.gameState or state in scene.NEXT_STATES:   # Check if the scene shows now or can come next
+                            other.warm(snapshot)                                # Build its layers ahead of time
+                        else:
+                            other.free()                                        # Free its layers
+                    scene.reveal()                                              # Draw the new scene whole
+            with QbertTrace.span("render", "render"):                           # Time the scene
+                rects = scene.render(pygame.display.get_surface(), snapshot)    # Draw the scene
+            with QbertTrace.span("present", "render"):                          # Time the present
+                if rects == None:                                               # Check if the whole frame changed
+                    pygame.display.flip()                                       # Flip the display
+                else:
+                    pygame.display.update(rects)                                # Show only the areas that changed
+        if self.governor != None:                                               # Check if the quality adapts
+            quality = self.governor.frame(time.perf_counter() - start)          # Measure the frame
+            if quality != None:                                                 # Check if the quality has to change
+                self.setQuality(quality)                                        # Change it for the next frame
+                print("Quality: %s at %dx%d" % ((QbertQuality.LEVEL_NAMES[quality],) + QbertView.renderSize), file = sys.stderr)   # Report the step, stdout may carry frames
+        if self.memoryMonitor != None:                                          # Check if the memory diagnostics are on
+            self.memoryMonitor.frame(snapshot.gameState)                        # Record the memory allocated by the frame
+        if self.profiler != None:                                               # Check if the profiling captures are on
+            self.profiler.frame(self, snapshot)                                 # Start, count and stop the captures
+
+    def loadAssets(self):
+        '''
+        Loads the textures and the fonts at the render resolution.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.background = QbertView.scaleImage(pygame.image.load(QbertView.getAssetPath("Qbert.png")).convert())      # Loads the background texture at the render resolution
+        self.title = QbertView.scaleImage(pygame.image.load(QbertView.getAssetPath("Title.png")).convert_alpha())     # Loads the title texture at the render resolution
+        self.font = pygame.font.Font(QbertView.getAssetPath('SyneMono-Regular.ttf'), QbertView.scaleValue(60))   # Laod the font
+        self.bitmapFont = BitmapFont.BitmapFont(QbertView.getAssetPath('syne.fnt'), QbertView.scaleValue(60))    # Load the bitmap font for the texts that change often
+
+    def setQuality(self, quality):
+        '''
+        Changes the quality the frames are drawn at, called in the main thread.
+        The cached layers and sprites are built again, and the display is opened again if the resolution changes.
+        @param self The current object
+        @param quality The quality level.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        size = QbertQuality.getRenderSize(self.renderSize, quality)             # Get the resolution of the quality
+        QbertQuality.level = quality                                            # Set the quality
+        if size != QbertView.renderSize:                                        # Check if the resolution changes
+            QbertView.setRenderSize(size)                                       # Set the resolution
+            QbertView.openDisplay()                                             # Open the display again
+            self.loadAssets()                                                   # Load the textures and the fonts again
+        for scene in self.scenes.values():                                      # Loop through the scenes
+            scene.free()                                                        # Forget the layers drawn at the old quality
+        self.renderedState = None                                               # Warm the scene again on the next frame
+        self.lastSnapshot = None                                                # Draw the next frame even if nothing changed
+
+    def setState(self, gameState):
+        '''
+        Changes the game state, leaving the current scene and entering the new one.
+        @param self The current object
+        @param gameState The new game state.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        previous = self.gameState                                               # Get the current game state
+        self.scenes[previous].exit()                                            # Leave the current scene
+        self.gameState = gameState                                              # Change the game state
+        self.scenes[gameState].enter()                                          # Enter the new scene
+        self.events.publish(QbertEvents.Event.STATE_CHANGED, previous, gameState)   # Tell the subscribers
+
+    def quit(self):
+        '''
+        Stops the game, the main loop shuts it down.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.running = False                                            # Stop the simulation and the main loop
+
+    def shutdown(self):
+        '''
+        Waits for the scores to be saved and quits pygame.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        print(self.inputBuffer.getLatencyReport(), file = sys.stderr)   # Report the input latency of the session, stdout may carry frames
+        if self.recording != None:                                      # Check if the session is recorded
+            self.recording.ticks = self.ticks                           # Set the length
+            self.recording.save(self.recordingPath)                     # Save the recording
+        if self.memoryMonitor != None:                                  # Check if the memory diagnostics are on
+            print(self.memoryMonitor.getReport(), file = sys.stderr)    # Report the memory of the session
+            self.memoryMonitor.stop()                                   # Stop tracing
+        if self.profiler != None:                                       # Check if the profiling captures are on
+            self.profiler.stop()                                        # Write the capture that is running
+        if self.spectators != None:                                     # Check if the game is streamed to spectators
+            print(self.spectators.getReport(), file = sys.stderr)       # Report what they were sent
+            self.spectators.close()                                     # Disconnect them
+        self.scoreWriter.close()                                        # Write the scores still queued
+        if self.leaderboardClient != None:                              # Check if there is a global leaderboard
+            self.leaderboardClient.close()                              # Send the scores still queued
+        pygame.quit()                                                   # Quit Pygame
+
+    def newGame(self, endless = False):
+        '''
+        Starts a new game from the first level, or from the endless level.
+        @param self The current object
+        @param endless True to start an endless game.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.endlessMode = endless                                      # Set the mode
+        self.level = self.endlessLevel if endless else 1                # Set the initial level
+        self.score = 0                                                  # Set the initial score to 0
+        self.player = QbertPlayer.QbertPlayer(self.playerTexture)       # Create a new Player
+        self.progress.newGame()                                         # Count the life bonus from 0
+        self.loadLevel()                                                # Load a new level
+        self.setState(GameState.GAMEPLAY)                               # Change the game state to GAMEPLAY
+
     def loadLevel(self):
         '''
         Loads a level depending on the current level number.
@@ -325,7 +438,13 @@ class Qbert():
         @version 1.0
         @since 12 nov. 2022
         '''
-        self.currentLevel = QbertLevel.QbertLevel(self.level, self.player, self.score, self.playerTexture);         # Create a new level
+        enemyPool = self.currentLevel.enemies if self.currentLevel != None else None                                # Use the enemies of the last level again
+        self.currentLevel = QbertLevel.QbertLevel(self.level, self.player, self.score, self.playerTexture, enemyPool, self.events)   # Create a new level
+        self.progress.levelLoaded(self.player)                                                                      # Follow the new level
+        self.inputBuffer.clear()                                                                                    # Forget the moves of the previous level
+        if self.memoryMonitor != None:                                                                              # Check if the memory diagnostics are on
+            self.memoryMonitor.levelLoaded(self.level)                                                              # Record the memory kept after the level changed
+
     def loadScores(self):
         '''
         Loads the scores from a binary file.
@@ -334,19 +453,86 @@ class Qbert():
         @version 1.0
         @since 12 nov. 2022
         '''
-        if os.path.isfile("scores.dat"):                                                # Check if the file exists
-            file = open("scores.dat", "rb")                                             # Open the file to read bytes
-            allBytes = file.read()                                                      # Read all the bytes
-            file.close()                                                                # Close the file
-            name = ['A', 'A', 'A']                                                      # Declare a list to store the name
-            score = [None] * 4                                                          # Declare a list to store the score
-            for bytesCounter in range(0, len(allBytes), 7):                             # Loop through the bytes 7 at a time
-                for nameCounter in range(3):                                            # Loop through the name
-                    name[nameCounter] = chr(allBytes[bytesCounter + nameCounter])       # Store the initial to the list
-                for scoreCounter in range(4):                                           # Loop through the score
-                    score[scoreCounter] = allBytes[bytesCounter + 3 + scoreCounter]     # Store the int information in the list
-                self.highScores.append(PlayerRecord.PlayerRecord(name, int.from_bytes(score, byteorder='big', signed=True)))    # Create a Player Record and append it to the highscores
+        with self.scoreWriter.writing:                                                  # Let the file and the scores not saved yet agree
+            self.highScores = self.scoreLog.loadRecords()[:Qbert.MAX_DISPLAY_SCORE]    # Load the records sorted by score
+            pending = self.scoreWriter.getPending(self.scoreLog.appendRecords)          # Get the scores not saved in the file yet
+        if self.leaderboardClient != None:                                              # Check if there is a global leaderboard
+            if self.leaderboardClient.getTopScores() != None:                           # Check if the global scores were fetched
+                self.highScores = list(self.leaderboardClient.getTopScores())           # Show the global scores
+                self.tableVersion = self.leaderboardClient.version                      # Remember the version shown
+        for record in pending:                                                          # Loop through the scores not saved yet
+            self.addScore(record)                                                       # Add them to the list
                 
+    def getAutopilot(self):
+        '''
+        Returns the autopilot, creating it the first time.
+        @param self The current object
+        @return The autopilot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.autopilot == None:                                                              # Check if it was not created yet
+            from QbertPackage import QbertAutopilot                                             # Load it only when the demo or the assist plays
+            self.autopilot = QbertAutopilot.QbertAutopilot()                                    # Create the autopilot
+        return self.autopilot                                                                   # Return it
+
+    def getLeaderboard(self):
+        '''
+        Returns the score history, opening it the first time, called in the score writer thread.
+        @param self The current object
+        @return The LeaderboardStore.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.leaderboard == None:                                                            # Check if it was not opened yet
+            from QbertPackage import LeaderboardStore                                           # Load sqlite3 only when the history is used
+            self.leaderboard = LeaderboardStore.LeaderboardStore(self.leaderboardName)          # Open the score history
+        return self.leaderboard                                                                 # Return it
+
+    def saveHistory(self, records):
+        '''
+        Adds records to the score history, called in the score writer thread.
+        @param self The current object
+        @param records The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.getLeaderboard().addRecords(records)                                               # Save them
+
+    def lookUpRank(self, score):
+        '''
+        Looks up the rank of a score in the history in the score writer thread, so the game never waits for the database.
+        @param self The current object
+        @param score The score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.rank = 0                                                                           # The rank is not known yet
+        self.rankScore = score                                                                  # Remember the score asked
+        self.scoreWriter.call(lambda: self.setRank(score, self.getLeaderboard().getRank(score)))   # Count after the scores being saved
+
+    def setRank(self, score, rank):
+        '''
+        Shows the rank of a score, called in the score writer thread.
+        @param self The current object
+        @param score The score.
+        @param rank The rank of the score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if score == self.rankScore:                                                             # Check if the score is still shown
+            self.rank = rank                                                                    # Show its rank
+
     def saveScore(self, name, score):
         '''
         Adds a new score into the list and saves the scores into a file.
@@ -358,17 +544,11 @@ class Qbert():
         @version 1.0
         @since 12 nov. 2022
         '''
-        self.addScore(PlayerRecord.PlayerRecord(name, score))                                   # Add the score to the score list
-        if os.path.isfile("scores.dat"):                                                        # Check if the scores file exists
-            os.remove("scores.dat")                                                             # Delete the file
-        file = open("scores.dat", "wb")                                                         # Open the file to write in bytes
-        savedRecords = 0                                                                        # Declare a variable to keep track of saved records
-        for scoreCounter in self.highScores:                                                    # Loop through the highscores
-            if savedRecords < Qbert.MAX_DISPLAY_SCORE:                                          # Make sure we don't save more than 10
-                file.write(bytes(scoreCounter.getName(), 'ascii'))                              # Write the name
-                file.write(scoreCounter.getScore().to_bytes(4, byteorder = 'big', signed=True)) # Write the score
-            savedRecords = savedRecords + 1                                                     # Increase the saved records
-        file.close()                                                                            # Close the file
+        record = PlayerRecord.PlayerRecord(name, score)                                         # Create the record
+        self.addScore(record)                                                                   # Add the score to the score list
+        self.scoreWriter.submit(record)                                                         # Save the score in the background
+        if self.leaderboardClient != None:                                                      # Check if there is a global leaderboard
+            self.leaderboardClient.submit(record)                                               # Send the score in the background
                 
     def addScore(self, score):
         '''
@@ -380,30 +560,47 @@ class Qbert():
         @version 1.0
         @since 12 nov. 2022
         '''
-        foundRank = False                                   # Declare a false boolean to see if a location for the new score has been found
-        rank = 0                                            # Declare an int for the new score's position
-        for scoreCounter in self.highScores:                # Loop through the score list until it is over or an adequate rank has been found
-            if not foundRank:                                   # Check if rank was not found
-                if scoreCounter.getScore() < score.getScore():  # Check if the new score is higher than the current score
-                    foundRank = True                            # We have found an appropriate rank
-                    self.highScores.insert(rank, score)         # Add the new score before the rank
-                else:
-                    rank = rank + 1                             # Otherwise increment the position
-        if not foundRank:                                   # If no score lower was found
-            self.highScores.append(score)                   # Add the score at the end
+        bisect.insort(self.highScores, score, key = lambda record: -record.getScore())         # Insert the score after the ones that are higher or equal
+        del self.highScores[Qbert.MAX_DISPLAY_SCORE:]                                       # Only the displayed scores are kept in memory
             
   
-pygame.init()                                                       # initializing pygame
-  
-screen = pygame.display.set_mode((1920, 1080), pygame.FULLSCREEN)   # Sets to Fullscreen
-pygame.display.set_caption("Blo*Bert")                              # Set the window name
-clock = pygame.time.Clock()                                         # Start the clock
-  
-qbert = Qbert()                                                     # Create the game object
-
-while True:                                                         # Loop until the game exits
-    timeSlice = clock.tick() / 1000                                 # Get the timeSlice
-    qbert.input()                                                   # Handle the input
-    qbert.update(timeSlice)                                             # Update the game
-    qbert.draw()                                                    # Draw the game
-    pygame.display.update()                                         # Update pygame
\ No newline at end of file
+def main(fullscreen = True, resolution = None, fps = 0, scoreDirectory = ""):
+    '''
+    Opens the display and runs the game until it quits.
+    @param fullscreen True to fill the screen, False to open a window.
+    @param resolution The render resolution as WIDTHxHEIGHT, BLOBERT_RESOLUTION by default.
+    @param fps The most frames drawn per second, 0 to draw every snapshot.
+    @param scoreDirectory The directory of the score files.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    pygame.init()                                                       # initializing pygame
+
+    if resolution == None:                                              # Check if the resolution was not given
+        resolution = os.environ.get("BLOBERT_RESOLUTION")               # Get the render resolution as WIDTHxHEIGHT, older cabinets use 960x540 or 1280x720
+    if resolution:                                                      # Check if the cabinet renders at a lower resolution
+        QbertView.setRenderSize(QbertView.parseRenderSize(resolution))  # Set the render resolution
+    QbertView.openDisplay(fullscreen)                                   # Sets to Fullscreen
+    pygame.display.set_caption("Blo*Bert")                              # Set the window name
+
+    qbert = Qbert(scoreDirectory)                                       # Create the game object
+    if qbert.profiler != None:                                          # Check if the profiling captures are on
+        qbert.profiler.listen()                                         # Start a capture on SIGUSR1 too
+    if qbert.tracer != None:                                            # Check if the tracing is on
+        qbert.tracer.listen()                                           # Write the trace on SIGUSR2 too
+    gameThread = GameThread.GameThread(qbert)                           # Create the simulation thread
+    gameThread.start()                                                  # Start the simulation
+
+    clock = pygame.time.Clock()                                         # The clock that caps the frame rate
+    while qbert.running:                                                # Loop until the game exits
+        gameThread.post(pygame.event.get())                             # Hand the input to the simulation
+        qbert.draw(gameThread.getSnapshot(1 / GameThread.GameThread.TICK_RATE))    # Draw the latest snapshot
+        if fps > 0:                                                     # Check if the frame rate is capped
+            clock.tick(fps)                                             # Wait for the next frame
+    gameThread.stop()                                                   # Wait for the last tick
+    qbert.shutdown()                                                    # Save the scores and quit
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+'''
+This class represents an autopilot that plays Qbert by searching ahead.
+
+For every decision it copies the level into a SimulationState and runs a beam
+search from each direction, sampling different enemy moves until the time
+budget is spent.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import time
+import random
+from QbertPackage import QbertSimulation
+from QbertPackage import QbertGraph
+
+class QbertAutopilot(object):
+    '''
+    Variables:
+    DEATH_VALUE: The value of losing all the lives
+    LIFE_VALUE: The value of a life
+    BLOCK_VALUE: The value of each block turned on
+    COMPLETED_VALUE: The value of completing the level
+    DANGER_VALUE: The value of standing next to an enemy
+    DISTANCE_VALUE: The value of each jump to the closest block that is off
+    rules: The simulation rules
+    budget: The time allowed for each decision
+    depth: The number of jumps to look ahead
+    beamWidth: The number of states kept on each depth
+    random: The random generator for the samples
+    futures: The number of states evaluated in the last decision
+    '''
+    DEATH_VALUE = -1000000      # The value of losing all the lives
+    LIFE_VALUE = 5000           # The value of a life
+    BLOCK_VALUE = 200           # The value of each block turned on
+    COMPLETED_VALUE = 20000     # The value of completing the level
+    DANGER_VALUE = 300          # The value of standing next to an enemy
+    DISTANCE_VALUE = 50         # The value of each jump to the closest block that is off
+
+    def __init__(self, rules = None, budget = 0.004, depth = 3, beamWidth = 4):
+        '''
+        Creates a new QbertAutopilot.
+        @param self The current object
+        @param rules The SimulationRules, the game rules by default.
+        @param budget The time in seconds allowed for each decision.
+        @param depth The number of jumps to look ahead.
+        @param beamWidth The number of states kept on each depth.
+        @return A new instance of the QbertAutopilot
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if rules == None:                                           # Check if there are no rules
+            rules = QbertSimulation.SimulationRules()               # Use the game rules
+        self.rules = rules                                          # Set the rules
+        self.budget = budget                                        # Set the time budget
+        self.depth = depth                                          # Set the depth
+        self.beamWidth = beamWidth                                  # Set the beam width
+        self.random = random.Random()                               # Create the random generator
+        self.futures = 0                                            # No futures evaluated yet
+
+    def chooseDirection(self, level):
+        '''
+        Chooses the best direction for the player of a level.
+        @param self The current object
+        @param level The QbertLevel.
+        @return The direction to move the player.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.search(level.getSimulationState(self.rules, self.random.getrandbits(64)))  # Search from the level state
+
+    def search(self, root):
+        '''
+        Searches the best direction from a state within the time budget.
+        @param self The current object
+        @param root The SimulationState.
+        @return The best direction.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        deadline = time.perf_counter() + self.budget                                # Calculate the deadline
+        totals = [0] * QbertGraph.QbertGraph.DIRECTIONS                             # Declare the value of each direction
+        self.futures = 0                                                            # Reset the futures counter
+        while True:                                                                 # Sample until the budget is spent
+            seed = self.random.getrandbits(64)                                      # Get the seed of this sample
+            for direction in range(len(totals)):                                    # Loop through the directions
+                start = root.clone()                                                # Clone the root
+                start.seed = seed or 1                                              # Every direction sees the same enemies
+                start.advance(direction)                                            # Jump towards the direction
+                totals[direction] = totals[direction] + self.beamSearch(start)      # Add the value of the best future
+            if time.perf_counter() >= deadline:                                     # Check if the budget is spent
+                break                                                               # Stop sampling
+        best = max(totals)                                                          # Get the best value
+        return self.random.choice([direction for direction in range(len(totals)) if totals[direction] == best])  # Return a best direction, breaking ties randomly
+
+    def beamSearch(self, start):
+        '''
+        Returns the value of the best state reachable from a state.
+        @param self The current object
+        @param start The SimulationState.
+        @return The value of the best future.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        best = self.evaluate(start)                                                 # Declare the best value
+        beam = [(best, start)]                                                      # Start the beam with the state
+        for depthCounter in range(self.depth - 1):                                  # Loop through the depth
+            candidates = []                                                         # Declare the next beam
+            for value, state in beam:                                               # Loop through the beam
+                if state.isDead() or state.isCompleted():                           # Check if the state ended
+                    continue                                                        # Don't expand it
+                for direction in range(QbertGraph.QbertGraph.DIRECTIONS):           # Loop through the directions
+                    child = state.step(direction)                                   # Step the state
+                    candidates.append((self.evaluate(child), child))                # Store the child
+            if not candidates:                                                      # Check if there is nothing to expand
+                break                                                               # Stop searching
+            self.futures = self.futures + len(candidates)                           # Count the futures
+            candidates.sort(key = lambda candidate: candidate[0], reverse = True)   # Sort by value
+            beam = candidates[:self.beamWidth]                                      # Keep the best states
+            best = max(best, beam[0][0])                                            # Update the best value
+        return best                                                                 # Return the best value
+
+    def evaluate(self, state):
+        '''
+        Evaluates a state.
+        @param self The current object
+        @param state The SimulationState.
+        @return The value of the state.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if state.isDead():                                                          # Check if the player is dead
+            return QbertAutopilot.DEATH_VALUE                                       # Return the worst value
+        value = state.score + state.lives * QbertAutopilot.LIFE_VALUE               # Value the score and lives
+        value = value - state.remainingBlocks() * QbertAutopilot.BLOCK_VALUE        # Value the blocks that are off
+        if state.isCompleted():                                                     # Check if the level is completed
+            return value + QbertAutopilot.COMPLETED_VALUE                           # Nothing can hurt the player anymore
+        distances = state.graph.distances[state.player]                             # Get the distances from the player
+        closest = state.graph.size                                                  # Declare the closest block that is off
+        for cell in range(state.graph.size):                                        # Loop through the cells
+            if not state.board & (1 << cell) and distances[cell] < closest:         # Check if the block is off and closer
+                closest = distances[cell]                                           # Store the distance
+        value = value - closest * QbertAutopilot.DISTANCE_VALUE                     # Value the distance to the next block
+        neighbours = state.graph.neighbours[state.player]                           # Get the player's neighbours
+        for enemy in state.enemies:                                                 # Loop through the enemies
+            if enemy[0] != QbertGraph.OFF_BOARD and enemy[0] in neighbours:         # Check if the enemy is next to the player
+                value = value - QbertAutopilot.DANGER_VALUE                         # Reduce the value
+        return value                                                                # Return the value
@@ -0,0 +1,318 @@
+'''
+This module runs the balancing farm that plays thousands of simulated games
+for every combination of difficulty and scoring parameters.
+
+Usage:
+python -m QbertPackage.QbertBalancing --life-bonus 500,1000 --enemy-divisor 2,3 --games 10000 --output games.jsonl
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from QbertPackage import QbertSimulation
+from QbertPackage import QbertAutopilot
+from QbertPackage import QbertGraph
+
+PLAYERS = ("random", "scripted", "autopilot")     # The players that can play the games
+
+def chooseRandom(state, generator, autopilot):
+    '''
+    Chooses a random direction, the player may jump off the board.
+    @param state The SimulationState.
+    @param generator The random generator.
+    @param autopilot Unused.
+    @return The direction.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return generator.randrange(QbertGraph.QbertGraph.DIRECTIONS)       # Return any direction
+
+def chooseScripted(state, generator, autopilot):
+    '''
+    Chooses a direction that turns on a block without landing on an enemy.
+    @param state The SimulationState.
+    @param generator The random generator.
+    @param autopilot Unused.
+    @return The direction.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    safe = []                                                           # Declare the safe directions
+    for direction, cell in enumerate(state.graph.neighbours[state.player]):     # Loop through the neighbours
+        if cell != QbertGraph.OFF_BOARD and not state.isOccupied(cell):    # Check the cell is safe
+            if not state.board & (1 << cell):                           # Check if the block is off
+                return direction                                        # Turn it on
+            safe.append(direction)                                      # Store the safe direction
+    if safe:                                                            # Check if there is a safe direction
+        return generator.choice(safe)                                   # Return a random safe direction
+    return chooseRandom(state, generator, autopilot)                    # There is no way out
+
+def chooseAutopilot(state, generator, autopilot):
+    '''
+    Chooses the direction of the autopilot.
+    @param state The SimulationState.
+    @param generator Unused.
+    @param autopilot The QbertAutopilot.
+    @return The direction.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return autopilot.search(state)                                      # Search the best direction
+
+CHOOSERS = {"random": chooseRandom, "scripted": chooseScripted, "autopilot": chooseAutopilot}   # The function of every player
+
+def playGame(rules, player, seed, maxLevel, maxJumps, autopilot):
+    '''
+    Plays one game until the player dies or reaches the max level.
+    @param rules The SimulationRules.
+    @param player The player name.
+    @param seed The game seed.
+    @param maxLevel The last level to play.
+    @param maxJumps The jumps allowed in a level before the game is stopped.
+    @param autopilot The QbertAutopilot used by the autopilot player.
+    @return A dictionary with the game results.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    generator = random.Random(seed)                                                 # Create the player's random generator
+    choose = CHOOSERS[player]                                                       # Get the player
+    state = QbertSimulation.SimulationState(rules, 1, 0, 3, seed)                   # Start the first level
+    levelTimes = []                                                                 # Declare the level completion times
+    jumps = 0                                                                       # Declare the jump counter
+    while True:                                                                     # Loop through the levels
+        jumps = jumps + 1                                                           # Count the jump
+        state.advance(choose(state, generator, autopilot))                          # Move the player
+        if state.isDead() or jumps > maxJumps:                                      # Check if the game is over
+            break                                                                   # Stop playing
+        if state.isCompleted():                                                     # Check if the level is completed
+            levelTimes.append(round(state.time, 3))                                 # Store the completion time
+            if state.level >= maxLevel:                                             # Check if it was the last level
+                break                                                               # Stop playing
+            state = QbertSimulation.SimulationState(rules, state.level + 1, state.score, state.lives, state.seed, state.bonusMark)    # Load the next level
+            jumps = 0                                                               # Reset the jump counter
+    return {"seed": seed, "level": state.level, "completed": len(levelTimes), "score": state.score,    # Return the results
+            "lives": max(state.lives, 0), "timedOut": jumps > maxJumps, "levelTimes": levelTimes}
+
+def playGames(configuration, player, seeds, maxLevel, maxJumps):
+    '''
+    Plays a chunk of games in a worker process.
+    @param configuration The dictionary with the SimulationRules parameters.
+    @param player The player name.
+    @param seeds The seed of every game.
+    @param maxLevel The last level to play.
+    @param maxJumps The jumps allowed in a level before the game is stopped.
+    @return The list of game results.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    rules = QbertSimulation.SimulationRules(**configuration)                            # Create the rules
+    autopilot = QbertAutopilot.QbertAutopilot(rules, budget = 0)                        # Create an autopilot that takes one sample
+    return [playGame(rules, player, seed, maxLevel, maxJumps, autopilot) for seed in seeds]  # Play the games
+
+class BalancingReport(object):
+    '''
+    Variables:
+    configuration: The parameters of the games
+    games: The number of games played
+    reached: The number of games that reached every level
+    levelTimes: The completion times of every level
+    totalScore: The sum of the scores
+    timeOuts: The number of games that were stopped
+    '''
+
+    def __init__(self, configuration, maxLevel):
+        '''
+        Creates an empty report for a configuration.
+        @param self The current object
+        @param configuration The dictionary with the SimulationRules parameters.
+        @param maxLevel The last level played.
+        @return A new instance of the BalancingReport
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.configuration = configuration                          # Set the configuration
+        self.games = 0                                              # No games yet
+        self.reached = [0] * (maxLevel + 1)                         # Declare the games that reached every level
+        self.levelTimes = [[] for levelCounter in range(maxLevel + 1)]  # Declare the times of every level
+        self.totalScore = 0                                         # Reset the score
+        self.timeOuts = 0                                           # Reset the time outs
+
+    def addGame(self, result):
+        '''
+        Adds a game to the report.
+        @param self The current object
+        @param result The game results.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.games = self.games + 1                                             # Count the game
+        for levelCounter in range(1, result["level"] + 1):                      # Loop through the levels played
+            self.reached[levelCounter] = self.reached[levelCounter] + 1         # Count the level as reached
+        for levelCounter, levelTime in enumerate(result["levelTimes"]):         # Loop through the completed levels
+            self.levelTimes[levelCounter + 1].append(levelTime)                 # Store the time
+        self.totalScore = self.totalScore + result["score"]                     # Add the score
+        self.timeOuts = self.timeOuts + result["timedOut"]                      # Count the time out
+
+    def getSurvival(self):
+        '''
+        Returns the survival curve.
+        @param self The current object
+        @return The fraction of games that reached every level, starting at level 1.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return [round(reached / max(self.games, 1), 4) for reached in self.reached[1:]]     # Divide by the games
+
+    def getMedianTimes(self):
+        '''
+        Returns the median completion time of every level.
+        @param self The current object
+        @return The median times starting at level 1, None if no game completed the level.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        medians = []                                                # Declare the medians
+        for times in self.levelTimes[1:]:                           # Loop through the levels
+            if times:                                               # Check if the level was completed
+                medians.append(sorted(times)[len(times) // 2])      # Store the median
+            else:
+                medians.append(None)                                # Nobody completed it
+        return medians                                              # Return the medians
+
+    def toDictionary(self):
+        '''
+        Returns the report as a dictionary.
+        @param self The current object
+        @return The dictionary.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return {"configuration": self.configuration, "games": self.games, "meanScore": round(self.totalScore / max(self.games, 1), 1),
+                "timeOuts": self.timeOuts, "survival": self.getSurvival(), "medianLevelTimes": self.getMedianTimes()}
+
+def parseValues(text, kind):
+    '''
+    Parses a comma separated list of values.
+    @param text The text.
+    @param kind The type of the values.
+    @return The list of values.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return [kind(value) for value in text.split(",") if value]      # Convert every value
+
+def buildConfigurations(arguments):
+    '''
+    Builds every combination of the parameter grid.
+    @param arguments The parsed arguments.
+    @return The list of configurations.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    grid = {"lifeBonus": parseValues(arguments.life_bonus, int),                # Declare the grid
+            "lowestTimeToAct": parseValues(arguments.lowest_time, int),
+            "highestTimeToAct": parseValues(arguments.highest_time, int),
+            "enemyDivisor": parseValues(arguments.enemy_divisor, int),
+            "chaserDivisor": parseValues(arguments.chaser_divisor, int),
+            "scoreBase": parseValues(arguments.score_base, int),
+            "scoreStep": parseValues(arguments.score_step, int)}
+    configurations = []                                                         # Declare the configurations
+    for values in itertools.product(*grid.values()):                            # Loop through the combinations
+        configuration = dict(zip(grid.keys(), values))                          # Build the configuration
+        if configuration["lowestTimeToAct"] <= configuration["highestTimeToAct"]:   # Skip the invalid times
+            configurations.append(configuration)                                # Store the configuration
+    return configurations                                                       # Return the configurations
+
+def main(argv = None):
+    '''
+    Runs the balancing farm from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    defaults = QbertSimulation.SimulationRules()                                                # Get the game rules
+    parser = argparse.ArgumentParser(prog = "QbertBalancing", description = "Plays simulated games for every combination of parameters.")
+    parser.add_argument("--life-bonus", default = str(defaults.lifeBonus), help = "Comma separated QbertProgression.LIFE_BONUS values")
+    parser.add_argument("--lowest-time", default = str(defaults.lowestTimeToAct), help = "Comma separated QbertEnemy.lowestTimeToAct values")
+    parser.add_argument("--highest-time", default = str(defaults.highestTimeToAct), help = "Comma separated QbertEnemy.highestTimeToAct values")
+    parser.add_argument("--enemy-divisor", default = str(defaults.enemyDivisor), help = "Comma separated levels per extra enemy")
+    parser.add_argument("--chaser-divisor", default = str(defaults.chaserDivisor), help = "Comma separated levels per extra chaser")
+    parser.add_argument("--score-base", default = str(defaults.scoreBase), help = "Comma separated block scores")
+    parser.add_argument("--score-step", default = str(defaults.scoreStep), help = "Comma separated levels per block score increase")
+    parser.add_argument("--games", type = int, default = 10000, help = "Games played by every configuration")
+    parser.add_argument("--player", choices = PLAYERS, default = "scripted", help = "The player of the games")
+    parser.add_argument("--max-level", type = int, default = 30, help = "The last level of a game")
+    parser.add_argument("--max-jumps", type = int, default = 2000, help = "The jumps allowed in a level before a game is stopped")
+    parser.add_argument("--chunk", type = int, default = 250, help = "Games sent to a worker at once")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "Worker processes")
+    parser.add_argument("--seed", type = int, default = 0, help = "The seed of the first game")
+    parser.add_argument("--output", help = "File where every game result is streamed as a JSON line, - for stdout")
+    arguments = parser.parse_args(argv)                                                         # Parse the arguments
+    configurations = buildConfigurations(arguments)                                             # Build the grid
+    reports = [BalancingReport(configuration, arguments.max_level) for configuration in configurations]    # Create the reports
+    stream = None                                                                               # Declare the result stream
+    if arguments.output == "-":                                                                 # Check if the results go to stdout
+        stream = sys.stdout                                                                     # Stream to stdout
+    elif arguments.output:                                                                      # Check if there is an output file
+        stream = open(arguments.output, "w")                                                    # Open the output file
+    start = time.perf_counter()                                                                 # Start the timer
+    with ProcessPoolExecutor(max_workers = arguments.workers) as executor:                      # Start the workers
+        futures = {}                                                                            # Declare the pending chunks
+        for configIndex, configuration in enumerate(configurations):                            # Loop through the configurations
+            for first in range(0, arguments.games, arguments.chunk):                            # Split the games in chunks
+                seeds = range(arguments.seed + first, arguments.seed + min(first + arguments.chunk, arguments.games))   # Get the seeds of the chunk
+                future = executor.submit(playGames, configuration, arguments.player, list(seeds), arguments.max_level, arguments.max_jumps)
+                futures[future] = configIndex                                                   # Remember the configuration
+        for future in as_completed(futures):                                                    # Loop through the chunks as they finish
+            configIndex = futures[future]                                                       # Get the configuration
+            for result in future.result():                                                      # Loop through the games
+                reports[configIndex].addGame(result)                                            # Add it to the report
+                if stream != None:                                                              # Check if the results are streamed
+                    result["config"] = configIndex                                              # Tag the configuration
+                    stream.write(json.dumps(result) + "\n")                                     # Write the result
+            if stream != None:                                                                  # Check if the results are streamed
+                stream.flush()                                                                  # Flush the chunk
+    if stream != None and stream != sys.stdout:                                                 # Check if a file was opened
+        stream.close()                                                                          # Close it
+    elapsed = time.perf_counter() - start                                                       # Stop the timer
+    totalGames = sum(report.games for report in reports)                                        # Count the games
+    for report in reports:                                                                      # Loop through the reports
+        print(json.dumps(report.toDictionary()), file = sys.stderr if stream == sys.stdout else sys.stdout)  # Print the summary
+    print("%d games in %.1f s (%.0f games/s)" % (totalGames, elapsed, totalGames / max(elapsed, 1e-9)), file = sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from enum import Enum
 import pygame.math as Math
 
 from QbertPackage import SpriteAnimation
+from QbertPackage import QbertView
 
 class State(Enum):      # Enum with all the animation states
     IDDLE = 0
@@ -29,6 +30,8 @@ class QbertBeingClass(object):
     deltaHeight: The height change rate
     deltaMovement: The movement animation frame rate
     deltaJump: The jump animation frame rate
+    cellHeight: The design pixels between two lines of the board, the height is measured in them when colliding
+    animationIndexes: The animation shown in every state
     position: The being's position
     texture: The being's sprite list
     movementSlice: The direction it is moving
@@ -46,12 +49,22 @@ class QbertBeingClass(object):
     deltaHeight = 4         # The height change rate
     deltaMovement = 0.02    # The movement animation frame rate
     deltaJump = 0.1         # The jump animation frame rate
+    cellHeight = 110        # The design pixels between two lines of the board
+    animationIndexes = {State.IDDLE: 0,                         # The animation shown in every state
+                        State.JUMPING_FRONT_UP_RIGHT: 1,
+                        State.JUMPING_FRONT_UP_LEFT: 2,
+                        State.JUMPING_FRONT_DOWN_RIGHT: 1,
+                        State.JUMPING_FRONT_DOWN_LEFT: 2,
+                        State.JUMPING_BACK_UP_LEFT: 4,
+                        State.JUMPING_BACK_UP_RIGHT: 3,
+                        State.JUMPING_BACK_DOWN_LEFT: 4,
+                        State.JUMPING_BACK_DOWN_RIGHT: 3}
 
     def __init__(self, texture, start, animationLength):
         '''
         Creates a new instance of a QbertBeing given the spritesheet information.
         @param self The current object
-        @param fileName The Spritesheet's file name.
+        @param texture The spritesheet, None for a headless being that is never drawn.
         @param start The start spritesheet position.
         @param animationLength The length of each animation.
         @return A new instance of the QbertBeing
@@ -67,7 +80,7 @@ class QbertBeingClass(object):
         self.pleaseRespawn = False                                                          # It doesn't need to be respawned
         self.movementSlice = Math.Vector2(0, 0)                                             # It's not moving
         self.jumpMovement = Math.Vector2(0, 0)                                              # It's not moving
-        self.texture = texture.convert_alpha()                                              # Loads the being's texture
+        self.texture = texture                                                              # Keep the being's texture, the animations convert it once
         self.animations = [None] * 5                                                        # Create the animations array
         for animationCounter in range(len(self.animations)):                                # Loop through the animations
             self.animations[animationCounter] = SpriteAnimation.SpriteAnimation(self.texture, animationLength, 60, 60, start + animationCounter)      # Create the animation
@@ -160,6 +173,20 @@ class QbertBeingClass(object):
         '''
         return self.jumpMovement       # return the actual movement
     
+    def getPlacement(self):
+        '''
+        Returns the being's continuous position, between two cells while it jumps.
+        @param self The current object
+        @return The x and y position plus the jump movement and the height in cells, or None if the being has no position.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.position == None:                                                   # Check if the being has no position
+            return None                                                             # It is nowhere
+        return (self.position.x + self.jumpMovement.x, self.position.y + self.jumpMovement.y, self.height / QbertBeingClass.cellHeight)   # Return the placement
+
     def getPosition(self):
         '''
         Returns the being's position as a Vector2
@@ -271,6 +298,22 @@ class QbertBeingClass(object):
         for animationCounter in range(len(self.animations)):        # Loop through the animations
             self.animations[animationCounter].update(gameTime)      # Update the animation
             
+    def getSprite(self, graphicPosition):
+        '''
+        Returns the frame to show and where to show it.
+        @param self The current object
+        @param graphicPosition The being's acutal position
+        @return The frame surface and its position in design pixels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        animation = QbertBeingClass.animationIndexes.get(self.state)                       # Get the animation of the state
+        if animation == None:                                                               # Check if the state has no animation
+            return self.animations[0].getFrame(), (graphicPosition.x, graphicPosition.y)   # Show the idle animation
+        return self.animations[animation].getFrame(), (graphicPosition.x, graphicPosition.y - self.height)   # Show the animation above the position
+
     def draw(self, screen, graphicPosition):
         '''
         Draws the being
@@ -282,28 +325,8 @@ class QbertBeingClass(object):
         @version 1.0
         @since 13 nov. 2022
         '''
-        for animationCounter in range(len(self.animations)):                # Loop through the animations
-            self.animations[animationCounter].position = Math.Vector2(graphicPosition.x, graphicPosition.y - self.height)    # Update the animations position
-        if self.state == State.IDDLE:                               # When it is IDDLE
-            self.animations[0].draw(screen, self.animations[0].position)        # Show the idle animation
-        elif self.state == State.JUMPING_FRONT_UP_RIGHT:            # When it is JUMPING_FRONT_UP_RIGHT
-            self.animations[1].draw(screen, self.animations[0].position)        # Show the JUMPING_FRONT_UP_RIGHT animation
-        elif self.state == State.JUMPING_FRONT_UP_LEFT:             # When it is JUMPING_FRONT_UP_LEFT
-            self.animations[2].draw(screen, self.animations[0].position)        # Show the JUMPING_FRONT_UP_LEFT animation
-        elif self.state == State.JUMPING_FRONT_DOWN_RIGHT:          # When it is JUMPING_FRONT_DOWN_RIGHT
-            self.animations[1].draw(screen, self.animations[0].position)        # Show the JUMPING_FRONT_DOWN_RIGHT animation
-        elif self.state == State.JUMPING_FRONT_DOWN_LEFT:           # When it is JUMPING_FRONT_DOWN_LEFT
-            self.animations[2].draw(screen, self.animations[0].position)        # Show the JUMPING_FRONT_DOWN_LEFT animation
-        elif self.state == State.JUMPING_BACK_UP_LEFT:              # When it is JUMPING_BACK_UP_LEFT
-            self.animations[4].draw(screen, self.animations[0].position)        # Show the JUMPING_BACK_UP_LEFT animation
-        elif self.state == State.JUMPING_BACK_UP_RIGHT:             # When it is JUMPING_BACK_UP_RIGHT
-            self.animations[3].draw(screen, self.animations[0].position)        # Show the JUMPING_BACK_UP_RIGHT animation
-        elif self.state == State.JUMPING_BACK_DOWN_LEFT:            # When it is JUMPING_BACK_DOWN_LEFT
-            self.animations[4].draw(screen, self.animations[0].position)        # Show the JUMPING_BACK_DOWN_LEFT animation
-        elif self.state == State.JUMPING_BACK_DOWN_RIGHT:           # When it is JUMPING_BACK_DOWN_RIGHT
-            self.animations[3].draw(screen, self.animations[0].position)        # Show the JUMPING_BACK_DOWN_RIGHT animation
-        else:
-            self.animations[0].draw(screen, graphicPosition)        # Show the idle animation
+        frame, position = self.getSprite(graphicPosition)                      # Get the frame and its position
+        screen.blit(frame, QbertView.scalePoint(position))                      # Display the frame
             
     def hit(self):
         '''
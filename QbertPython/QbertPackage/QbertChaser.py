@@ -0,0 +1,73 @@
+'''
+This class represents A Qbert enemy that chases the player.
+
+The chaser jumps along a shortest path towards the player's cell. The paths
+are precomputed by QbertGraph once per board shape, so choosing a direction is
+a single lookup and many chasers cost the same as wandering enemies. The
+chasers are drawn with a red tint so the player can tell them apart.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import pygame
+from QbertPackage import QbertEnemy
+
+class QbertChaser(QbertEnemy.QbertEnemy):
+    '''
+    Variables:
+    TINT: The colour multiplied into the enemy's texture
+    tintedTextures: The tinted copy of every texture, shared by every chaser
+    '''
+    TINT = (255, 110, 110, 255)     # The colour multiplied into the enemy's texture
+    tintedTextures = {}             # The textures tinted so far
+
+    def __init__(self, texture):
+        '''
+        Creates a new instance of a QbertChaser.
+        @param self The current object
+        @param texture The spritesheet
+        @return A new instance of the QbertChaser
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        super().__init__(QbertChaser.getTintedTexture(texture))     # Call the parent's method with the tinted texture
+
+    @staticmethod
+    def getTintedTexture(texture):
+        '''
+        Returns the tinted copy of a texture, tinting it only once.
+        @param texture The spritesheet, None for a headless chaser.
+        @return The tinted spritesheet, None for a headless chaser.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if texture == None:                                                                 # Check if the chaser is headless
+            return None                                                                     # There is nothing to tint
+        if id(texture) not in QbertChaser.tintedTextures:                                   # Check if the texture was not tinted yet
+            tinted = texture.copy()                                                         # Copy the texture
+            tinted.fill(QbertChaser.TINT, special_flags = pygame.BLEND_RGBA_MULT)           # Tint it
+            QbertChaser.tintedTextures[id(texture)] = (texture, tinted)                     # Keep the original so its id is not reused
+        return QbertChaser.tintedTextures[id(texture)][1]                                   # Return the tinted texture
+
+    def chooseDirection(self, graph, cell, playerCell):
+        '''
+        Chooses the direction that gets closer to the player, it wanders when there is no path.
+        @param self The current object
+        @param graph The pyramid graph.
+        @param cell The enemy's cell.
+        @param playerCell The player's cell.
+        @return The direction to move.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        direction = graph.getNextHop(cell, playerCell)                              # Look up the jump towards the player
+        if direction == None:                                                       # Check if there is no path
+            return super().chooseDirection(graph, cell, playerCell)                 # Wander
+        return direction                                                            # Chase the player
@@ -0,0 +1,134 @@
+'''
+This class represents a spatial hash of the beings used to find collisions.
+
+The beings are hashed by the board cell nearest to their continuous position,
+so a being can only touch the beings hashed in its cell or in the 8 cells
+around it. Finding the collisions of the player is a constant number of
+lookups, and building the hash is one insertion per being, so the cost grows
+with the number of beings and not with its square.
+
+Every being is swept from its placement in the previous update to its
+placement in this one, and two beings collide when the closest they got
+during the update is under the collision radius. Beings that cross each
+other in the middle of a jump collide even if they never share a cell.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import math
+
+COLLISION_RADIUS = 0.5      # The distance in cells under which two beings collide
+MAX_STEP = 0.2              # The longest a being moves in an update, a longer step is a respawn
+
+def getCellKey(placement):
+    '''
+    Returns the board cell nearest to a placement.
+    @param placement The x, y and height placement.
+    @return The x and y of the cell.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return (math.floor(placement[0] + 0.5), math.floor(placement[1] + 0.5))      # Round both axes
+
+def getDistance(placement, otherPlacement):
+    '''
+    Returns the distance between two placements.
+    @param placement The first placement.
+    @param otherPlacement The second placement.
+    @return The distance in cells.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return math.sqrt(sum((value - otherValue) ** 2 for value, otherValue in zip(placement, otherPlacement)))    # Return the distance
+
+def getClosestDistance(start, end, otherStart, otherEnd):
+    '''
+    Returns the closest two beings got while both moved in a straight line during an update.
+    @param start The placement of the first being in the previous update.
+    @param end The placement of the first being in this update.
+    @param otherStart The placement of the second being in the previous update.
+    @param otherEnd The placement of the second being in this update.
+    @return The distance in cells.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    startGap = [value - otherValue for value, otherValue in zip(start, otherStart)]        # Get the gap before the update
+    endGap = [value - otherValue for value, otherValue in zip(end, otherEnd)]              # Get the gap after the update
+    change = [endValue - startValue for startValue, endValue in zip(startGap, endGap)]     # Get how the gap changed
+    length = sum(value * value for value in change)                                         # Get the squared length of the change
+    closest = 0                                                                             # Declare the moment of the closest gap
+    if length > 0:                                                                          # Check if the gap changed
+        closest = min(1, max(0, -sum(gap * value for gap, value in zip(startGap, change)) / length))   # Get the moment of the closest gap
+    return math.sqrt(sum((gap + closest * value) ** 2 for gap, value in zip(startGap, change)))        # Return the closest gap
+
+class CollisionGrid(object):
+    '''
+    Variables:
+    cells: The beings and their sweeps hashed by cell
+    '''
+
+    def __init__(self):
+        '''
+        Creates a new empty CollisionGrid.
+        @param self The current object
+        @return A new instance of the CollisionGrid
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.cells = {}             # No beings yet
+
+    def clear(self):
+        '''
+        Removes every being.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.cells.clear()          # Remove the beings
+
+    def add(self, being, start, end):
+        '''
+        Adds a being swept during an update.
+        @param self The current object
+        @param being The being.
+        @param start The placement of the being in the previous update.
+        @param end The placement of the being in this update.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.cells.setdefault(getCellKey(end), []).append((being, start, end))     # Hash the being by its cell
+
+    def query(self, start, end, radius = COLLISION_RADIUS):
+        '''
+        Returns the beings that got closer than a radius to a sweep.
+        @param self The current object
+        @param start The placement in the previous update.
+        @param end The placement in this update.
+        @param radius The collision radius in cells, with two steps it has to stay under a cell.
+        @return The list of beings.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        x, y = getCellKey(end)                                                              # Get the cell of the sweep
+        beings = []                                                                         # Declare the beings found
+        for cellX in (x - 1, x, x + 1):                                                     # Loop through the nearby lines
+            for cellY in (y - 1, y, y + 1):                                                 # Loop through the nearby cells
+                for being, otherStart, otherEnd in self.cells.get((cellX, cellY), ()):      # Loop through the beings of the cell
+                    if getClosestDistance(start, end, otherStart, otherEnd) < radius:       # Check if they got too close
+                        beings.append(being)                                                # Store the being
+        return beings                                                                       # Return the beings
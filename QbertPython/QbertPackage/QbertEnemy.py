@@ -7,6 +7,7 @@ This class represents A Qbert enemy.
 '''
 import random
 from QbertPackage import QbertBeing
+from QbertPackage import QbertGraph
 
 class QbertEnemy(QbertBeing.QbertBeingClass):
     '''
@@ -16,6 +17,7 @@ class QbertEnemy(QbertBeing.QbertBeingClass):
     timeToAct: The time to wait for the next act
     timer: The timer
     readyToMove: A variable if it is ready to move
+    timeToActRange: The shortest and longest time to make a movement in the current level
     '''
     lowestTimeToAct = 3     # The shortest time to make a movement
     highestTimeToAct = 8    # The longest time to make a movement
@@ -35,6 +37,30 @@ class QbertEnemy(QbertBeing.QbertBeingClass):
         self.timer = 0              # Set the timer to 0
         self.readyToMove = False    # Start by not being ready to move.
         self.position = None        # Set a null enemy position
+        self.timeToActRange = (QbertEnemy.lowestTimeToAct, QbertEnemy.highestTimeToAct)    # Use the default times to act
+        
+    def reset(self, timeToActRange):
+        '''
+        Returns the enemy to the state of a new enemy so it can be used in another level.
+        @param self The current object
+        @param timeToActRange The shortest and longest time to make a movement in the level.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.state = QbertBeing.State.IDDLE         # Set the state to IDDLE
+        self.isMoving = False                       # It starts not moving
+        self.landed = True                          # It starts on the ground
+        self.isFalling = False                      # It starts in the board
+        self.pleaseRespawn = False                  # It doesn't need to be respawned
+        self.resetValues()                          # It's not moving
+        self.stateTime = 0                          # Reset the state time
+        self.height = 0                             # Set the height as 0
+        self.timer = 0                              # Set the timer to 0
+        self.readyToMove = False                    # Start by not being ready to move
+        self.position = None                        # Set a null enemy position
+        self.timeToActRange = timeToActRange        # Set the times to act of the level
         
     def isReadyToMove(self):
         '''
@@ -69,6 +95,21 @@ class QbertEnemy(QbertBeing.QbertBeingClass):
             self.resetTimeToAct()           # Reset the time to act
             self.readyToMove = True         # The enemy is ready to move
             
+    def chooseDirection(self, graph, cell, playerCell):
+        '''
+        Chooses the direction of the next movement, the enemy wanders and may jump off the board.
+        @param self The current object
+        @param graph The pyramid graph.
+        @param cell The enemy's cell.
+        @param playerCell The player's cell.
+        @return The direction to move.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return random.randint(0, QbertGraph.QbertGraph.DIRECTIONS - 1)     # Return a random direction
+
     def canBeDrawn(self):
         '''
         Notifies if the enemy can be drawn.
@@ -105,4 +146,4 @@ class QbertEnemy(QbertBeing.QbertBeingClass):
         @since 13 nov. 2022
         '''
         self.timer = 0                                                                              # Set the timer to 0
-        self.timeToAct = random.randint(QbertEnemy.lowestTimeToAct, QbertEnemy.highestTimeToAct)    # Get the time to act as a random number
\ No newline at end of file
+        self.timeToAct = random.randint(self.timeToActRange[0], self.timeToActRange[1])             # Get the time to act as a random number
\ No newline at end of file
@@ -0,0 +1,80 @@
+'''
+This module holds the events the game publishes when its state changes and
+the bus that delivers them.
+
+The bus is synchronous: a handler runs in the thread that publishes, in the
+middle of the change, so it should only remember what happened and leave the
+reaction for the end of the tick. The level publishes its changes to the bus
+of the game that owns it, and keeps the values derived from its board up to
+date itself, so nothing has to scan the board or poll the score every tick.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+from enum import Enum
+
+class Event(Enum):              # All the events published
+    SCORE_CHANGED = 0           # The score changed, with the new score
+    LIVES_CHANGED = 1           # The player's lives changed, with the new lives
+    BLOCK_TOGGLED = 2           # A block was turned on or off, with its position and its value
+    LEVEL_COMPLETED = 3         # Every block of the level is on
+    STATE_CHANGED = 4           # The game state changed, with the previous and the new state
+
+class EventBus(object):
+    '''
+    Variables:
+    handlers: The handlers subscribed to every event, in the order they subscribed
+    '''
+
+    def __init__(self):
+        '''
+        Creates a new EventBus without handlers.
+        @param self The current object
+        @return A new instance of the EventBus
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.handlers = {event: [] for event in Event}          # No handlers yet
+
+    def subscribe(self, event, handler):
+        '''
+        Calls a handler every time an event is published.
+        @param self The current object
+        @param event The Event.
+        @param handler The function called with the values of the event.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.handlers[event].append(handler)                    # Add the handler
+
+    def unsubscribe(self, event, handler):
+        '''
+        Stops calling a handler.
+        @param self The current object
+        @param event The Event.
+        @param handler The function subscribed.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.handlers[event].remove(handler)                    # Remove the handler
+
+    def publish(self, event, *values):
+        '''
+        Calls every handler of an event.
+        @param self The current object
+        @param event The Event.
+        @param values The values of the event.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for handler in self.handlers[event]:                    # Loop through the handlers
+            handler(*values)                                    # Tell it
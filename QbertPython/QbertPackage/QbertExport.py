@@ -0,0 +1,200 @@
+'''
+This module renders a recorded or scripted session offscreen and exports the
+frames as a PNG sequence or as raw RGB frames for a video encoder.
+
+The session is played again through Qbert.draw with the SDL dummy video
+driver, as fast as the machine can go. The frames can be split by time range
+across several processes, every worker plays the session from the start
+without drawing until its range begins, because a session can only be
+reproduced from its first tick. Drawing a frame takes a few milliseconds, the
+PNG compression takes most of the time, so the PNG files are written with a
+fast compression level.
+
+Usage:
+python -m QbertPackage.QbertExport session.json --output frames --start 10 --end 40 --workers 4
+python -m QbertPackage.QbertExport session.json --format raw --resolution 1280x720 --output - | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i - clip.mp4
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import math
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")          # The raw frames may go to stdout
+import pygame
+from QbertPackage import Qbert
+from QbertPackage import QbertReplay
+from QbertPackage import QbertView
+from QbertPackage import QbertQuality
+from QbertPackage import GameThread
+
+FORMATS = ("png", "raw")                                            # The output formats
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"                              # The first bytes of a PNG file
+
+def createChunk(kind, data):
+    '''
+    Creates a PNG chunk.
+    @param kind The chunk type.
+    @param data The chunk data.
+    @return The chunk bytes with the length and the checksum.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))    # Wrap the data
+
+def savePng(surface, path, compression):
+    '''
+    Saves a surface as an RGB PNG file, pygame.image.save always compresses as much as it can.
+    @param surface The surface.
+    @param path The file path.
+    @param compression The zlib compression level, from 0 to 9.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    width, height = surface.get_size()                                              # Get the size
+    pixels = pygame.image.tobytes(surface, "RGB")                                   # Get the pixels
+    stride = width * 3                                                              # Get the bytes of a row
+    rows = b"".join(b"\x00" + pixels[row * stride:(row + 1) * stride] for row in range(height))     # Start every row without a filter
+    with open(path, "wb") as file:                                                  # Open the file
+        file.write(PNG_SIGNATURE + createChunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                   + createChunk(b"IDAT", zlib.compress(rows, compression)) + createChunk(b"IEND", b""))
+
+def renderRange(path, resolution, first, last, step, outputFormat, output, compression):
+    '''
+    Plays a session and writes a range of its frames, called in a worker process.
+    @param path The session file.
+    @param resolution The width and height of the frames.
+    @param first The first frame written.
+    @param last The frame after the last one written.
+    @param step The simulation ticks between frames.
+    @param outputFormat "png" or "raw".
+    @param output The directory of the PNG files or the raw file.
+    @param compression The zlib compression level of the PNG files.
+    @return The number of frames written.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    os.environ["SDL_VIDEODRIVER"] = "dummy"                                         # Draw offscreen
+    os.environ["SDL_AUDIODRIVER"] = "dummy"                                         # Play no sound
+    for name in ("BLOBERT_LEADERBOARD", "BLOBERT_MEMORY", "BLOBERT_PROFILE", "BLOBERT_RECORD", "BLOBERT_SPECTATE", "BLOBERT_TRACE"):    # Loop through the cabinet settings
+        os.environ.pop(name, None)                                                  # An export is not a cabinet
+    os.environ["BLOBERT_QUALITY"] = str(QbertQuality.FULL)                          # Every frame is drawn at full quality, however long it takes
+    recording = QbertReplay.loadRecording(path)                                     # Load the session
+    pygame.init()                                                                   # Initialize pygame
+    QbertView.setRenderSize(resolution)                                             # Set the frame size
+    QbertView.openDisplay(fullscreen = False)                                       # Open the offscreen display
+    scoreDirectory = tempfile.mkdtemp(prefix = "blobert")                           # The scores of the session are thrown away
+    game = Qbert.Qbert(scoreDirectory, recording)                                   # Create the game
+    gameThread = GameThread.GameThread(game)                                        # The thread is stepped here, it is never started
+    events = recording.getKeyEvents()                                               # Get the keys of every tick
+    rawFile = open(output, "wb") if outputFormat == "raw" else None                 # Open the raw file
+    written = 0                                                                     # No frames yet
+    try:
+        for tick in range(last * step):                                             # Loop through the ticks until the range ends
+            if not game.running:                                                    # Check if the session quit
+                break                                                               # Stop playing
+            gameThread.post(events.get(tick, ()))                                   # Press the keys of the tick
+            gameThread.step(1 / GameThread.GameThread.TICK_RATE)                    # Run the tick
+            if tick % step != 0 or tick // step < first:                            # Check if the tick is a frame of the range
+                continue                                                            # Only simulate it
+            game.draw(gameThread.snapshot)                                          # Draw the frame
+            surface = pygame.display.get_surface()                                  # Get the frame
+            if rawFile != None:                                                     # Check if the frames are raw
+                rawFile.write(pygame.image.tobytes(surface, "RGB"))                 # Write the pixels
+            else:
+                savePng(surface, os.path.join(output, "frame%06d.png" % (tick // step)), compression)    # Write the PNG
+            written = written + 1                                                   # Count the frame
+    finally:
+        if rawFile != None:                                                         # Check if a raw file was opened
+            rawFile.close()                                                         # Close it
+        game.scoreWriter.close()                                                    # Stop the score thread
+        pygame.quit()                                                               # Quit pygame
+        shutil.rmtree(scoreDirectory, ignore_errors = True)                         # Throw the scores away
+    return written                                                                  # Return the frames written
+
+def splitRange(first, last, parts):
+    '''
+    Splits a range of frames in contiguous ranges.
+    @param first The first frame.
+    @param last The frame after the last one.
+    @param parts The number of ranges.
+    @return The list of first and last frames of every range that is not empty.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    size = max(1, math.ceil((last - first) / max(parts, 1)))                       # Get the frames of every range
+    return [(start, min(start + size, last)) for start in range(first, last, size)] # Return the ranges
+
+def main(argv = None):
+    '''
+    Runs the exporter from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    tickRate = GameThread.GameThread.TICK_RATE                                                  # Get the simulation rate
+    parser = argparse.ArgumentParser(prog = "QbertExport", description = "Renders a recorded or scripted session offscreen.")
+    parser.add_argument("session", help = "The session recorded with BLOBERT_RECORD or written by hand")
+    parser.add_argument("--output", required = True, help = "The directory of the PNG files, or the raw file, - for stdout")
+    parser.add_argument("--format", choices = FORMATS, default = "png", help = "A PNG sequence or raw RGB frames")
+    parser.add_argument("--resolution", default = "%dx%d" % QbertView.DESIGN_SIZE, help = "The frame size as WIDTHxHEIGHT")
+    parser.add_argument("--fps", type = int, default = tickRate, help = "Frames per second, it has to divide %d" % tickRate)
+    parser.add_argument("--start", type = float, default = 0, help = "The second of the first frame")
+    parser.add_argument("--end", type = float, help = "The second after the last frame, the end of the session by default")
+    parser.add_argument("--compression", type = int, choices = range(10), default = 1, help = "The zlib level of the PNG files")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "Worker processes")
+    arguments = parser.parse_args(argv)                                                         # Parse the arguments
+    if arguments.fps <= 0 or tickRate % arguments.fps != 0:                                     # Check if every frame is a tick
+        parser.error("--fps has to divide %d" % tickRate)                                       # Stop
+    step = tickRate // arguments.fps                                                            # Get the ticks between frames
+    path = os.path.abspath(arguments.session)                                                   # Get the session path
+    recording = QbertReplay.loadRecording(path)                                                 # Load the session
+    totalFrames = math.ceil(recording.ticks / step)                                             # Get the frames of the session
+    first = int(arguments.start * arguments.fps)                                                # Get the first frame
+    last = totalFrames if arguments.end == None else min(int(arguments.end * arguments.fps), totalFrames)    # Get the frame after the last one
+    ranges = splitRange(first, last, arguments.workers)                                         # Split the frames among the workers
+    resolution = QbertView.parseRenderSize(arguments.resolution)                                # Get the frame size
+    if arguments.format == "png":                                                               # Check if the frames are PNG files
+        output = os.path.abspath(arguments.output)                                              # Get the output path
+        os.makedirs(output, exist_ok = True)                                                    # Create the directory
+        outputs = [output] * len(ranges)                                                        # Every worker writes in the directory
+    else:
+        partDirectory = tempfile.mkdtemp(prefix = "blobert")                                    # Every worker writes its own part
+        outputs = [os.path.join(partDirectory, "part%d.raw" % index) for index in range(len(ranges))]
+    start = time.perf_counter()                                                                 # Start the timer
+    with ProcessPoolExecutor(max_workers = max(1, len(ranges))) as executor:                    # Start the workers
+        futures = [executor.submit(renderRange, path, resolution, rangeFirst, rangeLast, step, arguments.format, rangeOutput, arguments.compression)
+                   for (rangeFirst, rangeLast), rangeOutput in zip(ranges, outputs)]
+        written = sum(future.result() for future in futures)                                    # Wait for the frames
+    if arguments.format == "raw":                                                               # Check if the parts have to be joined
+        stream = sys.stdout.buffer if arguments.output == "-" else open(arguments.output, "wb") # Open the output
+        for part in outputs:                                                                    # Loop through the parts in order
+            with open(part, "rb") as partFile:                                                  # Open the part
+                shutil.copyfileobj(partFile, stream)                                            # Append it
+        stream.flush()                                                                          # Flush the frames
+        if stream != sys.stdout.buffer:                                                         # Check if a file was opened
+            stream.close()                                                                      # Close it
+        shutil.rmtree(partDirectory, ignore_errors = True)                                      # Remove the parts
+    elapsed = time.perf_counter() - start                                                       # Stop the timer
+    print("%d frames in %.1f s (%.1fx real time)" % (written, elapsed, written / arguments.fps / max(elapsed, 1e-9)), file = sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+'''
+This class represents the pyramid as a graph of cells without any graphical state.
+
+Each board position (x, y) is mapped to a flat cell index so the simulation can
+store boards as bit masks and beings as plain integers.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+OFF_BOARD = -1          # The cell index used for positions outside the board
+
+class QbertGraph(object):
+    '''
+    Variables:
+    width: The number of lines in the board
+    size: The total number of cells
+    fullMask: The bit mask with every cell set
+    cellX: The x position of every cell
+    cellY: The y position of every cell
+    neighbours: The cell reached from every cell on every direction
+    distances: The number of jumps between every pair of cells
+    nextHops: The direction of the first jump of a shortest path between every pair of cells
+    '''
+    DIRECTIONS = 4          # The number of directions a being can jump to
+
+    def __init__(self, width):
+        '''
+        Creates a new QbertGraph for a pyramid with the given number of lines.
+        @param self The current object
+        @param width The number of lines of the board.
+        @return A new instance of the QbertGraph
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.width = width                                                  # Set the number of lines
+        self.cellX = []                                                     # Create the x position list
+        self.cellY = []                                                     # Create the y position list
+        self.indexes = {}                                                   # Create the position to cell dictionary
+        for boardCounter in range(width):                                   # Loop through the board
+            for lineCounter in range(width - boardCounter):                 # Loop through each line
+                self.indexes[(boardCounter, lineCounter)] = len(self.cellX) # Store the cell index of the position
+                self.cellX.append(boardCounter)                             # Store the x position
+                self.cellY.append(lineCounter)                              # Store the y position
+        self.size = len(self.cellX)                                         # Set the number of cells
+        self.fullMask = (1 << self.size) - 1                                # Set the mask with every cell set
+        self.neighbours = [None] * self.size                                # Create the neighbours table
+        for cell in range(self.size):                                       # Loop through the cells
+            x = self.cellX[cell]                                            # Get the x position
+            y = self.cellY[cell]                                            # Get the y position
+            self.neighbours[cell] = (self.getCell(x, y - 1),                # North West
+                                     self.getCell(x - 1, y),                # North East
+                                     self.getCell(x, y + 1),                # South East
+                                     self.getCell(x + 1, y))                # South West
+        self.distances = [self.breadthFirstSearch(cell) for cell in range(self.size)]   # Calculate the distances from every cell
+        self.nextHops = [self.findNextHops(cell) for cell in range(self.size)]          # Calculate the first jump from every cell
+
+    def breadthFirstSearch(self, start):
+        '''
+        Calculates the number of jumps from a cell to every cell.
+        @param self The current object
+        @param start The starting cell.
+        @return A list with the distance to every cell.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        distances = [None] * self.size                                      # Declare the distances
+        distances[start] = 0                                                # The start is at distance 0
+        frontier = [start]                                                  # Start the frontier with the start
+        while frontier:                                                     # Loop until there are no cells left
+            nextFrontier = []                                               # Declare the next frontier
+            for cell in frontier:                                           # Loop through the frontier
+                for neighbour in self.neighbours[cell]:                     # Loop through the neighbours
+                    if neighbour != OFF_BOARD and distances[neighbour] == None:     # Check if the neighbour was not reached
+                        distances[neighbour] = distances[cell] + 1          # Store the distance
+                        nextFrontier.append(neighbour)                      # Visit it next
+            frontier = nextFrontier                                         # Move to the next frontier
+        return distances                                                    # Return the distances
+
+    def findNextHops(self, start):
+        '''
+        Calculates the direction of the first jump towards every cell, so a chase is a single lookup.
+        @param self The current object
+        @param start The starting cell.
+        @return A bytearray with the direction towards every cell, the start has no direction.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        nextHops = bytearray(self.size)                                     # Declare the directions
+        for target in range(self.size):                                     # Loop through the targets
+            distance = self.distances[target][start]                        # Get the jumps to the target
+            for direction in range(QbertGraph.DIRECTIONS):                  # Loop through the directions
+                neighbour = self.neighbours[start][direction]               # Get the neighbour
+                if neighbour != OFF_BOARD and self.distances[target][neighbour] == distance - 1:    # Check if it is closer to the target
+                    nextHops[target] = direction                            # Jump towards it
+                    break                                                   # The first shortest path is enough
+        return nextHops                                                     # Return the directions
+
+    def getNextHop(self, cell, target):
+        '''
+        Returns the direction of the jump that gets closer to a cell.
+        @param self The current object
+        @param cell The starting cell.
+        @param target The cell to reach.
+        @return The direction, or None if the cells are the same or one of them is outside the board.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if cell == target or cell == OFF_BOARD or target == OFF_BOARD:     # Check if there is no path
+            return None                                                     # There is nowhere to go
+        return self.nextHops[cell][target]                                  # Look up the direction
+
+    def getCell(self, x, y):
+        '''
+        Converts a board position into a cell index.
+        @param self The current object
+        @param x The x position.
+        @param y The y position.
+        @return The cell index or OFF_BOARD if the position is outside the board.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.indexes.get((int(x), int(y)), OFF_BOARD)               # Return the cell or OFF_BOARD
+
+    def getNeighbour(self, cell, direction):
+        '''
+        Returns the cell reached when jumping from a cell towards a direction.
+        @param self The current object
+        @param cell The starting cell.
+        @param direction The direction of the jump, any value above SE is treated as SW.
+        @return The reached cell or OFF_BOARD.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.neighbours[cell][min(direction, QbertGraph.DIRECTIONS - 1)]     # Return the neighbour, the beings move SW on any unknown direction
+
+    def maskFromBoard(self, board):
+        '''
+        Converts a QbertBoard into a bit mask.
+        @param self The current object
+        @param board The QbertBoard.
+        @return The bit mask with the cells that are on.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        mask = 0                                                            # Declare the mask
+        for cell in range(self.size):                                       # Loop through the cells
+            if board.board[self.cellX[cell]][self.cellY[cell]]:             # Check if the cell is on
+                mask = mask | (1 << cell)                                   # Set the bit
+        return mask                                                         # Return the mask
+
+graphs = {}             # The graphs already built by width
+
+def getGraph(width = 6):
+    '''
+    Returns the shared graph for a board width, building it only once.
+    @param width The number of lines of the board.
+    @return The QbertGraph.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    if width not in graphs:                         # Check if the graph was not built yet
+        graphs[width] = QbertGraph(width)           # Build the graph
+    return graphs[width]                            # Return the graph
@@ -0,0 +1,416 @@
+'''
+This module hosts many headless games in one process for online play and
+remote bots.
+
+Every connection gets its own session: a QbertLevel whose beings have no
+textures, so no display is needed. The sessions are asyncio tasks on a single
+event loop, every one runs at the fixed tick rate of GameThread and yields to
+the others between its ticks. The CPU time of every tick is charged to its
+session, so a busy session can be found with the stats request.
+
+It speaks JSON lines over TCP like the leaderboard server. The host greets a
+new connection with {"ok": true, "session": 3, "tickRate": 60}, then a client
+sends {"op": "move", "direction": 2}, {"op": "state"}, {"op": "new"} or
+{"op": "stats"} and gets one JSON line back. The cells of the state are the
+QbertGraph cell indexes and the board is its bit mask. A session plays from
+level to level until the player dies, like the endless mode.
+
+Usage:
+python -m QbertPackage.QbertHost --port 7780 --max-sessions 64
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import asyncio
+import json
+import sys
+import time
+from QbertPackage import QbertLevel
+from QbertPackage import QbertPlayer
+from QbertPackage import QbertInput
+from QbertPackage import QbertGraph
+from QbertPackage import QbertEvents
+from QbertPackage import QbertProgression
+from QbertPackage import GameThread
+
+class HostSession(object):
+    '''
+    Variables:
+    number: The number of the session
+    startLevel: The level the games start at
+    level: The current level number
+    player: The player
+    currentLevel: The current QbertLevel
+    events: The EventBus the level publishes its changes to
+    progress: The GameProgress that gives the life bonus and tells when a level ends
+    inputBuffer: The moves sent while the player is jumping
+    time: The time simulated in the session
+    ticks: The number of ticks run
+    lateTicks: The number of ticks skipped because the host fell behind
+    cpuTime: The CPU time spent in the session's ticks
+    longestTick: The most CPU time a tick took
+    over: True when the player died
+    '''
+
+    def __init__(self, number, startLevel = 1):
+        '''
+        Creates a new HostSession and starts its first game.
+        @param self The current object
+        @param number The number of the session.
+        @param startLevel The level the games start at.
+        @return A new instance of the HostSession
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.number = number                                # Set the number
+        self.startLevel = startLevel                        # Set the start level
+        self.currentLevel = None                            # No level yet
+        self.events = QbertEvents.EventBus()                # Create the bus of the changes
+        self.progress = QbertProgression.GameProgress(self.events)     # Follow the levels published to the bus
+        self.inputBuffer = QbertInput.InputBuffer()         # Create the input buffer
+        self.time = 0                                       # No time simulated yet
+        self.ticks = 0                                      # No ticks yet
+        self.lateTicks = 0                                  # No ticks skipped yet
+        self.cpuTime = 0                                    # No CPU time yet
+        self.longestTick = 0                                # No ticks yet
+        self.newGame()                                      # Start the first game
+
+    def newGame(self):
+        '''
+        Starts a new game at the start level.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.level = self.startLevel                        # Set the initial level
+        self.progress.newGame()                             # Count the life bonus from 0
+        self.over = False                                   # The player is alive
+        self.player = QbertPlayer.QbertPlayer(None)         # Create a headless player
+        self.loadLevel(0)                                   # Load the first level
+
+    def loadLevel(self, score):
+        '''
+        Loads the current level number.
+        @param self The current object
+        @param score The score of the previous levels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        enemyPool = self.currentLevel.enemies if self.currentLevel != None else None    # Use the enemies of the last level again
+        self.currentLevel = QbertLevel.QbertLevel(self.level, self.player, score, None, enemyPool, self.events)     # Create a headless level
+        self.inputBuffer.clear()                                                        # Forget the moves of the previous level
+        self.progress.levelLoaded(self.player)                                          # Follow the new level
+
+    def step(self, tickTime):
+        '''
+        Runs a tick of the game, as GameplayScene.update.
+        @param self The current object
+        @param tickTime The time of a tick.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.time = self.time + tickTime                                            # Add the time simulated
+        self.ticks = self.ticks + 1                                                 # Count the tick
+        if self.over:                                                               # Check if the game ended
+            return                                                                  # Wait for a new game
+        self.progress.tick(self.currentLevel, self.inputBuffer, self.time, tickTime)   # Move the player and update the level
+        if self.progress.levelCompleted:                                            # Check if the level is completed
+            self.level = self.level + 1                                             # Go to the next level
+            self.loadLevel(self.currentLevel.getCurrentScore())                     # Load it without a screen in between
+        elif self.progress.playerDead:                                              # Check if the player died
+            self.over = True                                                        # End the game
+
+    def move(self, direction):
+        '''
+        Queues a move sent by the client.
+        @param self The current object
+        @param direction The direction of the move.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.inputBuffer.push(direction, self.time)                                 # Queue the move with the time it arrived
+
+    def getState(self):
+        '''
+        Returns the state of the game for the client.
+        @param self The current object
+        @return The state dictionary.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        level = self.currentLevel                                                   # Get the level
+        return {"tick": self.ticks, "level": self.level, "score": level.getCurrentScore(), "lives": self.player.getLives(), "over": self.over,
+                "board": level.getBoardMask(), "player": level.getLandingCell(level.graph, self.player),
+                "enemies": [level.getLandingCell(level.graph, enemy) for enemy in level.enemies]}
+
+    def getStats(self):
+        '''
+        Returns the CPU accounting of the session.
+        @param self The current object
+        @return The stats dictionary, the times in milliseconds.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return {"session": self.number, "ticks": self.ticks, "lateTicks": self.lateTicks, "cpu": round(self.cpuTime * 1000, 3),
+                "cpuPerTick": round(self.cpuTime * 1000 / max(self.ticks, 1), 4), "longestTick": round(self.longestTick * 1000, 3)}
+
+    async def run(self, tickRate):
+        '''
+        Runs the session at the tick rate, yielding to the other sessions between ticks.
+        @param self The current object
+        @param tickRate The ticks per second.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        loop = asyncio.get_running_loop()                                           # Get the event loop
+        tickTime = 1 / tickRate                                                     # Get the time of a tick
+        nextTick = loop.time()                                                      # The first tick is now
+        while True:                                                                 # Loop until cancelled
+            now = loop.time()                                                       # Get the time
+            if now - nextTick > tickTime * GameThread.GameThread.MAX_CATCH_UP:      # Check if the session fell too far behind
+                self.lateTicks = self.lateTicks + int((now - nextTick) / tickTime)  # Count the ticks lost
+                nextTick = now                                                      # Drop the lost time instead of running a burst
+            while nextTick <= now:                                                  # Run the ticks that are due
+                start = time.thread_time()                                          # Start the CPU clock, the sessions share the thread
+                self.step(tickTime)                                                 # Run a tick
+                spent = time.thread_time() - start                                  # Get the CPU time of the tick
+                self.cpuTime = self.cpuTime + spent                                 # Charge it to the session
+                self.longestTick = max(self.longestTick, spent)                     # Remember the longest tick
+                nextTick = nextTick + tickTime                                      # Schedule the next one
+            await asyncio.sleep(max(0, nextTick - loop.time()))                     # Let the other sessions run
+
+class QbertHost(object):
+    '''
+    Variables:
+    maxSessions: The most sessions hosted at once
+    startLevel: The level the games start at
+    tickRate: The ticks per second of every session
+    sessions: The sessions by number
+    writers: The stream writer of every session's client
+    tasks: The task that serves every session's client, it ends once the session stopped
+    nextNumber: The number of the next session
+    server: The asyncio server
+    '''
+
+    def __init__(self, maxSessions = 64, startLevel = 1, tickRate = GameThread.GameThread.TICK_RATE):
+        '''
+        Creates a new QbertHost.
+        @param self The current object
+        @param maxSessions The most sessions hosted at once.
+        @param startLevel The level the games start at.
+        @param tickRate The ticks per second of every session.
+        @return A new instance of the QbertHost
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.maxSessions = maxSessions              # Set the most sessions
+        self.startLevel = startLevel                # Set the start level
+        self.tickRate = tickRate                    # Set the tick rate
+        self.sessions = {}                          # No sessions yet
+        self.writers = {}                           # No clients yet
+        self.tasks = {}                             # No clients yet
+        self.nextNumber = 1                         # The first session is 1
+        self.server = None                          # The server is not started
+
+    async def start(self, host, port):
+        '''
+        Starts listening.
+        @param self The current object
+        @param host The host to listen on.
+        @param port The port to listen on.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.server = await asyncio.start_server(self.handleClient, host, port)    # Start the server
+
+    async def close(self):
+        '''
+        Stops the server and every session.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.server.close()                         # Stop accepting clients
+        for writer in list(self.writers.values()):  # Loop through the clients
+            writer.close()                          # Hang up, their sessions end when the reads return
+        await asyncio.gather(*self.tasks.values(), return_exceptions = True)   # Wait for every session to end
+        await self.server.wait_closed()             # Wait for the server to stop
+
+    async def handleClient(self, reader, writer):
+        '''
+        Runs a session for a client and answers its requests until it disconnects.
+        @param self The current object
+        @param reader The stream reader.
+        @param writer The stream writer.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if len(self.sessions) >= self.maxSessions:                                  # Check if the host is full
+            writer.write(json.dumps({"ok": False, "error": "host full"}).encode() + b"\n")    # Refuse the client
+            await writer.drain()                                                    # Send the answer
+            writer.close()                                                          # Close the connection
+            return
+        session = HostSession(self.nextNumber, self.startLevel)                     # Create the session
+        self.nextNumber = self.nextNumber + 1                                       # Number the next one
+        self.sessions[session.number] = session                                     # Host it
+        self.writers[session.number] = writer                                       # Remember the client
+        self.tasks[session.number] = asyncio.current_task()                         # Let close wait for the client
+        task = asyncio.get_running_loop().create_task(self.runSession(session))     # Start its ticks
+        try:
+            writer.write(json.dumps({"ok": True, "session": session.number, "tickRate": self.tickRate}).encode() + b"\n")   # Greet the client
+            while True:                                                             # Loop through the requests
+                line = await reader.readline()                                      # Read a request
+                if not line:                                                        # Check if the client disconnected
+                    break                                                           # Stop the session
+                try:
+                    response = self.answer(session, json.loads(line))               # Answer the request
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"ok": False, "error": str(error)}                   # Report the bad request
+                writer.write(json.dumps(response).encode() + b"\n")                 # Send the response
+                await writer.drain()                                                # Wait if the client reads slowly
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass                                                                    # The client went away or sent a line too long
+        finally:
+            task.cancel()                                                           # Stop the ticks
+            await asyncio.gather(task, return_exceptions = True)                    # Wait for them to stop
+            del self.sessions[session.number]                                       # Forget the session
+            del self.writers[session.number]                                        # Forget the client
+            del self.tasks[session.number]                                          # Forget the task
+            writer.close()                                                          # Close the connection
+
+    async def runSession(self, session):
+        '''
+        Runs a session until it is cancelled, reporting the errors so one session can't stop the host.
+        @param self The current object
+        @param session The HostSession.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        try:
+            await session.run(self.tickRate)                                        # Run the ticks
+        except asyncio.CancelledError:
+            raise                                                                   # The client left
+        except Exception as error:
+            print("Host: session %d stopped: %r" % (session.number, error), file = sys.stderr)     # Report the error
+
+    def answer(self, session, request):
+        '''
+        Answers a request of a session's client.
+        @param self The current object
+        @param session The HostSession.
+        @param request The request dictionary.
+        @return The response dictionary.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        operation = request["op"]                                                   # Get the operation
+        if operation == "move":                                                     # Handle a move
+            direction = int(request["direction"])                                   # Get the direction
+            if direction < 0 or direction >= QbertGraph.QbertGraph.DIRECTIONS:      # Check if the direction exists
+                raise ValueError("direction must be 0 to %d" % (QbertGraph.QbertGraph.DIRECTIONS - 1))
+            session.move(direction)                                                 # Queue the move
+            return {"ok": True}                                                     # Acknowledge it
+        elif operation == "state":                                                  # Handle a state request
+            return dict(session.getState(), ok = True)                              # Return the state
+        elif operation == "new":                                                    # Handle a new game request
+            session.newGame()                                                       # Start again
+            return {"ok": True}                                                     # Acknowledge it
+        elif operation == "stats":                                                  # Handle a stats request
+            return {"ok": True, "sessions": [other.getStats() for other in self.sessions.values()]}   # Return the CPU of every session
+        return {"ok": False, "error": "unknown operation"}                           # The operation doesn't exist
+
+    def getReport(self):
+        '''
+        Returns the load of the host.
+        @param self The current object
+        @return The report text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not self.sessions:                                                       # Check if there are sessions
+            return "Host: no sessions"                                              # There is nothing to report
+        stats = [session.getStats() for session in self.sessions.values()]         # Get the stats of every session
+        busiest = max(stats, key = lambda entry: entry["cpuPerTick"])               # Get the busiest session
+        load = sum(entry["cpuPerTick"] for entry in stats) * self.tickRate / 1000   # Get the share of a core used
+        return "Host: %d sessions, %.0f%% of a core, busiest session %d at %.3f ms per tick, %d late ticks" % (
+            len(stats), load * 100, busiest["session"], busiest["cpuPerTick"], sum(entry["lateTicks"] for entry in stats))
+
+async def serve(host, port, maxSessions, startLevel, reportInterval):
+    '''
+    Runs a QbertHost until it is interrupted.
+    @param host The host to listen on.
+    @param port The port to listen on.
+    @param maxSessions The most sessions hosted at once.
+    @param startLevel The level the games start at.
+    @param reportInterval The seconds between load reports, 0 for none.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    qbertHost = QbertHost(maxSessions, startLevel)                  # Create the host
+    await qbertHost.start(host, port)                               # Start it
+    print("Host listening on %s:%d" % (host, port))                 # Let the operator know
+    try:
+        while True:                                                 # Serve forever
+            await asyncio.sleep(reportInterval or 3600)             # Wait for the next report
+            if reportInterval:                                      # Check if the load is reported
+                print(qbertHost.getReport())                        # Report the load
+    finally:
+        await qbertHost.close()                                     # Stop the server
+
+def main(argv = None):
+    '''
+    Runs the host from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    parser = argparse.ArgumentParser(prog = "QbertHost", description = "Hosts many headless games in one process.")
+    parser.add_argument("--host", default = "127.0.0.1", help = "The host to listen on")
+    parser.add_argument("--port", type = int, default = 7780, help = "The port to listen on")
+    parser.add_argument("--max-sessions", type = int, default = 64, help = "The most sessions hosted at once")
+    parser.add_argument("--level", type = int, default = 1, help = "The level the games start at")
+    parser.add_argument("--report", type = float, default = 10, help = "Seconds between load reports, 0 for none")
+    arguments = parser.parse_args(argv)                             # Parse the arguments
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.max_sessions, arguments.level, arguments.report))   # Run the host
+    except KeyboardInterrupt:
+        pass                                                        # Stopped by the operator
+
+if __name__ == "__main__":
+    main()
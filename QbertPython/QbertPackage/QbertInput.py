@@ -0,0 +1,119 @@
+'''
+This class represents a buffer of the moves pressed while the player is still jumping.
+
+Every move is stored with the time it was pressed and is applied when the
+current jump lands, unless it is too old. The age of a move only counts the
+time the player could have used it, from the press or from the moment the
+player could jump again, whichever is later, so a move pressed early in a
+jump is never dropped on landing. The time from the key press to the move
+being applied is kept to report the input latency.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+from collections import deque
+
+class InputBuffer(object):
+    '''
+    Variables:
+    MAX_AGE: The oldest a move can be when it is applied
+    MAX_SAMPLES: The number of latency samples kept
+    moves: The moves waiting with the time they were pressed
+    latencies: The last latency samples
+    dropped: The number of moves that were too old
+    readySince: The time the player could jump again, None while it is jumping
+    '''
+    MAX_AGE = 0.5           # The longest a move can wait once the player can jump
+    MAX_SAMPLES = 512       # The number of latency samples kept
+
+    def __init__(self, size = 2):
+        '''
+        Creates a new InputBuffer.
+        @param self The current object
+        @param size The number of moves that can wait.
+        @return A new instance of the InputBuffer
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.moves = deque(maxlen = size)                               # Create the move queue, the oldest is dropped when full
+        self.latencies = deque(maxlen = InputBuffer.MAX_SAMPLES)        # Create the latency samples
+        self.dropped = 0                                                # No moves dropped yet
+        self.readySince = None                                          # The player can't jump until the buffer is asked
+
+    def push(self, direction, timestamp):
+        '''
+        Adds a move to the buffer.
+        @param self The current object
+        @param direction The direction of the move.
+        @param timestamp The time the key was pressed.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.moves.append((direction, timestamp))       # Queue the move
+
+    def wait(self):
+        '''
+        Tells the buffer the player is jumping, the moves don't age until it can jump again.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.readySince = None                                      # The player can't use the moves yet
+
+    def pop(self, now):
+        '''
+        Takes the oldest move that is not too old and records its latency, called while the player can jump.
+        @param self The current object
+        @param now The current time.
+        @return The direction, or None if there is no move.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.readySince == None:                                 # Check if the player just became able to jump
+            self.readySince = now                                   # The moves start aging now
+        while self.moves:                                           # Loop through the moves
+            direction, timestamp = self.moves.popleft()             # Take the oldest move
+            if now - max(timestamp, self.readySince) <= InputBuffer.MAX_AGE:    # Check if it waited little enough once the player could jump
+                self.latencies.append(now - timestamp)              # Record the latency
+                return direction                                    # Return the move
+            self.dropped = self.dropped + 1                         # Count the old move
+        return None                                                 # There is no move
+
+    def clear(self):
+        '''
+        Removes the moves waiting.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.moves.clear()          # Forget the moves
+        self.readySince = None      # Start aging the next moves when the buffer is asked
+
+    def getLatencyReport(self):
+        '''
+        Returns the input to action latency of the last moves.
+        @param self The current object
+        @return A text with the average, 95th percentile and maximum latency in milliseconds.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not self.latencies:                                      # Check if there are samples
+            return "Input latency: no moves"                        # There is nothing to report
+        samples = sorted(self.latencies)                            # Sort the samples
+        average = sum(samples) / len(samples)                       # Calculate the average
+        percentile = samples[min(len(samples) - 1, int(len(samples) * 0.95))]      # Get the 95th percentile
+        return "Input latency: avg %.1f ms, p95 %.1f ms, max %.1f ms over %d moves, %d dropped" % (
+            average * 1000, percentile * 1000, samples[-1] * 1000, len(samples), self.dropped)
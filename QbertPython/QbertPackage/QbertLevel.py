@@ -8,11 +8,16 @@ This class represents A Qbert level that manages all the gameplay.
 from QbertPackage import QbertPlayer
 from QbertPackage import QbertBoard
 from QbertPackage import QbertEnemy
+from QbertPackage import QbertChaser
 from QbertPackage import BoardBlock
+from QbertPackage import QbertGraph
+from QbertPackage import QbertSimulation
+from QbertPackage import QbertProgression
+from QbertPackage import QbertCollision
+from QbertPackage import QbertTrace
+from QbertPackage import QbertEvents
 import random
 import pygame.math as Math
-import math
-from pip._vendor.pyparsing.util import line
 class QbertLevel(object):
     '''
     Variables:
@@ -21,19 +26,30 @@ class QbertLevel(object):
     initialXG: The graphical initial x position
     initialYG: The graphical initial y position
     clearBoard: The game board
-    enemyBoard: The enemy board
+    enemyBoard: The board the enemies move on
     player: The player
     enemies: The enemy list
+    graph: The pyramid graph the chasers find their way in
+    collisionGrid: The spatial hash of the enemies
+    lastPlacements: The placement of the player and every enemy in the previous update
     blocks: The graphical version of the blocks
+    sharedBlocks: The graphical blocks shared by every level
     level: The level number
     currentScore: The current score
+    blockScore: The score given by a block in this level
+    togglesBlocks: True if the blocks turn off when they are jumped on again
+    events: The EventBus the changes of the level are published to
+    blocksLeft: The blocks that are still off
+    blockValues: The value of every block flattened, None until it is asked after a block changed
+    boardMask: The bit mask of the blocks that are on, None until it is asked after a block changed
     '''
     initialX = 850          # The graphical initial x position
     initialY = 340          # The graphical initial y position
     initialXG = 900         # The graphical initial x position
     initialYG = 280         # The graphical initial y position
+    sharedBlocks = None     # The blocks are created by the first level
 
-    def __init__(self, level, player, score, enemyTexture):
+    def __init__(self, level, player, score, enemyTexture, enemyPool = None, events = None):
         '''
         Creates a new QbertLevel given a player and the previous score.
         @param self The current object
@@ -42,6 +58,8 @@ class QbertLevel(object):
         @param score The previous score.
         @param screen The screen
         @param enemyTexture The enemies' texture
+        @param enemyPool The enemies of the previous level, they are used again.
+        @param events The EventBus of the game, None to publish to nobody.
         @return A new instance of the QbertLevel
         
         @author: Dario Urdapilleta
@@ -53,15 +71,37 @@ class QbertLevel(object):
         self.clearBoard = QbertBoard.QbertBoard()                          # Create the game board
         self.enemyBoard = QbertBoard.QbertBoard()                          # Create the enemy board
         self.player = player                                    # Set the player
-        self.blocks = [None] * self.clearBoard.getSize()        # Create the block array
-        self.enemies = [None] * ((int)(level / 3) + 1)          # Create the enemy array
-        position = 0                                            # Declare the initial position and set it to 0
-        for boardCounter in range(self.clearBoard.size(0)):  # Loop through the board
-            for lineCounter in range(self.clearBoard.size(boardCounter)):       # Loop through each line
-                self.blocks[position] = BoardBlock.BoardBlock(self.getBlockLocation(boardCounter, lineCounter))        # Create a new block in the next posit
-                position = position + 1                         # Increase the position
-        for enemyCounter in range(len(self.enemies)):           # Loop through the enemy array
-            self.enemies[enemyCounter] = QbertEnemy.QbertEnemy(enemyTexture)           # Create a new enemy
+        self.events = events if events != None else QbertEvents.EventBus()  # Publish the changes to the game, or to nobody
+        self.blocksLeft = self.clearBoard.getSize()             # Every block starts off
+        self.blockValues = None                                 # The block values are flattened when asked
+        self.boardMask = None                                   # The board mask is made when asked
+        progression = QbertProgression.getTable()               # Get the level rules
+        self.blockScore = progression.getBlockScore(level)      # Look up the block score
+        self.togglesBlocks = progression.togglesBlocks(level)   # Look up the block logic
+        if QbertLevel.sharedBlocks == None:                     # Check if the blocks were not created yet
+            blocks = [None] * self.clearBoard.getSize()         # Create the block array
+            position = 0                                        # Declare the initial position and set it to 0
+            for boardCounter in range(self.clearBoard.size(0)):  # Loop through the board
+                for lineCounter in range(self.clearBoard.size(boardCounter)):       # Loop through each line
+                    blocks[position] = BoardBlock.BoardBlock(self.getBlockLocation(boardCounter, lineCounter))        # Create a new block in the next posit
+                    position = position + 1                     # Increase the position
+            QbertLevel.sharedBlocks = blocks                    # Every level has the same blocks
+        self.blocks = QbertLevel.sharedBlocks                   # Use the shared blocks
+        self.graph = QbertGraph.getGraph(self.clearBoard.getWidth())    # Get the pyramid graph
+        timeToActRange = progression.getTimeToAct(level)        # Look up the times to act
+        chaserCount = progression.getChaserCount(level)         # Look up the chasers
+        self.enemies = []                                       # Declare the enemy list
+        for enemyClass, count in ((QbertEnemy.QbertEnemy, progression.getEnemyCount(level) - chaserCount), (QbertChaser.QbertChaser, chaserCount)):
+            enemies = [enemy for enemy in (enemyPool or []) if type(enemy) == enemyClass][:count]  # Use the enemies of the previous level
+            for enemy in enemies:                               # Loop through the enemies used again
+                enemy.reset(timeToActRange)                     # Make it a new enemy
+            for enemyCounter in range(len(enemies), count):     # Loop through the enemies missing
+                enemy = enemyClass(enemyTexture)                # Create a new enemy
+                enemy.timeToActRange = timeToActRange           # Set the times to act of the level
+                enemies.append(enemy)                           # Add it
+            self.enemies.extend(enemies)                        # Add the enemies of the class
+        self.collisionGrid = QbertCollision.CollisionGrid()     # Create the spatial hash
+        self.lastPlacements = [None] * (len(self.enemies) + 1)  # No placements yet
         self.player.respawn()                                   # Respawn the player
         
     def getCurrentScore(self):
@@ -86,7 +126,7 @@ class QbertLevel(object):
         @version 1.0
         @since 12 nov. 2022
         '''
-        return self.clearBoard.isCompleted()        # Return true if the game board is completed
+        return self.blocksLeft == 0                 # Return true if every block is on
     
     def movePlayer(self, direction):
         '''
@@ -103,7 +143,7 @@ class QbertLevel(object):
             
     def moveEnemy(self, enemy):
         '''
-        Moves the enemy to a random direction.
+        Moves the enemy to the direction it chooses.
         @param self The current object
         @param enemy The enemy to move.
         
@@ -111,9 +151,9 @@ class QbertLevel(object):
         @version 1.0
         @since 12 nov. 2022
         '''
-        direction = random.randint(0,4)     # Calculate a random direction
         if not enemy.isMoving:            # Make sure the enemy is not moving
-            enemy.move(direction)           # Move the enemy to the random direction
+            direction = enemy.chooseDirection(self.graph, self.getLandingCell(self.graph, enemy), self.getLandingCell(self.graph, self.player))     # Choose a direction
+            enemy.move(direction)           # Move the enemy to the direction
             
     def getBlockLocation(self, boardCounter, lineCounter):
         '''
@@ -130,22 +170,6 @@ class QbertLevel(object):
         location = Math.Vector2(QbertLevel.initialX + (85 * lineCounter) - (85 * boardCounter), QbertLevel.initialY + (110 * lineCounter) + (110 * boardCounter))   # Create the vector witht he graphical values
         return location     # Return the vector
     
-    def drawBlocks(self, screen):
-        '''
-        Draws all the blocks
-        @param self The current object
-        @param graphicDevice The graphic device
-        
-        @author: Dario Urdapilleta
-        @version 1.0
-        @since 12 nov. 2022
-        '''
-        position = 0                                            # Declare the iteration for the board array
-        for boardCounter in range(self.clearBoard.size(0)):  # Loop through the board
-            for lineCounter in range(self.clearBoard.size(boardCounter)):       # Loop through each line
-                self.blocks[position].draw(screen, self.clearBoard.getValue(Math.Vector2(boardCounter, lineCounter)))       # Draw the block with the value of the corresponding cell
-                position = position + 1                         # Increase the position
-        
     def playersLives(self):
         '''
         Returns the player's lives
@@ -167,10 +191,12 @@ class QbertLevel(object):
         @version 1.0
         @since 12 nov. 2022
         '''
-        self.updateBoards()                 # Update the boards
-        self.updateEnemies(gameTime)        # Update the enemies
-        self.updatePlayer(gameTime)         # Update the player
-        self.checkCollisions()              # Calculate the collisions
+        with QbertTrace.span("updateEnemies", "simulation"):        # Time the enemies
+            self.updateEnemies(gameTime)                            # Update the enemies
+        with QbertTrace.span("updatePlayer", "simulation"):         # Time the player
+            self.updatePlayer(gameTime)                             # Update the player
+        with QbertTrace.span("checkCollisions", "simulation"):      # Time the collisions
+            self.checkCollisions()                                  # Calculate the collisions
         
     def updatePlayer(self, gameTime):
         '''
@@ -186,33 +212,77 @@ class QbertLevel(object):
             self.player.respawn()                                                                       # Respawn the player
         if self.player.landed and self.player.isMoving:                                                 # Check if the player landed and is moving
             if self.clearBoard.isInsideBoard(self.player.getPosition()):                                # Check if the player is inside the board
-                if self.level % 2 == 1:                                                                 # Switch between logics, the block will turn off in even levels
+                if not self.togglesBlocks:                                                              # Switch between logics, the block will turn off in even levels
                     if not self.clearBoard.getValue(self.player.getPosition()):                         # Check if the block is off
-                        self.clearBoard.setValue(self.player.getPosition(), True)                       # Turn it on
-                        self.currentScore += 20 * (int)(math.floor((self.level / 10) + 1))              # Add score
+                        self.setBlock(self.player.getPosition(), True)                                  # Turn it on
+                        self.addScore(self.blockScore)                                                  # Add score
                 else:
-                    self.clearBoard.setValue(self.player.getPosition(), not self.clearBoard.getValue(self.player.getPosition()))     # Switch the block state
-                    self.currentScore += 20 * (int)(math.floor((self.level / 10) + 1))                  # Add score
+                    self.setBlock(self.player.getPosition(), not self.clearBoard.getValue(self.player.getPosition()))     # Switch the block state
+                    self.addScore(self.blockScore)                                                      # Add score
                 self.player.land()                                                                      # Land the player
             else:
                 self.player.dropOff()                                                                   # Make the player fall if it is outside the board
-                self.player.loseLives()                                                                 # Make the player lose a life
-                
-                
-    def updateBoards(self):
+                self.loseLife()                                                                         # Make the player lose a life
+
+    def setBlock(self, position, value):
         '''
-        Updates the boards.
+        Turns a block on or off and publishes the change.
         @param self The current object
-        
+        @param position A Vector2 with the block position.
+        @param value True to turn it on.
+
         @author: Dario Urdapilleta
         @version 1.0
-        @since 12 nov. 2022
+        @since 19 oct. 2026
+        '''
+        if self.clearBoard.getValue(position) == value:                                                 # Check if the block doesn't change
+            return                                                                                      # Nothing to publish
+        self.clearBoard.setValue(position, value)                                                       # Set the block
+        self.blocksLeft = self.blocksLeft - 1 if value else self.blocksLeft + 1                         # Count the blocks that are still off
+        self.blockValues = None                                                                         # Flatten the values again when asked
+        self.boardMask = None                                                                           # Make the mask again when asked
+        self.events.publish(QbertEvents.Event.BLOCK_TOGGLED, position, value)                           # Tell the game
+        if self.blocksLeft == 0:                                                                        # Check if it was the last block
+            self.events.publish(QbertEvents.Event.LEVEL_COMPLETED)                                      # Tell the game
+
+    def addScore(self, points):
         '''
-        self.enemyBoard.clear()                                                             # Clear the enemy board
-        for enemyCounter in range(len(self.enemies)):                                       # Loop through the enemies
-            if self.enemies[enemyCounter].isStanding():                                    # Check if the enemy is standing
-                self.enemyBoard.setValue(self.enemies[enemyCounter].getPosition(), True)    # Set the board true in the enemy's position
-        
+        Adds points to the score and publishes the new score.
+        @param self The current object
+        @param points The points added.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.currentScore = self.currentScore + points                                                  # Add the points
+        self.events.publish(QbertEvents.Event.SCORE_CHANGED, self.currentScore)                         # Tell the game
+
+    def loseLife(self):
+        '''
+        Makes the player lose a life and publishes the lives left.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.player.loseLives()                                                                         # Take the life
+        self.events.publish(QbertEvents.Event.LIVES_CHANGED, self.player.getLives())                    # Tell the game
+
+    def oneUp(self):
+        '''
+        Gives the player a life and publishes the lives.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.player.oneUp()                                                                             # Give the life
+        self.events.publish(QbertEvents.Event.LIVES_CHANGED, self.player.getLives())                    # Tell the game
+                
+                
     def updateEnemies(self, gameTime):
         '''
         Updates the enemies.
@@ -236,56 +306,98 @@ class QbertLevel(object):
                 else:
                     self.enemies[enemyCounter].dropOff()                                        # Make the enemu fall
     
+    def sweep(self, key, being):
+        '''
+        Returns where a being was in the previous update and where it is now.
+        @param self The current object
+        @param key 0 for the player, the enemy index plus 1 for an enemy.
+        @param being The being.
+        @return The start and end placements, or None and None if the being can't collide.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        end = None                                                                      # Declare the current placement
+        if not being.isFalling and not being.needsRespawn():                            # Check if the being is on the board
+            end = being.getPlacement()                                                  # Get the current placement
+        start = self.lastPlacements[key]                                                # Get the previous placement
+        self.lastPlacements[key] = end                                                  # Remember it for the next update
+        if start == None or end == None or QbertCollision.getDistance(start, end) > QbertCollision.MAX_STEP:     # Check if the being appeared or respawned
+            start = end                                                                 # It didn't sweep anything
+        return start, end                                                               # Return the sweep
+
     def checkCollisions(self):
         '''
-        Checks the collisions.
+        Checks the collisions, including the beings that cross each other in the middle of a jump.
         @param self The current object
         
         @author: Dario Urdapilleta
         @version 1.0
         @since 12 nov. 2022
         '''
-        if not self.player.isMoving and self.enemyBoard.getValue(self.player.getPosition()):                          # Check the player is not moving and the board is occupied 
-            self.player.hit()                                                                                           # Hit the player
-            self.player.loseLives()                                                                                     # Make the player lose lives
-            for enemyCounter in range(len(self.enemies)):                                                               # Loop through the enemies
-                if self.enemies[enemyCounter].getPosition().x == 0 and self.enemies[enemyCounter].getPosition().y == 0: # Check if the enemy is at the player's position
-                    self.enemies[enemyCounter].hit()                                                                    # Hit the enemy
+        self.collisionGrid.clear()                                                      # Clear the spatial hash
+        for enemyCounter in range(len(self.enemies)):                                   # Loop through the enemies
+            start, end = self.sweep(enemyCounter + 1, self.enemies[enemyCounter])       # Get the enemy's sweep
+            if end != None:                                                             # Check if the enemy can collide
+                self.collisionGrid.add(self.enemies[enemyCounter], start, end)          # Hash the enemy
+        start, end = self.sweep(0, self.player)                                         # Get the player's sweep
+        if end == None:                                                                 # Check if the player can't collide
+            return                                                                      # Nothing to check
+        enemies = self.collisionGrid.query(start, end)                                  # Find the enemies the player touched
+        if enemies:                                                                     # Check if the player was touched
+            self.player.hit()                                                           # Hit the player
+            self.loseLife()                                                             # Make the player lose lives
+            top = (0, 0, 0)                                                             # Get the cell where the player respawns
+            for enemy in enemies + self.collisionGrid.query(top, top):                  # Loop through the enemies touched and the ones at the top
+                enemy.hit()                                                             # Hit the enemy
         
-    def drawPlayer(self, screen, before):
+    def getSprites(self):
         '''
-        Draws the player.
+        Returns the frames of the player and the enemies.
         @param self The current object
-        @param screen The screen.
-        @param before A variable that tells if the method was called before the block rendering.
-        
+        @return A list with a key that identifies the being, True if it is falling behind the blocks, the frame surface and its position in design pixels.
+
         @author: Dario Urdapilleta
         @version 1.0
-        @since 12 nov. 2022
+        @since 19 oct. 2026
+        '''
+        sprites = [(0, self.player.isFalling) + self.player.getSprite(self.getGraphicPosition(self.player))]   # Add the player
+        for enemyCounter in range(len(self.enemies)):                                                           # Loop through the enemies
+            enemy = self.enemies[enemyCounter]                                                                  # Get the enemy
+            if enemy.canBeDrawn():                                                                              # Check if the enemy can be drawn
+                sprites.append((enemyCounter + 1, enemy.isFalling) + enemy.getSprite(self.getGraphicPosition(enemy)))     # Add the enemy
+        return sprites                                                                                          # Return the sprites
+
+    def getBlockValues(self):
         '''
-        if before and self.player.isFalling:                                  # If drawn before and the player is falling
-            self.player.draw(screen, self.getGraphicPosition(self.player))      # Draw the player
-        elif not before and not self.player.isFalling:                        # If after and the player is not falling
-            self.player.draw(screen, self.getGraphicPosition(self.player))      # Draw the player
-            
-    def drawEnemies(self, screen, before):
+        Returns the value of every block in the order of the blocks list.
+        The same tuple is returned until a block changes, so the renderer can tell nothing changed by its identity.
+        @param self The current object
+        @return A tuple with True for every block that is on.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
         '''
-        Draws the enemies.
+        if self.blockValues == None:                                                    # Check if a block changed since the last time
+            self.blockValues = tuple(value for line in self.clearBoard.board for value in line)    # Flatten the board
+        return self.blockValues                                                         # Return the values
+
+    def getBoardMask(self):
+        '''
+        Returns the bit mask of the blocks that are on, as QbertGraph.maskFromBoard.
         @param self The current object
-        @param screen The screen.
-        @param before A variable that tells if the method was called before the block rendering.
-        
+        @return The mask, made again only after a block changed.
+
         @author: Dario Urdapilleta
         @version 1.0
-        @since 12 nov. 2022
+        @since 19 oct. 2026
         '''
-        for enemyCounter in range(len(self.enemies)):                                                               # Loop through the enemies
-            if self.enemies[enemyCounter].canBeDrawn():                                                             #  Check if the enemy can be drawn
-                if before and self.enemies[enemyCounter].isFalling:                                               # If drawn before and the player is falling
-                    self.enemies[enemyCounter].draw(screen, self.getGraphicPosition(self.enemies[enemyCounter]))    # Draw the player
-                elif not before and not self.enemies[enemyCounter].isFalling:                                     # If after and the player is not falling
-                    self.enemies[enemyCounter].draw(screen, self.getGraphicPosition(self.enemies[enemyCounter]))    # Draw the player
-                    
+        if self.boardMask == None:                                                      # Check if a block changed since the last time
+            self.boardMask = self.graph.maskFromBoard(self.clearBoard)                  # Make the mask
+        return self.boardMask                                                           # Return the mask
+
     def getGraphicPosition(self, being):
         '''
         Converts a board position into graphical position.
@@ -314,3 +426,58 @@ class QbertLevel(object):
         x = random.randint(0,self.enemyBoard.getWidth() - 1)            # Get a random x position
         y = random.randint(0,self.clearBoard.getWidth() - x - 1)        # Get a random y position
         return Math.Vector2(x, y)                                   # Create the vector and return it.
+
+    def getSimulationState(self, rules, seed):
+        '''
+        Copies the level into a SimulationState that can be cloned and stepped cheaply.
+        @param self The current object
+        @param rules The SimulationRules.
+        @param seed The random seed of the simulation.
+        @return The SimulationState of this level.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        state = QbertSimulation.SimulationState.__new__(QbertSimulation.SimulationState)   # Create an empty state
+        state.rules = rules                                                     # Set the rules
+        state.graph = self.graph                                                # Get the pyramid graph
+        state.level = self.level                                                # Set the level
+        state.score = self.currentScore                                         # Set the score
+        state.lives = self.player.getLives()                                    # Set the lives
+        state.bonusMark = 0                                                     # The bonus is handled by the game
+        state.seed = (seed & QbertSimulation.MASK64) or 1                       # Set the random seed, it can't be 0
+        state.time = 0                                                          # Reset the time
+        state.board = self.getBoardMask()                                       # Copy the board
+        state.player = self.getLandingCell(state.graph, self.player)            # Copy the player's cell
+        enemies = []                                                            # Declare the enemy list
+        for enemyCounter in range(len(self.enemies)):                           # Loop through the enemies
+            enemy = self.enemies[enemyCounter]                                  # Get the enemy
+            timeToAct = getattr(enemy, "timeToAct", rules.highestTimeToAct) - enemy.timer   # Get the time left to act
+            if enemy.isReadyToMove():                                           # Check if it is waiting to move
+                timeToAct = 0                                                   # It moves as soon as possible
+            enemies.append((self.getLandingCell(state.graph, enemy), max(timeToAct, 0), isinstance(enemy, QbertChaser.QbertChaser)))     # Copy the enemy
+        state.enemies = tuple(enemies)                                          # Store the enemies
+        return state                                                            # Return the state
+
+    def getLandingCell(self, graph, being):
+        '''
+        Returns the cell where a being is standing or is going to land.
+        @param self The current object
+        @param graph The pyramid graph.
+        @param being The being.
+        @return The cell index or OFF_BOARD.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        position = being.getPosition()                                          # Get the being's position
+        if position == None or being.isFalling:                                 # Check if the being is out of the board
+            return QbertGraph.OFF_BOARD                                         # It has no cell
+        x = position.x                                                          # Get the x position
+        y = position.y                                                          # Get the y position
+        if being.isMoving and not being.landed:                                 # Check if the being is in the air
+            x = x + (being.movementSlice.x > 0) - (being.movementSlice.x < 0)   # Add the jump on x
+            y = y + (being.movementSlice.y > 0) - (being.movementSlice.y < 0)   # Add the jump on y
+        return graph.getCell(x, y)                                              # Return the cell
@@ -0,0 +1,209 @@
+'''
+This class represents the memory diagnostics used to find allocation churn and leaks.
+
+It is enabled with the BLOBERT_MEMORY environment variable, set to the seconds
+between reports, and it is meant to stay on while the game runs for hours.
+tracemalloc traces every allocation of the process. After every frame drawn,
+the highest the traced memory got above the previous frame is recorded for the
+game state shown, and the peak is reset. Every time the game state changes, a
+snapshot is compared with the one taken when the state was entered, so the
+lines that kept memory while in a state are added up for that state. The gc
+callbacks time every collection, and every level loaded is compared with the
+previous one after a full collection, so memory that survives the levels shows
+as growth. The pixels of the surfaces are allocated by SDL and are not traced,
+only the Python objects that hold them.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import collections
+import gc
+import sys
+import time
+import tracemalloc
+
+class MemoryMonitor(object):
+    '''
+    Variables:
+    TOP_SITES: The number of allocation sites reported
+    KB: The bytes in a kilobyte
+    interval: The seconds between reports
+    lastReport: The time of the last report
+    lastCurrent: The traced memory after the last frame
+    frames: The number of frames, the total and the highest allocated per frame of every game state
+    sites: The memory kept by every allocation site of every game state
+    state: The game state shown
+    stateSnapshot: The snapshot taken when the game state was entered
+    collections: The number of collections, the total and the longest pause of every generation
+    collectStart: The time the running collection started
+    collecting: True while the monitor forces a collection
+    levels: The level number, the traced memory, the growth and the top growing sites of every level loaded
+    levelSnapshot: The snapshot taken when the last level was loaded
+    '''
+    TOP_SITES = 5           # The number of allocation sites reported
+    KB = 1024               # The bytes in a kilobyte
+
+    def __init__(self, interval):
+        '''
+        Creates a new MemoryMonitor and starts tracing the allocations.
+        @param self The current object
+        @param interval The seconds between reports, 0 to report only when the game quits.
+        @return A new instance of the MemoryMonitor
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.interval = interval                                    # Set the report interval
+        self.lastReport = time.perf_counter()                       # No report yet
+        self.frames = {}                                            # No frames yet
+        self.sites = {}                                             # No sites yet
+        self.state = None                                           # No game state yet
+        self.stateSnapshot = None                                   # No snapshot yet
+        self.collections = {}                                       # No collections yet
+        self.collectStart = None                                    # No collection running
+        self.collecting = False                                     # No collection forced
+        self.levels = []                                            # No levels yet
+        self.levelSnapshot = None                                   # No level snapshot yet
+        tracemalloc.start()                                         # Start tracing the allocations
+        self.lastCurrent = tracemalloc.get_traced_memory()[0]       # Get the memory traced
+        gc.callbacks.append(self.onCollect)                         # Time the collections
+
+    def stop(self):
+        '''
+        Stops tracing the allocations and timing the collections.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.onCollect in gc.callbacks:                          # Check if the collections are timed
+            gc.callbacks.remove(self.onCollect)                     # Stop timing them
+        tracemalloc.stop()                                          # Stop tracing
+
+    def onCollect(self, phase, info):
+        '''
+        Times a collection, called by gc at the start and at the end of every collection.
+        @param self The current object
+        @param phase "start" or "stop".
+        @param info The generation collected and the objects collected.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if phase == "start":                                                # Check if the collection starts
+            self.collectStart = time.perf_counter()                         # Remember the time
+        elif self.collectStart != None and not self.collecting:             # Check if the pause was the game's
+            pause = time.perf_counter() - self.collectStart                 # Get the pause
+            count, total, longest, collected = self.collections.get(info["generation"], (0, 0, 0, 0))   # Get the generation's collections
+            self.collections[info["generation"]] = (count + 1, total + pause, max(longest, pause), collected + info["collected"])   # Add the pause
+
+    def takeSnapshot(self):
+        '''
+        Takes a snapshot of the traced memory without the diagnostics' own allocations.
+        @param self The current object
+        @return The tracemalloc snapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),     # Ignore tracemalloc
+                                                          tracemalloc.Filter(False, __file__),                  # Ignore the monitor
+                                                          tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                                                          tracemalloc.Filter(False, "<unknown>")))
+
+    def frame(self, gameState):
+        '''
+        Records the memory allocated while a frame was drawn, called in the main thread after every frame.
+        @param self The current object
+        @param gameState The game state drawn.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        current, peak = tracemalloc.get_traced_memory()                                 # Get the memory traced
+        tracemalloc.reset_peak()                                                        # Measure the next frame alone
+        allocated = max(0, peak - self.lastCurrent)                                     # Get the highest the frame went
+        self.lastCurrent = current                                                      # Remember the memory for the next frame
+        count, total, highest = self.frames.get(gameState, (0, 0, 0))                   # Get the game state's frames
+        self.frames[gameState] = (count + 1, total + allocated, max(highest, allocated))    # Add the frame
+        if gameState != self.state:                                                     # Check if the game state changed
+            self.changeState(gameState)                                                 # Add up the sites of the last state
+        now = time.perf_counter()                                                       # Get the time
+        if self.interval > 0 and now - self.lastReport >= self.interval:                # Check if a report is due
+            self.lastReport = now                                                       # Remember the report
+            print(self.getReport(), file = sys.stderr)                                  # Report the memory, stdout may carry frames
+
+    def changeState(self, gameState):
+        '''
+        Adds up the memory kept while the last game state was shown.
+        @param self The current object
+        @param gameState The new game state.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        snapshot = self.takeSnapshot()                                                  # Take a snapshot
+        if self.stateSnapshot != None:                                                  # Check if there is a state to compare
+            sites = self.sites.setdefault(self.state, collections.Counter())            # Get the state's sites
+            for stat in snapshot.compare_to(self.stateSnapshot, "lineno"):              # Loop through the lines that changed
+                sites[str(stat.traceback[0])] += stat.size_diff                         # Add the memory they kept
+        self.state = gameState                                                          # Set the game state
+        self.stateSnapshot = snapshot                                                   # Compare with this snapshot next time
+        self.lastCurrent = tracemalloc.get_traced_memory()[0]                           # The snapshot doesn't count as a frame
+        tracemalloc.reset_peak()                                                        # Forget the snapshot's peak
+
+    def levelLoaded(self, level):
+        '''
+        Records the memory kept after a level is loaded, called in the simulation thread.
+        @param self The current object
+        @param level The level number.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.collecting = True                                                          # The forced collection is not a game pause
+        gc.collect()                                                                    # Free everything the previous level left
+        self.collecting = False                                                         # Time the next collections
+        snapshot = self.takeSnapshot()                                                  # Take a snapshot
+        current = sum(stat.size for stat in snapshot.statistics("filename"))            # Get the memory kept
+        growth = 0                                                                      # No growth for the first level
+        top = []                                                                        # No sites for the first level
+        if self.levelSnapshot != None:                                                  # Check if there is a level to compare
+            growth = current - self.levels[-1][1]                                       # Get the growth since the last level
+            top = [stat for stat in snapshot.compare_to(self.levelSnapshot, "lineno") if stat.size_diff > 0][:MemoryMonitor.TOP_SITES]  # Get the lines that grew
+        self.levels.append((level, current, growth, top))                               # Remember the level
+        self.levelSnapshot = snapshot                                                   # Compare with this snapshot next time
+        print("Memory: level %d loaded, %.1f KB kept (%+.1f KB)" % (level, current / MemoryMonitor.KB, growth / MemoryMonitor.KB), file = sys.stderr)
+
+    def getReport(self):
+        '''
+        Returns the allocations per frame, the top sites of every game state, the pauses and the growth across levels.
+        @param self The current object
+        @return The report text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        kb = MemoryMonitor.KB                                                           # Get the bytes in a kilobyte
+        lines = ["Memory: %.1f KB traced" % (tracemalloc.get_traced_memory()[0] / kb)]  # Start with the memory traced
+        for gameState, (count, total, highest) in self.frames.items():                  # Loop through the game states
+            lines.append("  %s: %d frames, avg %.1f KB, max %.1f KB allocated per frame" % (gameState.name, count, total / count / kb, highest / kb))
+            top = [site for site in self.sites.get(gameState, collections.Counter()).most_common(MemoryMonitor.TOP_SITES) if site[1] > 0]   # Get the sites that kept the most
+            for site, size in top:                                                      # Loop through the sites
+                lines.append("    %+.1f KB %s" % (size / kb, site))                     # Add the site
+        for generation, (count, total, longest, collected) in sorted(self.collections.items()):    # Loop through the generations
+            lines.append("  gc gen %d: %d pauses, avg %.2f ms, max %.2f ms, %d objects collected" % (generation, count, total / count * 1000, longest * 1000, collected))
+        for level, current, growth, top in self.levels[1:]:                             # Loop through the levels after the first
+            lines.append("  level %d: %.1f KB kept (%+.1f KB)" % (level, current / kb, growth / kb))
+            for stat in top:                                                            # Loop through the sites that grew
+                lines.append("    %+.1f KB %s" % (stat.size_diff / kb, stat.traceback[0]))
+        return "\n".join(lines)                                                         # Return the report
@@ -0,0 +1,247 @@
+'''
+This class represents the deep profiling captures taken while the game runs.
+
+It is enabled with the BLOBERT_PROFILE environment variable, set to the number
+of frames of a capture. Pressing F10, or sending SIGUSR1 to the process,
+starts a capture, and doing it again stops it before the frames run out, so a
+slow level can be profiled after hours of play without restarting the game.
+
+cProfile only profiles the thread that enables it, so the renderer and the
+simulation thread get a profiler each. The renderer counts the frames and the
+simulation thread follows it. When a single profiler already sees every thread
+the simulation thread doesn't start its own. Every capture is dumped as a
+pstats file per thread, named after the game state, the level and the number
+of enemies when it started, in the directory set by BLOBERT_PROFILE_DIR. When
+BLOBERT_PROFILE_STACKS is set, a collapsed stack file for flame graph tools is
+written next to it. cProfile keeps the callers of every function and not the
+whole stacks, so the stacks are estimated by splitting the time of every
+function among its callers.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import cProfile
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import pygame
+
+HOTKEY = pygame.K_F10           # The key that starts and stops a capture
+MAX_DEPTH = 64                  # The deepest stack written
+MIN_MICROSECONDS = 1            # The shortest time of a stack written
+
+class ProfileCapture(object):
+    '''
+    Variables:
+    HOTKEY: The key that starts and stops a capture
+    frames: The number of frames of a capture
+    directory: The directory of the files
+    stacks: True to write the collapsed stacks
+    requested: True when a capture has to start or stop
+    capturing: True while a capture runs
+    framesLeft: The frames left in the capture
+    tag: The name of the files of the capture
+    renderThread: The thread that draws the frames
+    renderProfiler: The profiler of the renderer
+    simulationProfiler: The profiler of the simulation thread
+    simulationTag: The name of the files of the simulation thread
+    '''
+    HOTKEY = HOTKEY             # The key that starts and stops a capture, for the game that doesn't import the module
+
+    def __init__(self, frames, directory = "profiles", stacks = False):
+        '''
+        Creates a new ProfileCapture that waits for the hotkey or the signal.
+        @param self The current object
+        @param frames The number of frames of a capture.
+        @param directory The directory of the files.
+        @param stacks True to write the collapsed stacks.
+        @return A new instance of the ProfileCapture
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.frames = frames                        # Set the frames of a capture
+        self.directory = directory                  # Set the directory
+        self.stacks = stacks                        # Set if the stacks are written
+        self.requested = False                      # No capture requested
+        self.capturing = False                      # No capture running
+        self.framesLeft = 0                         # No frames left
+        self.tag = None                             # No capture yet
+        self.renderThread = None                    # No frames drawn yet
+        self.renderProfiler = None                  # The renderer is not profiled
+        self.simulationProfiler = None              # The simulation is not profiled
+        self.simulationTag = None                   # No simulation capture yet
+
+    def listen(self, signalNumber = getattr(signal, "SIGUSR1", None)):
+        '''
+        Starts and stops the captures when the process gets a signal, called in the main thread.
+        @param self The current object
+        @param signalNumber The signal, SIGUSR1 by default.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if signalNumber != None:                                                        # Check if the platform has the signal
+            signal.signal(signalNumber, lambda number, frame: self.toggle())            # Toggle the capture on the signal
+
+    def toggle(self):
+        '''
+        Asks for a capture to start, or to stop if one is running.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.requested = True                       # The renderer handles it on the next frame
+
+    def frame(self, game, snapshot):
+        '''
+        Starts, counts and stops the captures, called in the main thread after every frame.
+        @param self The current object
+        @param game The game.
+        @param snapshot The QbertSnapshot drawn.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.renderThread = threading.current_thread()                                  # Remember the thread that draws
+        if self.requested:                                                              # Check if a capture was requested
+            self.requested = False                                                      # Handle the request
+            if self.capturing:                                                          # Check if a capture is running
+                self.capturing = False                                                  # Stop it
+            else:
+                level = game.currentLevel                                               # Get the current level
+                enemies = len(level.enemies) if level != None else 0                    # Count the enemies
+                self.tag = "%s-%s-level%d-enemies%d" % (time.strftime("%Y%m%d-%H%M%S"), snapshot.gameState.name, snapshot.level, enemies)   # Name the capture
+                self.framesLeft = self.frames                                           # Count the frames
+                self.capturing = True                                                   # Start the capture
+                self.renderProfiler = cProfile.Profile()                                # Create the renderer's profiler
+                self.renderProfiler.enable()                                            # Profile the next frames
+                print("Profile: capturing %d frames as %s" % (self.frames, self.tag), file = sys.stderr)
+                return                                                                  # The first frame starts now
+        if self.capturing:                                                              # Check if a capture is running
+            self.framesLeft = self.framesLeft - 1                                       # Count the frame
+            if self.framesLeft <= 0:                                                    # Check if the frames ran out
+                self.capturing = False                                                  # Stop the capture
+        if not self.capturing and self.renderProfiler != None:                          # Check if the renderer's capture ended
+            self.renderProfiler.disable()                                               # Stop profiling
+            self.dump(self.renderProfiler, self.tag + "-render")                        # Write the files
+            self.renderProfiler = None                                                  # Forget the profiler
+
+    def tick(self):
+        '''
+        Follows the captures of the renderer, called in the simulation thread after every tick.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.simulationProfiler != None and (not self.capturing or self.simulationTag != self.tag):  # Check if the capture it followed ended
+            self.simulationProfiler.disable()                                           # Stop profiling
+            self.dump(self.simulationProfiler, self.simulationTag + "-simulation")      # Write the files
+            self.simulationProfiler = None                                              # Forget the profiler
+        if self.capturing and self.simulationTag != self.tag and self.renderThread != threading.current_thread():  # Check if the simulation has to be profiled apart
+            self.simulationTag = self.tag                                               # Follow the capture once
+            profiler = cProfile.Profile()                                               # Create the simulation's profiler
+            try:
+                profiler.enable()                                                       # Profile the next ticks
+            except ValueError:                                                          # The renderer's profiler already sees every thread
+                return                                                                  # Don't profile twice
+            self.simulationProfiler = profiler                                          # Remember the profiler
+
+    def stop(self):
+        '''
+        Stops a running capture and writes what it has, called in the main thread when the game quits.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.capturing = False                                                          # Stop the capture
+        if self.renderProfiler != None:                                                 # Check if the renderer was profiled
+            self.renderProfiler.disable()                                               # Stop profiling
+            self.dump(self.renderProfiler, self.tag + "-render")                        # Write the files
+            self.renderProfiler = None                                                  # Forget the profiler
+        if self.simulationProfiler != None:                                             # Check if the stopped simulation thread was profiled
+            self.dump(self.simulationProfiler, self.simulationTag + "-simulation")      # Write the files
+            self.simulationProfiler = None                                              # Forget the profiler
+
+    def dump(self, profiler, name):
+        '''
+        Writes the pstats file of a capture and its collapsed stacks.
+        @param self The current object
+        @param profiler The cProfile profiler.
+        @param name The name of the files.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        os.makedirs(self.directory, exist_ok = True)                                    # Create the directory
+        path = os.path.join(self.directory, name + ".prof")                             # Get the pstats path
+        profiler.dump_stats(path)                                                       # Write the stats
+        if self.stacks:                                                                 # Check if the stacks are written
+            writeCollapsedStacks(pstats.Stats(path), os.path.join(self.directory, name + ".collapsed"))
+        print("Profile: wrote %s" % path, file = sys.stderr)
+
+def getFrameName(function):
+    '''
+    Returns the name of a function in a collapsed stack.
+    @param function The pstats file, line and name of the function.
+    @return The name without the characters the stack format uses.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    fileName, line, name = function                                                     # Split the function
+    if fileName == "~":                                                                 # Check if it is a built-in function
+        return name.replace(";", ":").replace(" ", "_")                                 # Use its name
+    return ("%s:%d:%s" % (os.path.basename(fileName), line, name)).replace(";", ":").replace(" ", "_")   # Add the file and the line
+
+def writeCollapsedStacks(stats, path):
+    '''
+    Writes the collapsed stacks estimated from the callers of every function, one "a;b;c microseconds" line per stack.
+    @param stats The pstats.Stats.
+    @param path The file path.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    callees = {}                                                                        # Declare the functions called by every function
+    for function, (calls, primitive, internal, cumulative, callers) in stats.stats.items():    # Loop through the functions
+        for caller, edge in callers.items():                                            # Loop through its callers
+            callees.setdefault(caller, []).append((function, edge[3]))                  # Store the time it took when called by the caller
+    lines = {}                                                                          # Declare the time of every stack
+    pending = [((function,), values[3]) for function, values in stats.stats.items() if not values[4]]     # Start with the functions without callers
+    while pending:                                                                      # Loop until every stack was walked
+        stack, share = pending.pop()                                                    # Get the stack and its time
+        if share * 1000000 < MIN_MICROSECONDS:                                          # Check if the stack took too little to be written
+            continue                                                                    # Don't walk it
+        function = stack[-1]                                                            # Get the function on top
+        internal, cumulative = stats.stats[function][2], stats.stats[function][3]       # Get its times
+        if cumulative <= 0:                                                             # Check if it took no time
+            continue                                                                    # Skip it
+        key = ";".join(getFrameName(frame) for frame in stack)                          # Name the stack
+        lines[key] = lines.get(key, 0) + share * internal / cumulative                  # Add the time spent in the function itself
+        if len(stack) >= MAX_DEPTH:                                                     # Check if the stack is too deep
+            continue                                                                    # Stop walking it
+        for callee, edgeTime in callees.get(function, ()):                              # Loop through the functions it called
+            if callee not in stack:                                                     # Recursion is folded into the first call
+                pending.append((stack + (callee,), share * edgeTime / cumulative))      # Walk the callee with its part of the time
+    with open(path, "w") as file:                                                       # Open the file
+        for key, seconds in sorted(lines.items()):                                      # Loop through the stacks
+            microseconds = int(seconds * 1000000)                                       # Flame graph tools count integers
+            if microseconds >= MIN_MICROSECONDS:                                        # Check if the stack took some time
+                file.write("%s %d\n" % (key, microseconds))                             # Write the stack
@@ -0,0 +1,314 @@
+'''
+This class represents the progression of the level rules.
+
+The rules of every level are precomputed into compact arrays: the number of
+enemies and how many of them chase the player, the score of a block, whether the blocks toggle and the range of the
+time the enemies wait to act. Looking up a level is an index into the arrays,
+so a game can start at any level without computing anything. The arrays grow
+by doubling when a higher level is asked for, so endless games never run out.
+
+The enemies wait the same range on every level for now, the curve is kept in
+the table so it can be tuned in one place.
+
+The GameProgress follows a game from tick to tick the same way for the game,
+its scenes and the headless host: it remembers what the level published, gives
+the life bonus once the level is updated and tells when the level ends.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import math
+from array import array
+from QbertPackage import QbertEvents
+
+LIFE_BONUS = 1000       # The amount of score needed to gain a new life
+
+class ProgressionTable(object):
+    '''
+    Variables:
+    INITIAL_SIZE: The levels computed when the table is created
+    enemyDivisor: The levels needed to add one more enemy
+    chaserDivisor: The levels needed to turn one more enemy into a chaser
+    scoreBase: The score given by a block
+    scoreStep: The levels needed to increase the block score
+    lowestTimeToAct: The shortest time for an enemy to make a movement
+    highestTimeToAct: The longest time for an enemy to make a movement
+    enemyCounts: The number of enemies of every level
+    chaserCounts: The number of enemies that chase the player in every level
+    blockScores: The score of a block of every level
+    toggles: 1 for every level where the blocks toggle
+    lowestTimes: The shortest time to act of every level
+    highestTimes: The longest time to act of every level
+    '''
+    INITIAL_SIZE = 1024         # The levels computed when the table is created
+
+    def __init__(self, enemyDivisor = 3, scoreBase = 20, scoreStep = 10, lowestTimeToAct = 3, highestTimeToAct = 8, chaserDivisor = 4):
+        '''
+        Creates a new ProgressionTable, the defaults are the game's rules.
+        @param self The current object
+        @param enemyDivisor The levels needed to add one more enemy.
+        @param scoreBase The score given by a block.
+        @param scoreStep The levels needed to increase the block score.
+        @param lowestTimeToAct The shortest time for an enemy to make a movement.
+        @param highestTimeToAct The longest time for an enemy to make a movement.
+        @param chaserDivisor The levels needed to turn one more enemy into a chaser.
+        @return A new instance of the ProgressionTable
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.enemyDivisor = enemyDivisor                    # Set the enemy divisor
+        self.scoreBase = scoreBase                          # Set the block score
+        self.scoreStep = scoreStep                          # Set the score step
+        self.lowestTimeToAct = lowestTimeToAct              # Set the shortest time to act
+        self.highestTimeToAct = highestTimeToAct            # Set the longest time to act
+        self.chaserDivisor = chaserDivisor                  # Set the chaser divisor
+        self.enemyCounts = array("I")                       # No levels yet
+        self.chaserCounts = array("I")                      # No levels yet
+        self.blockScores = array("Q")                       # No levels yet
+        self.toggles = bytearray()                          # No levels yet
+        self.lowestTimes = array("I")                       # No levels yet, the times are whole seconds
+        self.highestTimes = array("I")                      # No levels yet
+        self.extend(ProgressionTable.INITIAL_SIZE)          # Compute the first levels
+
+    def extend(self, size):
+        '''
+        Computes the levels up to a size.
+        @param self The current object
+        @param size The number of levels the table has to hold, level 0 included.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for level in range(len(self.enemyCounts), size):                                        # Loop through the missing levels
+            self.enemyCounts.append(int(level / self.enemyDivisor) + 1)                         # One enemy plus one every divisor levels
+            self.chaserCounts.append(min(int(level / self.chaserDivisor), self.enemyCounts[level]))     # One chaser every divisor levels
+            self.blockScores.append(self.scoreBase * int(math.floor((level / self.scoreStep) + 1)))    # The score increases every step levels
+            self.toggles.append(level % 2 == 0)                                                 # The blocks turn off again in even levels
+            self.lowestTimes.append(self.lowestTimeToAct)                                       # The shortest wait is the same on every level
+            self.highestTimes.append(self.highestTimeToAct)                                     # The longest wait is the same on every level
+
+    def ensure(self, level):
+        '''
+        Makes sure a level is in the table, doubling it if it is not.
+        @param self The current object
+        @param level The level number.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if level >= len(self.enemyCounts):                                  # Check if the level was not computed
+            self.extend(max(level + 1, len(self.enemyCounts) * 2))          # Double the table
+
+    def getEnemyCount(self, level):
+        '''
+        Returns the number of enemies of a level.
+        @param self The current object
+        @param level The level number.
+        @return The number of enemies.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.ensure(level)                          # Compute the level if needed
+        return self.enemyCounts[level]              # Return the enemies
+
+    def getChaserCount(self, level):
+        '''
+        Returns the number of enemies of a level that chase the player.
+        @param self The current object
+        @param level The level number.
+        @return The number of chasers, included in the number of enemies.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.ensure(level)                          # Compute the level if needed
+        return self.chaserCounts[level]             # Return the chasers
+
+    def getBlockScore(self, level):
+        '''
+        Returns the score given by a block in a level.
+        @param self The current object
+        @param level The level number.
+        @return The block score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.ensure(level)                          # Compute the level if needed
+        return self.blockScores[level]              # Return the score
+
+    def togglesBlocks(self, level):
+        '''
+        Returns if the blocks of a level turn off when they are jumped on again.
+        @param self The current object
+        @param level The level number.
+        @return True if the blocks toggle.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.ensure(level)                          # Compute the level if needed
+        return self.toggles[level] == 1             # Return the rule
+
+    def getTimeToAct(self, level):
+        '''
+        Returns the range of the time the enemies of a level wait to act.
+        @param self The current object
+        @param level The level number.
+        @return The shortest and the longest time.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.ensure(level)                                              # Compute the level if needed
+        return self.lowestTimes[level], self.highestTimes[level]        # Return the range
+
+tables = {}             # The tables already built by their rules
+
+def getTable(enemyDivisor = 3, scoreBase = 20, scoreStep = 10, lowestTimeToAct = 3, highestTimeToAct = 8, chaserDivisor = 4):
+    '''
+    Returns the shared table for a set of rules, building it only once.
+    @param enemyDivisor The levels needed to add one more enemy.
+    @param scoreBase The score given by a block.
+    @param scoreStep The levels needed to increase the block score.
+    @param lowestTimeToAct The shortest time for an enemy to make a movement.
+    @param highestTimeToAct The longest time for an enemy to make a movement.
+    @param chaserDivisor The levels needed to turn one more enemy into a chaser.
+    @return The ProgressionTable.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    key = (enemyDivisor, scoreBase, scoreStep, lowestTimeToAct, highestTimeToAct, chaserDivisor)  # Get the rules
+    if key not in tables:                                                               # Check if the table was not built yet
+        tables[key] = ProgressionTable(*key)                                            # Build the table
+    return tables[key]                                                                  # Return the table
+
+class GameProgress(object):
+    '''
+    Variables:
+    bonusMark: The score of the last life bonus
+    bonusPending: True if the score went above the life bonus, the life is given at the end of the tick
+    levelCompleted: True once the current level published it was completed
+    playerDead: True if the last lives published were the last ones
+    '''
+
+    def __init__(self, events):
+        '''
+        Creates a new GameProgress that listens to the changes of the levels.
+        @param self The current object
+        @param events The EventBus the levels publish to.
+        @return A new instance of the GameProgress
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        events.subscribe(QbertEvents.Event.SCORE_CHANGED, self.onScoreChanged)        # Notice the life bonus when the score changes
+        events.subscribe(QbertEvents.Event.LIVES_CHANGED, self.onLivesChanged)        # Notice the player died when the lives change
+        events.subscribe(QbertEvents.Event.LEVEL_COMPLETED, self.onLevelCompleted)    # Notice the last block
+        self.newGame()                                                                # No game yet
+
+    def newGame(self):
+        '''
+        Starts counting the life bonus of a new game.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.bonusMark = 0                  # No bonus yet
+        self.bonusPending = False           # No score yet
+        self.levelCompleted = False         # No level yet
+        self.playerDead = False             # No player yet
+
+    def levelLoaded(self, player):
+        '''
+        Starts following a new level.
+        @param self The current object
+        @param player The player.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.bonusPending = False           # The bonus of the last tick was given
+        self.levelCompleted = False         # The new level has every block off
+        self.playerDead = player.isDead()   # The level starts with the lives the player has
+
+    def onScoreChanged(self, score):
+        '''
+        Remembers the score went above the life bonus, the life is given at the end of the tick.
+        @param self The current object
+        @param score The new score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if score - self.bonusMark > LIFE_BONUS:         # If the score has gone above the life bonus
+            self.bonusMark = score                      # Update the next life bonus
+            self.bonusPending = True                    # Give the life once the level is updated
+
+    def onLivesChanged(self, lives):
+        '''
+        Remembers if the player died, the game ends at the end of the tick.
+        @param self The current object
+        @param lives The player's lives.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.playerDead = lives <= 0                    # Check if it was the last life
+
+    def onLevelCompleted(self):
+        '''
+        Remembers the level was completed, the next one is loaded at the end of the tick.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.levelCompleted = True                      # The level ends with this tick
+
+    def tick(self, level, inputBuffer, now, gameTime, autopilot = None):
+        '''
+        Moves the player, updates the level and gives the life bonus, the flags tell if the level ended.
+        @param self The current object
+        @param level The current QbertLevel.
+        @param inputBuffer The InputBuffer of the moves sent.
+        @param now The time the moves are aged with.
+        @param gameTime The time since the last update.
+        @param autopilot The function that chooses a direction when no move was sent, None to wait for one.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not level.player.isMoving:                           # Check if the player can jump
+            direction = inputBuffer.pop(now)                    # Take the next move sent
+            if direction == None and autopilot != None:         # Check if the autopilot can move the player
+                direction = autopilot(level)                    # Choose the best direction
+            if direction != None:                               # Check if there is a move
+                level.movePlayer(direction)                     # Move the player
+        else:
+            inputBuffer.wait()                                  # The moves wait for the jump to land
+        level.update(gameTime)                                  # Update the level
+        if self.bonusPending:                                   # Check if the score went above the life bonus
+            self.bonusPending = False                           # Give it once
+            level.oneUp()                                       # Add one life to the player
@@ -0,0 +1,157 @@
+'''
+This module holds the quality the game is drawn at and the governor that
+adapts it to the hardware of the cabinet.
+
+Every cabinet runs the same build on different hardware, so the governor
+watches the time the main thread spends drawing every frame. When the slowest
+frames go over the budget it steps the quality down, and when they have had
+plenty of headroom for a while it steps it back up. The steps go from the
+least visible to the most visible:
+1. the translucent shades behind the texts are not blended
+2. the beings show every other frame of their animations
+3. the blocks are drawn with a single face for both sides
+4. the frame is drawn at two thirds of the render resolution
+5. the frame is drawn at half the render resolution
+
+A step down that comes soon after a step up doubles the time the governor
+waits before stepping up again, so a cabinet that sits on the edge of the
+budget settles instead of going up and down.
+
+It is set with the BLOBERT_QUALITY environment variable: "auto", the default,
+lets the governor choose, and a level number fixes the quality. The budget is
+set by BLOBERT_QUALITY_BUDGET in milliseconds.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+
+FULL = 0                                # Everything is drawn
+NO_OVERLAYS = 1                         # The translucent shades are not blended
+FEWER_FRAMES = 2                        # The animations show every other frame
+SIMPLE_BLOCKS = 3                       # The sides of the blocks are a single face
+LOW_RESOLUTION = 4                      # The frame is drawn at two thirds of the resolution
+LOWEST_RESOLUTION = 5                   # The frame is drawn at half the resolution
+LEVEL_NAMES = ("full", "no overlays", "fewer frames", "simple blocks", "low resolution", "lowest resolution")    # The name of every level
+RESOLUTION_SCALES = (1, 1, 1, 1, 2 / 3, 1 / 2)      # The part of the render resolution drawn at every level
+
+level = FULL                            # The current quality level
+
+def blendsOverlays():
+    '''
+    Returns if the translucent shades are blended.
+    @return True at full quality.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return level < NO_OVERLAYS                          # Blend them until the first step
+
+def getFrameStep():
+    '''
+    Returns the frames of an animation shown, one every step.
+    @return 1 to show every frame, 2 to show every other one.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return 2 if level >= FEWER_FRAMES else 1            # Drop every other frame from the second step
+
+def simplifiesBlocks():
+    '''
+    Returns if the sides of the blocks are drawn as a single face.
+    @return True from the third step.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return level >= SIMPLE_BLOCKS                       # Simplify them from the third step
+
+def getRenderSize(size, qualityLevel):
+    '''
+    Returns the render resolution drawn at a quality level.
+    @param size The render resolution chosen for the cabinet.
+    @param qualityLevel The quality level.
+    @return The width and height, rounded to even numbers.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    scale = RESOLUTION_SCALES[qualityLevel]                                             # Get the part of the resolution
+    return (int(size[0] * scale) // 2 * 2, int(size[1] * scale) // 2 * 2)              # Scale it
+
+class QualityGovernor(object):
+    '''
+    Variables:
+    WINDOW: The frames measured before a decision
+    PERCENTILE: The part of the frames that have to fit in the budget
+    HEADROOM: The part of the budget the frames have to fit in to step up
+    HOLD: The windows with headroom needed to step up
+    MAX_HOLD: The most windows with headroom needed to step up
+    budget: The longest a frame should take to draw in seconds
+    times: The drawing times of the frames of the current window
+    hold: The windows with headroom needed to step up
+    calmWindows: The windows in a row with headroom
+    windowsSinceUp: The windows since the last step up
+    '''
+    WINDOW = 60                 # The frames measured before a decision
+    PERCENTILE = 0.9            # The part of the frames that have to fit in the budget
+    HEADROOM = 0.5              # The part of the budget the frames have to fit in to step up
+    HOLD = 3                    # The windows with headroom needed to step up
+    MAX_HOLD = 60               # The most windows with headroom needed to step up
+
+    def __init__(self, budget):
+        '''
+        Creates a new QualityGovernor.
+        @param self The current object
+        @param budget The longest a frame should take to draw in seconds.
+        @return A new instance of the QualityGovernor
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.budget = budget                                # Set the budget
+        self.times = []                                     # No frames yet
+        self.hold = QualityGovernor.HOLD                    # Wait the shortest time to step up
+        self.calmWindows = 0                                # No windows yet
+        self.windowsSinceUp = QualityGovernor.MAX_HOLD      # No steps up yet
+
+    def frame(self, seconds):
+        '''
+        Measures a frame and decides the quality at the end of every window.
+        @param self The current object
+        @param seconds The time the frame took to draw.
+        @return The new quality level, or None to keep it.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.times.append(seconds)                                                      # Measure the frame
+        if len(self.times) < QualityGovernor.WINDOW:                                    # Check if the window is not complete
+            return None                                                                 # Keep the quality
+        self.times.sort()                                                               # Sort the times
+        slow = self.times[int(len(self.times) * QualityGovernor.PERCENTILE) - 1]        # Get the slowest frames, a scene change is a single frame
+        self.times = []                                                                 # Start a new window
+        self.windowsSinceUp = self.windowsSinceUp + 1                                   # Count the window
+        if slow > self.budget:                                                          # Check if the frames don't fit in the budget
+            self.calmWindows = 0                                                        # The headroom is gone
+            if level >= LOWEST_RESOLUTION:                                              # Check if the quality is the lowest
+                return None                                                             # There is nothing left to drop
+            if self.windowsSinceUp <= self.hold:                                        # Check if the last step up was too much
+                self.hold = min(self.hold * 2, QualityGovernor.MAX_HOLD)                # Wait longer before the next one
+            return level + 1                                                            # Step down
+        if slow < self.budget * QualityGovernor.HEADROOM and level > FULL:              # Check if there is headroom to draw more
+            self.calmWindows = self.calmWindows + 1                                     # Count the window
+            if self.calmWindows >= self.hold:                                           # Check if the headroom lasted
+                self.calmWindows = 0                                                    # Start counting again
+                self.windowsSinceUp = 0                                                 # Remember the step up
+                return level - 1                                                        # Step up
+        else:
+            self.calmWindows = 0                                                        # The headroom has to be in a row
+        return None                                                                     # Keep the quality
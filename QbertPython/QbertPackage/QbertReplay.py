@@ -0,0 +1,183 @@
+'''
+This module records a session so it can be played again exactly.
+
+A session is deterministic when the random generators are seeded, the moves
+are timed with the simulation clock instead of the wall clock and the autopilot
+makes the same decisions. A recording keeps the seed, the simulation tick of
+every key pressed and every direction the autopilot chose, because the
+autopilot searches within a time budget and could choose differently on a
+slower or faster machine.
+
+The recordings are JSON files:
+{"seed": 1234, "ticks": 3600, "keys": [[60, "return"], [200, "s"]], "moves": [2, 3]}
+
+A scripted session is written the same way by hand, without moves, and the
+autopilot then searches with a single sample so it is still deterministic.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import json
+import pygame
+from QbertPackage import QbertAutopilot
+
+class SessionRecording(object):
+    '''
+    Variables:
+    seed: The seed of the random generators
+    ticks: The number of simulation ticks of the session
+    keys: The tick and the name of every key pressed
+    moves: The directions chosen by the autopilot
+    '''
+
+    def __init__(self, seed, ticks = 0, keys = None, moves = None):
+        '''
+        Creates a new SessionRecording.
+        @param self The current object
+        @param seed The seed of the random generators.
+        @param ticks The number of simulation ticks of the session.
+        @param keys The tick and the name of every key pressed.
+        @param moves The directions chosen by the autopilot.
+        @return A new instance of the SessionRecording
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.seed = seed                                            # Set the seed
+        self.ticks = ticks                                          # Set the length
+        self.keys = [] if keys == None else keys                    # Set the keys
+        self.moves = [] if moves == None else moves                 # Set the moves
+
+    def recordKey(self, tick, key):
+        '''
+        Records a key pressed.
+        @param self The current object
+        @param tick The simulation tick the key was handled in.
+        @param key The pygame key code.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.keys.append([tick, pygame.key.name(key)])              # Store the key by name
+
+    def getKeyEvents(self):
+        '''
+        Returns the key events of every tick.
+        @param self The current object
+        @return A dictionary with the pygame events of every tick that has keys.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        events = {}                                                                         # Declare the events
+        for tick, name in self.keys:                                                        # Loop through the keys
+            event = pygame.event.Event(pygame.KEYDOWN, key = pygame.key.key_code(name))     # Create the event
+            events.setdefault(tick, []).append(event)                                       # Add it to its tick
+        return events                                                                       # Return the events
+
+    def save(self, path):
+        '''
+        Saves the recording.
+        @param self The current object
+        @param path The file path.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with open(path, "w") as file:                                                           # Open the file
+            json.dump({"seed": self.seed, "ticks": self.ticks, "keys": self.keys, "moves": self.moves}, file)     # Write the recording
+
+def loadRecording(path):
+    '''
+    Loads a recorded or scripted session.
+    @param path The file path.
+    @return The SessionRecording.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    with open(path) as file:                                                                # Open the file
+        data = json.load(file)                                                              # Read the session
+    keys = data.get("keys", [])                                                             # Get the keys
+    ticks = data.get("ticks") or max([tick for tick, name in keys] + [0]) + 1               # Scripts may end with the last key
+    return SessionRecording(data.get("seed", 0), ticks, keys, data.get("moves", []))        # Return the recording
+
+class RecordingAutopilot(object):
+    '''
+    Variables:
+    autopilot: The autopilot that chooses the directions
+    recording: The SessionRecording that keeps them
+    '''
+
+    def __init__(self, autopilot, recording):
+        '''
+        Creates a new RecordingAutopilot.
+        @param self The current object
+        @param autopilot The QbertAutopilot.
+        @param recording The SessionRecording.
+        @return A new instance of the RecordingAutopilot
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.autopilot = autopilot                                  # Set the autopilot
+        self.recording = recording                                  # Set the recording
+
+    def chooseDirection(self, level):
+        '''
+        Chooses the direction of the autopilot and records it.
+        @param self The current object
+        @param level The QbertLevel.
+        @return The direction to move the player.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        direction = self.autopilot.chooseDirection(level)           # Search the best direction
+        self.recording.moves.append(direction)                      # Record it
+        return direction                                            # Return the direction
+
+class ReplayAutopilot(object):
+    '''
+    Variables:
+    moves: The recorded directions left
+    autopilot: The autopilot used when the recorded directions run out
+    '''
+
+    def __init__(self, recording):
+        '''
+        Creates a new ReplayAutopilot.
+        @param self The current object
+        @param recording The SessionRecording.
+        @return A new instance of the ReplayAutopilot
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.moves = list(reversed(recording.moves))                                # Keep the directions to pop them in order
+        self.autopilot = QbertAutopilot.QbertAutopilot(budget = 0)                  # Take a single sample so it is deterministic
+        self.autopilot.random.seed(recording.seed)                                  # Seed the samples
+
+    def chooseDirection(self, level):
+        '''
+        Returns the next recorded direction.
+        @param self The current object
+        @param level The QbertLevel.
+        @return The direction to move the player.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.moves:                                              # Check if there are recorded directions left
+            return self.moves.pop()                                 # Return the next one
+        return self.autopilot.chooseDirection(level)                # Search the direction
@@ -0,0 +1,1025 @@
+'''
+This module has one scene for every game state.
+
+A scene handles the keys, the update and the drawing of its state. The parts of
+a screen that don't change every frame are pre-rendered into cached layers. A
+layer is rebuilt only when the values it shows change, and it is freed when the
+game moves to a scene that can't come back to it. When a scene is entered, the
+scenes it can go to next are warmed so the transition doesn't stall a frame.
+
+The keys, enter, exit and update run in the simulation thread and change the
+game. Warm, free and render run in the main thread and only read snapshots.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import pygame
+from QbertPackage import QbertView
+from QbertPackage import QbertSprites
+from QbertPackage import QbertTrace
+from QbertPackage import QbertQuality
+from enum import Enum
+
+class GameState(Enum):      # All the different game states
+    TITLE_SCREEN = 0
+    GAMEPLAY = 1
+    PAUSE = 2
+    GAME_OVER = 3
+    SCORE_TABLE = 4
+    NEXT_LEVEL = 5
+
+class Scene(object):
+    '''
+    Variables:
+    NEXT_STATES: The game states this scene can go to
+    WHITE: The text color
+    SHADE: The color of the squares behind the text
+    HIGHLIGHT: The color of the selection
+    game: The game
+    actions: The action of every key
+    layers: The cached layers with the values they show
+    '''
+    NEXT_STATES = ()                    # The game states this scene can go to
+    WHITE = (255,255,255)               # The text color
+    SHADE = (0,0,0,200)                 # The color of the squares behind the text
+    HIGHLIGHT = (120,100,30,220)        # The color of the selection
+
+    def __init__(self, game):
+        '''
+        Creates a new Scene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the Scene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game = game                # Set the game
+        self.actions = {}               # No keys by default
+        self.layers = {}                # Nothing cached yet
+
+    def enter(self):
+        '''
+        Called in the simulation thread when the game changes to this scene.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pass                            # Nothing to do by default
+
+    def exit(self):
+        '''
+        Called in the simulation thread when the game leaves this scene.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pass                            # Nothing to do by default
+
+    def warm(self, snapshot):
+        '''
+        Builds the layers the scene will need, called in the main thread.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pass                            # Nothing to build by default
+
+    def free(self):
+        '''
+        Frees the cached layers, called in the main thread.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.layers.clear()             # Forget the layers
+
+    def reveal(self):
+        '''
+        Called in the main thread before the scene is drawn for the first time after another scene.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pass                            # Every frame is drawn whole by default
+
+    def update(self, gameTime):
+        '''
+        Updates the scene, called in the simulation thread.
+        @param self The current object
+        @param gameTime The time since the last update.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pass                            # Nothing to update by default
+
+    def render(self, surface, snapshot):
+        '''
+        Draws a snapshot of the scene, called in the main thread.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+        @return The areas of the surface that changed, None if the whole surface has to be shown.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return None                     # Nothing to draw by default
+
+    def getLayer(self, name, key, build):
+        '''
+        Returns a cached layer, building it if it doesn't exist or shows other values.
+        @param self The current object
+        @param name The layer name.
+        @param key The values the layer shows.
+        @param build The function that builds the layer.
+        @return The layer surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        layer = self.layers.get(name)                   # Get the cached layer
+        if layer == None or layer[0] != key:            # Check if it has to be built
+            layer = (key, build())                      # Build it
+            self.layers[name] = layer                   # Cache it
+        return layer[1]                                 # Return the surface
+
+    def createFrame(self):
+        '''
+        Creates an opaque layer the size of the screen with the background.
+        @param self The current object
+        @return The layer surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = pygame.Surface(pygame.display.get_surface().get_size()).convert()   # Create the layer in the screen format
+        frame.blit(self.game.background, (0,0))                                     # Draw the background
+        return frame                                                                # Return the layer
+
+    def createSquare(self, size, color):
+        '''
+        Creates a translucent square.
+        @param self The current object
+        @param size The square size in design pixels.
+        @param color The color with alpha.
+        @return The square surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        square = pygame.Surface(QbertView.scalePoint(size), pygame.SRCALPHA)      # Create a square
+        square.fill(color)                                  # Set the color with alpha
+        return square                                       # Return the square
+
+    def drawShade(self, surface, size, position):
+        '''
+        Draws the translucent square behind a text, unless the quality skips the blending.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param size The square size in design pixels.
+        @param position The top left of the square in design pixels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if QbertQuality.blendsOverlays():                                                   # Check if the shades are blended
+            surface.blit(self.createSquare(size, Scene.SHADE), QbertView.scalePoint(position))   # Display the square
+
+    def createText(self, text):
+        '''
+        Renders a text.
+        @param self The current object
+        @param text The text.
+        @return The text surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.game.font.render(text, True, Scene.WHITE).convert_alpha()     # Render the text
+
+    def drawText(self, surface, text, center):
+        '''
+        Draws a text centered on a point.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param text The text.
+        @param center The center of the text in design pixels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        text = self.createText(text)                        # Get the text
+        surface.blit(text, text.get_rect(center = QbertView.scalePoint(center)))  # Blit the text
+
+class TitleScene(Scene):
+    '''
+    The title screen with the menu. There is a full frame cached for every menu option.
+    '''
+    NEXT_STATES = (GameState.GAMEPLAY, GameState.SCORE_TABLE)
+
+    def __init__(self, game):
+        '''
+        Creates a new TitleScene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the TitleScene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.__init__(self, game)                                  # Create the scene
+        self.actions = {pygame.K_UP: self.menuUp,                   # Move the selection up
+                        pygame.K_DOWN: self.menuDown,               # Move the selection down
+                        pygame.K_RETURN: self.menuSelect}           # Choose the selected option
+
+    def enter(self):
+        '''
+        Resets the idle time when the title screen shows.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game.idleTime = 0                                      # Reset the idle time
+
+    def warm(self, snapshot):
+        '''
+        Builds the frame of every menu option.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for selection in range(self.game.TITLE_OPTIONS):            # Loop through the menu options
+            self.getFrame(selection)                                # Build the frame
+
+    def getFrame(self, selection):
+        '''
+        Returns the frame with a menu option selected.
+        @param self The current object
+        @param selection The selected option.
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.getLayer("frame%d" % selection, None, lambda: self.buildFrame(selection))  # Get the cached frame
+
+    def buildFrame(self, selection):
+        '''
+        Draws the title screen with a menu option selected.
+        @param self The current object
+        @param selection The selected option.
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = self.createFrame()                                                  # Create the frame
+        self.drawShade(frame, (405,390), (750,560))                                 # Display the square
+        frame.blit(self.createSquare((405,90), Scene.HIGHLIGHT), QbertView.scalePoint((750,560 + (selection * 100))))   # Display the selection
+        frame.blit(self.game.title, QbertView.scalePoint((420,200)))                # Render the title
+        self.drawText(frame, 'New Game', (960, 600))                                # Draw the first option
+        self.drawText(frame, 'Endless', (960, 700))                                 # Draw the second option
+        self.drawText(frame, 'High Score', (960, 800))                              # Draw the third option
+        self.drawText(frame, 'Quit Game', (960, 900))                               # Draw the fourth option
+        return frame                                                                # Return the frame
+
+    def update(self, gameTime):
+        '''
+        Starts the demo when the title screen has been idle for too long.
+        @param self The current object
+        @param gameTime The time since the last update.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game.idleTime = self.game.idleTime + gameTime          # Add the time to the idle time
+        if self.game.idleTime >= self.game.ATTRACT_DELAY:           # Check if the title has been idle for too long
+            self.game.attractMode = True                            # Let the autopilot play the demo
+            self.game.newGame()                                     # Start a new game
+
+    def render(self, surface, snapshot):
+        '''
+        Draws the title screen.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        surface.blit(self.getFrame(snapshot.menuSelection), (0,0))      # Draw the frame of the selected option
+
+    def menuUp(self):
+        '''
+        Moves the menu selection up.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.game.menuSelection > 0:                             # Make sure the selected element is greater than 0
+            self.game.menuSelection = self.game.menuSelection - 1   # Reduce the menu selection by 1
+
+    def menuDown(self):
+        '''
+        Moves the menu selection down.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.game.menuSelection < self.game.TITLE_OPTIONS - 1:   # Make sure the selected element is not the last
+            self.game.menuSelection = self.game.menuSelection + 1   # Increment the menu selection
+
+    def menuSelect(self):
+        '''
+        Chooses the selected menu option.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.game.menuSelection == 0:                            # Start game was selected
+            self.game.newGame()                                     # Start a new game
+        elif self.game.menuSelection == 1:                          # Endless option was selected
+            self.game.newGame(endless = True)                       # Start an endless game
+        elif self.game.menuSelection == 2:                          # High score option was selected
+            self.game.loadScores()                                  # Reload the scores saved by other cabinets
+            if self.game.leaderboardClient != None:                 # Check if there is a global leaderboard
+                self.game.leaderboardClient.refresh()               # Fetch the global scores in the background
+            self.game.setState(GameState.SCORE_TABLE)               # Change the game state to SCORE_TABLE
+        elif self.game.menuSelection == 3:                          # Quit option was selected
+            self.game.quit()                                        # Save the scores and quit the application
+
+class ScoreTableScene(Scene):
+    '''
+    The high score table. The whole frame is cached until the scores change.
+    '''
+    NEXT_STATES = (GameState.TITLE_SCREEN,)
+
+    def __init__(self, game):
+        '''
+        Creates a new ScoreTableScene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the ScoreTableScene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.__init__(self, game)                                  # Create the scene
+        self.actions = {pygame.K_RETURN: lambda: self.game.setState(GameState.TITLE_SCREEN)}   # Return to the TITLE_SCREEN
+
+    def warm(self, snapshot):
+        '''
+        Builds the frame with the current scores.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.getFrame(snapshot.scores)                              # Build the frame
+
+    def getFrame(self, scores):
+        '''
+        Returns the frame with some scores.
+        @param self The current object
+        @param scores The names and scores to show.
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.getLayer("frame", scores, lambda: self.buildFrame(scores))      # Get the cached frame
+
+    def buildFrame(self, scores):
+        '''
+        Draws the score table.
+        @param self The current object
+        @param scores The names and scores to show.
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = self.createFrame()                                                  # Create the frame
+        self.drawShade(frame, QbertView.DESIGN_SIZE, (0,0))                         # Shade the background
+        self.drawText(frame, 'HIGH SCORES', (980, 100))                             # Draw the title
+        for position, (name, score) in enumerate(scores):                           # Loop through the highscores
+            self.drawText(frame, name + " " + str(score), (980, 200 + (position * 100)))   # Draw the record
+        self.drawText(frame, 'Press ENTER to return to the Title Screen.', (980, 980))    # Draw the instructions
+        return frame                                                                # Return the frame
+
+    def update(self, gameTime):
+        '''
+        Shows the global scores when new ones are fetched.
+        @param self The current object
+        @param gameTime The time since the last update.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.game.leaderboardClient != None:                                     # Check if there is a global leaderboard
+            if self.game.leaderboardClient.version != self.game.tableVersion:       # Check if new global scores were fetched
+                self.game.loadScores()                                              # Show them
+
+    def render(self, surface, snapshot):
+        '''
+        Draws the score table.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        surface.blit(self.getFrame(snapshot.scores), (0,0))         # Draw the cached frame
+
+class GameplayScene(Scene):
+    '''
+    The level being played. The blocks, the beings and the HUD are sprites of a single group sorted by depth.
+    Only the sprites that changed are drawn again over the cached background.
+
+    Variables:
+    group: The LayeredDirty group with every sprite
+    blocks: The graphical blocks the block sprites were made from
+    blockSprites: The sprite of every block
+    beingSprites: The sprite of every being by its key
+    hud: The score, level, lives and mode sprites
+    values: The block values shown, the level gives a new tuple only when a block changes
+    hudValues: The score, level, lives and mode shown
+    '''
+    NEXT_STATES = (GameState.PAUSE, GameState.NEXT_LEVEL, GameState.GAME_OVER, GameState.TITLE_SCREEN)
+
+    def __init__(self, game):
+        '''
+        Creates a new GameplayScene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the GameplayScene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.__init__(self, game)                                                  # Create the scene
+        self.actions = {pygame.K_q: lambda: self.queueMove(game.NW),                # Move the player North West
+                        pygame.K_w: lambda: self.queueMove(game.NE),                # Move the player North East
+                        pygame.K_s: lambda: self.queueMove(game.SE),                # Move the player South East
+                        pygame.K_a: lambda: self.queueMove(game.SW),                # Move the player South West
+                        pygame.K_p: lambda: self.game.setState(GameState.PAUSE),   # Pause the game
+                        pygame.K_TAB: self.toggleAutopilot}                         # Toggle the autopilot
+        self.group = None                                                           # The sprites are created when warmed
+        self.blocks = None                                                          # No blocks yet
+        self.blockSprites = []                                                      # No block sprites yet
+        self.beingSprites = {}                                                      # No being sprites yet
+        self.hud = []                                                               # No HUD yet
+        self.values = None                                                          # No blocks shown yet
+        self.hudValues = None                                                       # No HUD shown yet
+
+    def warm(self, snapshot):
+        '''
+        Builds the background and the sprites.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        back = self.getLayer("back", None, self.buildBack)                          # Build the background
+        if self.group == None:                                                      # Check if the sprites have to be created
+            self.group = pygame.sprite.LayeredDirty()                               # Create the group
+            self.group.clear(pygame.display.get_surface(), back)                    # Erase the sprites with the background
+            font = self.game.bitmapFont                                             # Get the HUD font
+            self.hud = [QbertSprites.TextSprite(font, position) for position in ((50,30), (50,90), (50,150), (50,980))]   # Create the score, level, lives and mode
+            self.group.add(*self.hud)                                               # Add the HUD
+        self.setBlocks(snapshot.blocks)                                             # Create the block sprites
+
+    def free(self):
+        '''
+        Frees the background and the sprites.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.free(self)                                                            # Forget the layers
+        self.group = None                                                           # Forget the group
+        self.blocks = None                                                          # Forget the blocks
+        self.blockSprites = []                                                      # Forget the block sprites
+        self.beingSprites = {}                                                      # Forget the being sprites
+        self.hud = []                                                               # Forget the HUD
+        self.values = None                                                          # Nothing is shown
+        self.hudValues = None                                                       # Nothing is shown
+
+    def reveal(self):
+        '''
+        Draws the whole screen again the next time the level is drawn.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.group.repaint_rect(pygame.display.get_surface().get_rect())            # Repaint everything
+
+    def setBlocks(self, blocks):
+        '''
+        Creates the sprites of the blocks of a new level.
+        @param self The current object
+        @param blocks The graphical blocks.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if blocks is self.blocks:                                                   # Check if the level changed
+            return                                                                  # Keep the sprites
+        self.group.remove(*self.blockSprites)                                       # Remove the old blocks
+        self.blocks = blocks                                                        # Set the blocks
+        self.blockSprites = [QbertSprites.BlockSprite(block) for block in blocks]   # Draw every block once
+        self.values = None                                                          # The new sprites show no values yet
+        self.group.add(*self.blockSprites)                                          # Add the blocks
+        self.group.repaint_rect(pygame.display.get_surface().get_rect())            # Repaint everything
+
+    def buildBack(self):
+        '''
+        Draws the background with the square behind the HUD.
+        @param self The current object
+        @return The layer surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = self.createFrame()                                          # Create the frame
+        self.drawShade(frame, (700,210), (20,30))                           # Display the square
+        return frame                                                        # Return the layer
+
+    def update(self, gameTime):
+        '''
+        Moves the player and updates the level.
+        @param self The current object
+        @param gameTime The time since the last update.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        game = self.game                                                            # Get the game
+        autopilot = game.getAutopilot().chooseDirection if game.autopilotEnabled or game.attractMode else None    # The autopilot moves the player when nothing is pressed
+        game.progress.tick(game.currentLevel, game.inputBuffer, game.clock(), gameTime, autopilot)           # Move the player and update the current level
+        if game.progress.levelCompleted:                                            # If the game is completed
+            if game.attractMode or game.endlessMode:                                # The demo and the endless games skip the screens between levels
+                game.nextLevel()                                                    # Load the next level
+            else:
+                game.setState(GameState.NEXT_LEVEL)                                 # Change the state to the NEXT_LEVEL
+        elif game.progress.playerDead:                                              # if the player is dead
+            if game.attractMode:                                                    # If the demo lost
+                game.attractMode = False                                            # Stop the demo
+                game.setState(GameState.TITLE_SCREEN)                               # Return to the TITLE_SCREEN
+            else:
+                game.setState(GameState.GAME_OVER)                                  # Change the game state to the GAME_OVER state
+
+    def render(self, surface, snapshot):
+        '''
+        Draws the level and the HUD.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+        @return The areas of the surface that changed.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with QbertTrace.span("drawBlocks", "render"):                                   # Time the blocks
+            self.setBlocks(snapshot.blocks)                                             # Check if a new level started
+            if snapshot.values is not self.values:                                      # Check if a block changed
+                self.values = snapshot.values                                           # Remember the values shown
+                for sprite, active in zip(self.blockSprites, snapshot.values):          # Loop through the blocks
+                    sprite.setActive(active)                                            # Turn the block on or off
+        with QbertTrace.span("drawBeings", "render"):                                   # Time the player and the enemies
+            shown = set()                                                               # The beings in this snapshot
+            for key, falling, frame, position in snapshot.sprites:                      # Loop through the beings
+                shown.add(key)                                                          # Remember the being
+                sprite = self.beingSprites.get(key)                                     # Get its sprite
+                if sprite == None:                                                      # Check if the being just appeared
+                    sprite = QbertSprites.BeingSprite()                                 # Create its sprite
+                    sprite.setFrame(frame, position)                                    # Show the frame before it is drawn
+                    self.beingSprites[key] = sprite                                     # Remember the sprite
+                    self.group.add(sprite)                                              # Add it to the group
+                else:
+                    sprite.setFrame(frame, position)                                    # Move the being
+                depth = QbertSprites.getDepth(QbertSprites.BEHIND if falling else QbertSprites.FRONT, position[1])   # Beings falling are behind the blocks
+                if depth != self.group.get_layer_of_sprite(sprite):                     # Check if the being changed depth
+                    self.group.change_layer(sprite, depth)                              # Sort it again
+            for key in [key for key in self.beingSprites if key not in shown]:          # Loop through the beings that are gone
+                self.beingSprites.pop(key).kill()                                       # Remove the being
+        with QbertTrace.span("drawHud", "render"):                                      # Time the HUD
+            hudValues = (snapshot.score, snapshot.level, snapshot.lives, snapshot.mode) # Get the HUD values
+            if hudValues != self.hudValues:                                             # Check if one of them changed
+                self.hudValues = hudValues                                              # Remember the values shown
+                score, level, lives, mode = self.hud                                    # Get the HUD sprites
+                score.setText("Score: " + str(snapshot.score))                          # Show the score
+                level.setText("Level: " + str(snapshot.level))                          # Show the level
+                lives.setText("Lives: " + str(snapshot.lives))                          # Show the lives
+                mode.setText(snapshot.mode)                                             # Show who is playing
+        with QbertTrace.span("drawSprites", "render"):                                  # Time the blits of every sprite
+            return self.group.draw(surface)                                             # Draw what changed
+
+    def queueMove(self, direction):
+        '''
+        Queues a move to be applied as soon as the player can jump.
+        @param self The current object
+        @param direction The direction to move the player.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game.inputBuffer.push(direction, self.game.clock())     # Queue the move with the time it was pressed
+
+    def toggleAutopilot(self):
+        '''
+        Toggles the autopilot.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game.autopilotEnabled = not self.game.autopilotEnabled     # Toggle the autopilot
+
+class PauseScene(Scene):
+    '''
+    The pause screen. The whole frame is cached.
+    '''
+    NEXT_STATES = (GameState.GAMEPLAY,)
+
+    def __init__(self, game):
+        '''
+        Creates a new PauseScene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the PauseScene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.__init__(self, game)                                  # Create the scene
+        self.actions = {pygame.K_p: lambda: self.game.setState(GameState.GAMEPLAY)}    # Resume the game
+
+    def enter(self):
+        '''
+        Forgets the moves pressed before pausing.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game.inputBuffer.clear()                               # Forget the moves pressed before pausing
+
+    def warm(self, snapshot):
+        '''
+        Builds the frame.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.getLayer("frame", None, self.buildFrame)               # Build the frame
+
+    def buildFrame(self):
+        '''
+        Draws the pause screen.
+        @param self The current object
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = self.createFrame()                                                  # Create the frame
+        self.drawShade(frame, QbertView.DESIGN_SIZE, (0,0))                         # Shade the background
+        self.drawText(frame, "PAUSED", (980, 580))                                  # Draw the text
+        return frame                                                                # Return the frame
+
+    def render(self, surface, snapshot):
+        '''
+        Draws the pause screen.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        surface.blit(self.getLayer("frame", None, self.buildFrame), (0,0))      # Draw the cached frame
+
+class NextLevelScene(Scene):
+    '''
+    The screen between levels. The whole frame is cached for the level completed.
+    '''
+    NEXT_STATES = (GameState.GAMEPLAY,)
+
+    def __init__(self, game):
+        '''
+        Creates a new NextLevelScene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the NextLevelScene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.__init__(self, game)                                  # Create the scene
+        self.actions = {pygame.K_RETURN: self.game.nextLevel}       # Load the next level
+
+    def warm(self, snapshot):
+        '''
+        Builds the frame for the level being played.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.getFrame(snapshot.level)                               # Build the frame
+
+    def getFrame(self, level):
+        '''
+        Returns the frame for a level.
+        @param self The current object
+        @param level The level completed.
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.getLayer("frame", level, lambda: self.buildFrame(level))        # Get the cached frame
+
+    def buildFrame(self, level):
+        '''
+        Draws the level completed screen.
+        @param self The current object
+        @param level The level completed.
+        @return The frame surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = self.createFrame()                                                  # Create the frame
+        self.drawShade(frame, (910,310), (510,370))                                 # Display the square
+        self.drawText(frame, "LEVEL " + str(level) + " COMPLETED!", (980, 450))     # Draw the title
+        self.drawText(frame, "Press ENTER to continue.", (980, 610))                # Draw the instructions
+        return frame                                                                # Return the frame
+
+    def render(self, surface, snapshot):
+        '''
+        Draws the level completed screen.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        surface.blit(self.getFrame(snapshot.level), (0,0))          # Draw the cached frame
+
+class GameOverScene(Scene):
+    '''
+    The game over screen where the player enters the initials. The frame without the initials is cached for the score.
+    '''
+    NEXT_STATES = (GameState.TITLE_SCREEN,)
+
+    def __init__(self, game):
+        '''
+        Creates a new GameOverScene.
+        @param self The current object
+        @param game The game.
+        @return A new instance of the GameOverScene
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        Scene.__init__(self, game)                                  # Create the scene
+        self.actions = {pygame.K_RETURN: self.submitScore,          # Save the score
+                        pygame.K_LEFT: self.initialLeft,            # Select the previous initial
+                        pygame.K_RIGHT: self.initialRight,          # Select the next initial
+                        pygame.K_UP: self.initialUp,                # Change the initial to the next letter
+                        pygame.K_DOWN: self.initialDown}            # Change the initial to the previous letter
+
+    def enter(self):
+        '''
+        Looks up the rank of the score and selects the first initial.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.game.initialSelected = 0                                                           # Set the initial selected to the first letter
+        if self.game.endlessMode:                                                               # Check if the score is not saved
+            self.game.rank = None                                                               # It has no rank
+        else:
+            self.game.lookUpRank(self.game.currentLevel.getCurrentScore())                      # Look up the rank of the score in the background
+
+    def warm(self, snapshot):
+        '''
+        Builds the background, the square behind the initials is the same for every score.
+        @param self The current object
+        @param snapshot The latest QbertSnapshot.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.getLayer("back", None, self.buildBack)                                 # Build the background
+        self.getLayer("selection", None, lambda: self.createSquare((30,60), Scene.HIGHLIGHT))   # Build the selection
+
+    def buildBack(self):
+        '''
+        Draws the background with the square behind the text.
+        @param self The current object
+        @return The layer surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        frame = self.createFrame()                                          # Create the frame
+        self.drawShade(frame, (1170,510), (380,300))                        # Display the square
+        return frame                                                        # Return the layer
+
+    def buildText(self, score, rank):
+        '''
+        Draws the texts that don't change while the initials are entered.
+        When the quality skips the blending, they are drawn over a copy of the background so the layer is opaque.
+        @param self The current object
+        @param score The score.
+        @param rank The rank of the score, 0 until it is known and None if it is not saved.
+        @return The layer surface.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if QbertQuality.blendsOverlays():                                                   # Check if the layer is blended over the background
+            layer = pygame.Surface(pygame.display.get_surface().get_size(), pygame.SRCALPHA)    # Create a transparent layer
+        else:
+            layer = self.getLayer("back", None, self.buildBack).copy()                      # Start from the background
+        self.drawText(layer, "GAME OVER!", (980, 400))                                      # Draw the title
+        if rank == None:                                                                    # Check if the score is not saved
+            self.drawText(layer, "Your score was: " + str(score), (980, 500))               # Draw the score
+            self.drawText(layer, "Endless scores are not saved.", (980, 700))               # Draw the instructions
+        else:
+            self.drawText(layer, "Your score was: " + str(score) + (" (#" + str(rank) + ")" if rank else ""), (980, 500))    # Draw the score, the rank once it is known
+            self.drawText(layer, "Press ENTER to save your score.", (980, 700))             # Draw the instructions
+        return layer                                                                        # Return the layer
+
+    def render(self, surface, snapshot):
+        '''
+        Draws the game over screen.
+        @param self The current object
+        @param surface The surface to draw on.
+        @param snapshot The QbertSnapshot to draw.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        text = self.getLayer("text", (snapshot.score, snapshot.rank), lambda: self.buildText(snapshot.score, snapshot.rank))   # Get the cached texts
+        if QbertQuality.blendsOverlays():                                           # Check if the texts are blended
+            surface.blit(self.getLayer("back", None, self.buildBack), (0,0))        # Draw the cached background
+            surface.blit(self.getLayer("selection", None, lambda: self.createSquare((30,60), Scene.HIGHLIGHT)), QbertView.scalePoint((1179 + snapshot.initialSelected * 34,570)))    # Display the selection
+            surface.blit(text, (0,0))                                               # Draw the texts over it
+        else:
+            surface.blit(text, (0,0))                                               # Draw the background with the texts
+            surface.blit(self.getLayer("selection", None, lambda: self.createSquare((30,60), Scene.HIGHLIGHT)), QbertView.scalePoint((1179 + snapshot.initialSelected * 34,570)))    # Display the selection
+        initials = "Your initials: " + snapshot.initials                            # Get the initials text
+        text = self.getLayer("initials", initials, lambda: self.createText(initials))   # Render the initials only when they change
+        surface.blit(text, text.get_rect(center = QbertView.scalePoint((980, 600))))    # Blit the text
+
+    def submitScore(self):
+        '''
+        Saves the score with the selected initials, unless the game was endless, and returns to the title screen.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not self.game.endlessMode:                                                       # Endless scores start too high to be compared
+            self.game.saveScore(self.game.initials, self.game.currentLevel.getCurrentScore())  # Save the current score in the score list and file
+        self.game.setState(GameState.TITLE_SCREEN)                                          # Change the game state to the TITLE_SCREEN
+
+    def initialLeft(self):
+        '''
+        Selects the previous initial.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.game.initialSelected > 0:                                   # Make sure it is not the first initial
+            self.game.initialSelected = self.game.initialSelected - 1       # Reduce the selected initial by 1
+
+    def initialRight(self):
+        '''
+        Selects the next initial.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.game.initialSelected < 2:                                   # Make sure it is not the last initial
+            self.game.initialSelected = self.game.initialSelected + 1       # Increment the initial selected
+
+    def initialUp(self):
+        '''
+        Changes the selected initial to the next letter.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        initials = self.game.initials                                       # Get the initials
+        if initials[self.game.initialSelected] >= 'Z':                      # Check if the current letter is Z or more
+            initials[self.game.initialSelected] = 'A'                       # Change it to A
+        else:
+            initials[self.game.initialSelected] = chr(ord(initials[self.game.initialSelected])+1)     # Otherwise, increment it by 1
+
+    def initialDown(self):
+        '''
+        Changes the selected initial to the previous letter.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        initials = self.game.initials                                       # Get the initials
+        if initials[self.game.initialSelected] <= 'A':                      # Check if the current is A or lower
+            initials[self.game.initialSelected] = 'Z'                       # Set it to Z
+        else:
+            initials[self.game.initialSelected] = chr(ord(initials[self.game.initialSelected])-1)     # Decrease the letter by 1
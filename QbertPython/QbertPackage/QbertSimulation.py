@@ -0,0 +1,399 @@
+'''
+This class represents a cheap copy of a Qbert level used to look ahead.
+
+The simulation keeps no textures or Vector2s: the board is a bit mask, the
+beings are cell indexes and the enemies are a tuple, so a clone only copies
+references and a step only replaces what changed. Each step advances a whole
+jump of the player.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+from QbertPackage import QbertGraph
+from QbertPackage import QbertEnemy
+from QbertPackage import QbertProgression
+from QbertPackage.QbertBeing import QbertBeingClass
+
+MASK64 = (1 << 64) - 1          # The mask to keep the random generator in 64 bits
+
+def countTicks(height, goingUp):
+    '''
+    Counts the updates a being needs to land, replicating QbertBeingClass.update.
+    @param height The starting height.
+    @param goingUp True if the being starts going up.
+    @return The number of updates until the being lands.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    ticks = 0                                                   # Declare the tick counter
+    while height >= 0:                                          # Loop until the being goes under the floor
+        if goingUp:                                             # Check if it is going up
+            height = height + QbertBeingClass.deltaHeight       # Increase the height
+        else:
+            height = height - QbertBeingClass.deltaHeight       # Decrease the height
+        if height >= QbertBeingClass.maxHeight:                 # Check if it reached the max height
+            goingUp = False                                     # Start going down
+        ticks = ticks + 1                                       # Count the tick
+    return ticks                                                # Return the ticks
+
+class SimulationRules(object):
+    '''
+    Variables:
+    lifeBonus: The amount of score needed to gain a new life
+    lowestTimeToAct: The shortest time for an enemy to make a movement
+    highestTimeToAct: The longest time for an enemy to make a movement
+    enemyDivisor: The levels needed to add one more enemy
+    chaserDivisor: The levels needed to turn one more enemy into a chaser
+    scoreBase: The score given by a block
+    scoreStep: The levels needed to increase the block score
+    tickTime: The time of one game update
+    jumpTicks: The updates a jump takes
+    respawnTicks: The updates a respawn takes
+    fallTicks: The updates a being falls before respawning
+    progression: The ProgressionTable of the rules
+    '''
+
+    def __init__(self, lifeBonus = QbertProgression.LIFE_BONUS, lowestTimeToAct = QbertEnemy.QbertEnemy.lowestTimeToAct, highestTimeToAct = QbertEnemy.QbertEnemy.highestTimeToAct,
+                 enemyDivisor = 3, scoreBase = 20, scoreStep = 10, tickTime = 1 / 60, chaserDivisor = 4):
+        '''
+        Creates the rules of the simulation, the defaults are the game's rules.
+        @param self The current object
+        @param lifeBonus The amount of score needed to gain a new life, as QbertProgression.LIFE_BONUS.
+        @param lowestTimeToAct The shortest time for an enemy to make a movement.
+        @param highestTimeToAct The longest time for an enemy to make a movement.
+        @param enemyDivisor The levels needed to add one more enemy.
+        @param scoreBase The score given by a block.
+        @param scoreStep The levels needed to increase the block score.
+        @param tickTime The time of one game update.
+        @param chaserDivisor The levels needed to turn one more enemy into a chaser.
+        @return A new instance of the SimulationRules
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.lifeBonus = lifeBonus                                          # Set the life bonus
+        self.lowestTimeToAct = lowestTimeToAct                              # Set the shortest time to act
+        self.highestTimeToAct = highestTimeToAct                            # Set the longest time to act
+        self.enemyDivisor = enemyDivisor                                    # Set the enemy divisor
+        self.chaserDivisor = chaserDivisor                                  # Set the chaser divisor
+        self.scoreBase = scoreBase                                          # Set the block score
+        self.scoreStep = scoreStep                                          # Set the score step
+        self.tickTime = tickTime                                            # Set the update time
+        self.jumpTicks = countTicks(0, True)                                # Count the updates of a jump
+        self.respawnTicks = countTicks(QbertBeingClass.maxHeight, False)    # Count the updates of a respawn
+        self.fallTicks = (300 - QbertBeingClass.deltaHeight) // QbertBeingClass.deltaHeight     # Count the updates falling until -300
+        self.progression = QbertProgression.getTable(enemyDivisor, scoreBase, scoreStep, lowestTimeToAct, highestTimeToAct, chaserDivisor)   # Get the table of the rules
+
+    def getEnemyCount(self, level):
+        '''
+        Returns the number of enemies of a level.
+        @param self The current object
+        @param level The level number.
+        @return The number of enemies.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.progression.getEnemyCount(level)                            # Look up the level
+
+    def getBlockScore(self, level):
+        '''
+        Returns the score given by a block in a level.
+        @param self The current object
+        @param level The level number.
+        @return The block score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.progression.getBlockScore(level)                            # Look up the level
+
+class SimulationState(object):
+    '''
+    Variables:
+    rules: The simulation rules
+    graph: The pyramid graph
+    level: The level number
+    score: The current score
+    lives: The player's lives
+    bonusMark: The score of the last life bonus
+    board: The bit mask of the blocks that are on
+    player: The player's cell
+    enemies: A tuple with the cell, the time to act and True if it chases the player of every enemy
+    time: The time elapsed in the level
+    seed: The random generator state
+    '''
+
+    def __init__(self, rules, level, score, lives, seed, bonusMark = 0):
+        '''
+        Creates the state of a level that just started.
+        @param self The current object
+        @param rules The simulation rules.
+        @param level The level number.
+        @param score The previous score.
+        @param lives The player's lives.
+        @param seed The random seed.
+        @param bonusMark The score of the last life bonus.
+        @return A new instance of the SimulationState
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.rules = rules                                          # Set the rules
+        self.graph = QbertGraph.getGraph()                          # Get the pyramid graph
+        self.level = level                                          # Set the level
+        self.score = score                                          # Set the score
+        self.lives = lives                                          # Set the lives
+        self.bonusMark = bonusMark                                  # Set the last bonus
+        self.seed = (seed & MASK64) or 0x9E3779B97F4A7C15           # Set the random seed, it can't be 0
+        self.board = 0                                              # Set all the blocks off
+        self.time = 0                                               # Reset the time
+        self.player = 0                                             # Spawn the player at the top
+        respawnTime = rules.respawnTicks * rules.tickTime           # Get the time it takes to drop into the board
+        enemies = []                                                # Declare the enemy list
+        chaserCount = rules.progression.getChaserCount(level)       # Get the chasers, they are the last enemies as in QbertLevel
+        for enemyCounter in range(rules.getEnemyCount(level)):      # Loop through the enemies
+            chases = enemyCounter >= rules.getEnemyCount(level) - chaserCount       # Check if the enemy is a chaser
+            enemies.append((self.randomCell(), respawnTime + self.randomTimeToAct(), chases))   # Drop the enemy in a random cell
+        self.enemies = tuple(enemies)                               # Store the enemies
+        self.landPlayer(0)                                          # Land the player on the top
+
+    def clone(self):
+        '''
+        Clones the state, every value is immutable so the references are shared until changed.
+        @param self The current object
+        @return The new SimulationState.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        state = SimulationState.__new__(SimulationState)    # Create an empty state
+        state.__dict__.update(self.__dict__)                # Share all the values
+        return state                                        # Return the clone
+
+    def nextRandom(self, bound):
+        '''
+        Returns a random number using a xorshift generator that is cheap to clone.
+        @param self The current object
+        @param bound The exclusive upper bound.
+        @return A number between 0 and bound - 1.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        seed = self.seed                        # Get the seed
+        seed = seed ^ ((seed << 13) & MASK64)   # Shift left
+        seed = seed ^ (seed >> 7)               # Shift right
+        seed = seed ^ ((seed << 17) & MASK64)   # Shift left
+        self.seed = seed                        # Store the new seed
+        return seed % bound                     # Return the number in range
+
+    def randomCell(self):
+        '''
+        Returns a random cell of the board.
+        @param self The current object
+        @return A random cell.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.nextRandom(self.graph.size)     # Return a random cell
+
+    def randomTimeToAct(self):
+        '''
+        Returns a random time for an enemy to act, as QbertEnemy.resetTimeToAct.
+        @param self The current object
+        @return The time to act.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        lowest, highest = self.rules.progression.getTimeToAct(self.level)      # Get the range of the level
+        return lowest + self.nextRandom(highest - lowest + 1)                   # Return a time between the lowest and highest
+
+    def isCompleted(self):
+        '''
+        Returns true if all the blocks are on.
+        @param self The current object
+        @return True if the level is completed.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.board == self.graph.fullMask        # Compare the board to the full mask
+
+    def isDead(self):
+        '''
+        Returns true if the player has no lives.
+        @param self The current object
+        @return True if the player is dead.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self.lives <= 0                          # Return true if there are no lives left
+
+    def remainingBlocks(self):
+        '''
+        Returns the number of blocks that are off.
+        @param self The current object
+        @return The number of blocks that are off.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return bin(self.graph.fullMask & ~self.board).count("1")     # Count the bits that are off
+
+    def step(self, direction):
+        '''
+        Returns a new state after the player jumps towards a direction.
+        @param self The current object
+        @param direction The direction of the jump.
+        @return The new SimulationState.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        state = self.clone()            # Clone the state
+        state.advance(direction)        # Advance the clone
+        return state                    # Return the clone
+
+    def advance(self, direction):
+        '''
+        Advances this state while the player jumps towards a direction.
+        @param self The current object
+        @param direction The direction of the jump.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        target = self.graph.getNeighbour(self.player, direction)                    # Get the landing cell
+        previous = self.enemies                                                     # Remember the enemies before the jump
+        self.moveEnemies(self.rules.jumpTicks * self.rules.tickTime)                # Move the enemies during the jump
+        if target == QbertGraph.OFF_BOARD:                                          # Check if the player jumped off the board
+            self.loseLife(self.rules.fallTicks + self.rules.respawnTicks)          # Lose a life after falling
+        elif self.isOccupied(target) or self.isCrossed(previous, target):           # Check if an enemy is in the landing cell or crossed the player
+            self.loseLife(self.rules.respawnTicks)                                  # Lose a life and respawn
+        else:
+            self.landPlayer(target)                                                 # Land the player
+        if self.score - self.bonusMark > self.rules.lifeBonus:                      # If the score has gone above the life bonus
+            self.lives = self.lives + 1                                             # Add one life to the player
+            self.bonusMark = self.score                                             # Update the next life bonus
+
+    def isOccupied(self, cell):
+        '''
+        Returns true if an enemy is standing in a cell.
+        @param self The current object
+        @param cell The cell.
+        @return True if an enemy is in the cell.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for enemy in self.enemies:          # Loop through the enemies
+            if enemy[0] == cell:            # Check the enemy's cell
+                return True                 # Found an enemy
+        return False                        # No enemy in the cell
+
+    def isCrossed(self, previous, target):
+        '''
+        Returns true if an enemy jumped from the player's landing cell to the player's cell, as QbertLevel.checkCollisions.
+        @param self The current object
+        @param previous The enemies before the jump.
+        @param target The player's landing cell.
+        @return True if the player and an enemy crossed each other.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for before, after in zip(previous, self.enemies):                           # Loop through the enemies
+            if before[0] == target and after[0] == self.player:                     # Check if the enemy swapped cells with the player
+                return True                                                         # They met in the middle
+        return False                                                                # No enemy crossed the player
+
+    def moveEnemies(self, elapsed):
+        '''
+        Moves the enemies whose time to act expires in the elapsed time.
+        @param self The current object
+        @param elapsed The time elapsed.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.time = self.time + elapsed                                                         # Add the time elapsed
+        fallTime = (self.rules.fallTicks + self.rules.respawnTicks) * self.rules.tickTime       # Get the time an enemy needs to respawn
+        enemies = []                                                                            # Declare the new enemies
+        for cell, timeToAct, chases in self.enemies:                                            # Loop through the enemies
+            timeToAct = timeToAct - elapsed                                                     # Reduce the time to act
+            while timeToAct <= 0:                                                               # Act while the time expired
+                if cell == QbertGraph.OFF_BOARD:                                                # Check if the enemy fell
+                    cell = self.randomCell()                                                    # Respawn it in a random cell
+                    timeToAct = timeToAct + self.randomTimeToAct()                              # Reset the time to act
+                else:
+                    direction = self.graph.getNextHop(cell, self.player) if chases else None    # Look up the jump towards the player
+                    if direction == None:                                                       # Check if the enemy wanders
+                        direction = self.nextRandom(QbertGraph.QbertGraph.DIRECTIONS)           # Choose a random direction
+                    cell = self.graph.getNeighbour(cell, direction)                             # Move it like QbertLevel.moveEnemy
+                    if cell == QbertGraph.OFF_BOARD:                                            # Check if it jumped off the board
+                        timeToAct = timeToAct + fallTime                                        # Wait for it to fall
+                    else:
+                        timeToAct = timeToAct + self.randomTimeToAct()                          # Reset the time to act
+            enemies.append((cell, timeToAct, chases))                                           # Store the enemy
+        self.enemies = tuple(enemies)                                                           # Replace the enemies
+
+    def loseLife(self, ticks):
+        '''
+        Makes the player lose a life and respawn at the top.
+        @param self The current object
+        @param ticks The updates until the player lands again.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.lives = self.lives - 1                                                     # Lose a life
+        self.enemies = tuple(enemy for enemy in self.enemies if enemy[0] != 0) + tuple( # Hit the enemies at the top
+            (self.randomCell(), self.randomTimeToAct(), enemy[2]) for enemy in self.enemies if enemy[0] == 0)
+        self.moveEnemies(ticks * self.rules.tickTime)                                   # Move the enemies while the player falls
+        self.player = 0                                                                 # Respawn at the top
+        if not self.isDead():                                                           # Check if the player is still alive
+            self.landPlayer(0)                                                          # Land the player
+
+    def landPlayer(self, cell):
+        '''
+        Lands the player in a cell, as QbertLevel.updatePlayer.
+        @param self The current object
+        @param cell The cell.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.player = cell                                                  # Move the player
+        bit = 1 << cell                                                     # Get the cell's bit
+        if not self.rules.progression.togglesBlocks(self.level):            # Switch between logics, the block will turn off in even levels
+            if not self.board & bit:                                        # Check if the block is off
+                self.board = self.board | bit                               # Turn it on
+                self.score = self.score + self.rules.getBlockScore(self.level)      # Add score
+        else:
+            self.board = self.board ^ bit                                   # Switch the block state
+            self.score = self.score + self.rules.getBlockScore(self.level)  # Add score
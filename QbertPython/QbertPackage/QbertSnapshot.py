@@ -0,0 +1,65 @@
+'''
+This class represents everything the renderer needs to draw one frame.
+
+The simulation thread takes a new snapshot after every tick and publishes it
+by replacing a single reference. A snapshot is never changed after it is
+taken, so the renderer can draw it while the simulation builds the next one.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+
+class QbertSnapshot(object):
+    '''
+    Variables:
+    tick: The number of the simulation tick
+    gameState: The game state
+    menuSelection: The element selected in the menu
+    scores: The names and scores of the score table
+    level: The level number
+    score: The current score
+    lives: The player's lives
+    rank: The rank of the last game's score
+    initials: The initials being entered
+    initialSelected: The position of the initial selected
+    mode: The text telling who is playing or the endless mode, None when the player is in a normal game
+    blocks: The graphical blocks of the level
+    values: True for every block that is on
+    sprites: The key, falling flag, frame and position of every being
+    '''
+
+    def __init__(self, game, tick):
+        '''
+        Takes a snapshot of the game.
+        @param self The current object
+        @param game The game.
+        @param tick The number of the simulation tick.
+        @return A new instance of the QbertSnapshot
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.tick = tick                                                            # Set the tick
+        self.gameState = game.gameState                                             # Copy the game state
+        self.menuSelection = game.menuSelection                                     # Copy the menu selection
+        self.scores = tuple((record.getName(), record.getScore()) for record in game.highScores[:game.MAX_DISPLAY_SCORE])  # Copy the scores shown
+        self.level = game.level                                                     # Copy the level
+        self.rank = game.rank                                                       # Copy the rank
+        self.initials = "".join(game.initials)                                      # Copy the initials
+        self.initialSelected = game.initialSelected                                 # Copy the initial selected
+        self.mode = "DEMO" if game.attractMode else "AUTOPILOT" if game.autopilotEnabled else "ENDLESS" if game.endlessMode else None    # Copy who is playing
+        level = game.currentLevel                                                   # Get the current level
+        if level != None:                                                           # Check if a game was started
+            self.score = level.getCurrentScore()                                    # Copy the score
+            self.lives = level.playersLives()                                       # Copy the lives
+            self.blocks = level.blocks                                              # The blocks never change once created
+            self.values = level.getBlockValues()                                    # Copy the block values
+            self.sprites = tuple(level.getSprites())                                # Copy the sprites
+        else:
+            self.score = 0                                                          # There is no score yet
+            self.lives = 0                                                          # There are no lives yet
+            self.blocks = ()                                                        # There are no blocks yet
+            self.values = ()                                                        # There are no values yet
+            self.sprites = ()                                                       # There are no sprites yet
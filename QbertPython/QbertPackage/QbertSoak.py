@@ -0,0 +1,206 @@
+'''
+This module soaks the real game code with random or adversarial inputs for
+millions of ticks, to shake out the bugs of the being and level state
+machines that the balancing simulation can't see.
+
+Every episode is a headless game of a HostSession seeded with its own seed.
+It runs tick by tick as fast as the machine can go until the player dies or
+the episode runs out of ticks. After every tick, the invariants are checked:
+- a being that landed on the board is inside the QbertBoard
+- the lives only grow with the oneUp of a life bonus
+- the height of a being stays between a respawn and the top of a jump
+The episodes are split among worker processes like the balancing farm. An
+episode stops at its first failure, and the failure that happens soonest is
+reported with the command that reproduces it from its seed alone.
+
+The random player jumps whenever it lands. The adversarial player sends a move
+every tick, even in the middle of a jump, and prefers jumping off the board
+and onto the enemies.
+
+Usage:
+python -m QbertPackage.QbertSoak --episodes 2000 --player adversarial --workers 8
+python -m QbertPackage.QbertSoak --seed 1234 --episodes 1 --player adversarial
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from QbertPackage import QbertHost
+from QbertPackage import QbertGraph
+from QbertPackage import GameThread
+from QbertPackage.QbertBeing import QbertBeingClass
+
+PLAYERS = ("random", "adversarial")                     # The players that can play the episodes
+TICK_TIME = 1 / GameThread.GameThread.TICK_RATE         # The time of a tick
+RESPAWN_HEIGHT = -300                                   # The height a falling being respawns at in QbertBeingClass.update
+LOWEST_HEIGHT = RESPAWN_HEIGHT                          # The lowest height, the level respawns a being in the tick it gets there
+HIGHEST_HEIGHT = QbertBeingClass.maxHeight              # The highest height, a jump turns down at the top
+
+def chooseRandom(session, generator, graph):
+    '''
+    Chooses a random direction whenever the player landed, it may jump off the board.
+    @param session The HostSession.
+    @param generator The random generator.
+    @param graph The pyramid graph.
+    @return The direction, or None to send nothing.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    if session.player.isMoving:                                                     # Check if the player is jumping
+        return None                                                                 # Wait for it to land
+    return generator.randrange(QbertGraph.QbertGraph.DIRECTIONS)                    # Return any direction
+
+def chooseAdversarial(session, generator, graph):
+    '''
+    Chooses a direction every tick, jumping off the board or onto an enemy when it can.
+    @param session The HostSession.
+    @param generator The random generator.
+    @param graph The pyramid graph.
+    @return The direction.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    level = session.currentLevel                                                    # Get the level
+    cell = level.getLandingCell(graph, session.player)                              # Get the player's cell
+    if cell != QbertGraph.OFF_BOARD and generator.random() < 0.5:                   # Check if the player looks for trouble this tick
+        enemyCells = [level.getLandingCell(graph, enemy) for enemy in level.enemies]    # Get the enemies' cells
+        targets = [direction for direction in range(QbertGraph.QbertGraph.DIRECTIONS)    # Get the directions off the board or onto an enemy
+                   if graph.getNeighbour(cell, direction) in enemyCells or graph.getNeighbour(cell, direction) == QbertGraph.OFF_BOARD]
+        if targets:                                                                 # Check if there is trouble around
+            return generator.choice(targets)                                        # Go for it
+    return generator.randrange(QbertGraph.QbertGraph.DIRECTIONS)                    # Return any direction
+
+CHOOSERS = {"random": chooseRandom, "adversarial": chooseAdversarial}              # The direction chooser of every player
+
+def checkInvariants(session, lives, bonusMark):
+    '''
+    Checks the invariants after a tick.
+    @param session The HostSession.
+    @param lives The player's lives before the tick.
+    @param bonusMark The score of the last life bonus before the tick.
+    @return The description of the first invariant broken, or None.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    level = session.currentLevel                                                    # Get the level
+    beings = [("player", session.player)] + [("enemy %d" % index, level.enemies[index]) for index in range(len(level.enemies))]
+    for name, being in beings:                                                      # Loop through the beings
+        position = being.getPosition()                                              # Get the cell
+        if position == None:                                                        # Check if the being is not on the board yet
+            continue                                                                # It has nothing to check
+        if being.landed and not being.isFalling and not level.clearBoard.isInsideBoard(position):    # Check if it landed off the board
+            return "%s landed outside the board at (%d, %d)" % (name, position.x, position.y)
+        if being.height < LOWEST_HEIGHT or being.height > HIGHEST_HEIGHT:           # Check if it jumped or fell too far
+            return "%s height %d is out of [%d, %d] in state %s" % (name, being.height, LOWEST_HEIGHT, HIGHEST_HEIGHT, being.state.name)
+    gained = session.player.getLives() - lives                                      # Get the lives gained
+    if gained > (1 if session.progress.bonusMark != bonusMark else 0):              # Check if the lives grew without a bonus
+        return "lives went from %d to %d without a life bonus" % (lives, session.player.getLives())
+    return None                                                                     # Every invariant holds
+
+def soakEpisode(seed, player, maxTicks, startLevel):
+    '''
+    Plays one episode until the player dies, an invariant breaks or the ticks run out.
+    @param seed The episode seed, it seeds the game and the player.
+    @param player The player name.
+    @param maxTicks The most ticks of the episode.
+    @param startLevel The level the game starts at.
+    @return The ticks run and the description of the invariant broken, or None.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    random.seed(seed)                                                               # Seed the enemies
+    generator = random.Random(seed)                                                 # Seed the player
+    choose = CHOOSERS[player]                                                       # Get the player
+    session = QbertHost.HostSession(seed, startLevel)                               # Start the game
+    graph = session.currentLevel.graph                                              # Get the pyramid graph
+    for tick in range(1, maxTicks + 1):                                             # Loop through the ticks
+        direction = choose(session, generator, graph)                               # Choose a move
+        if direction != None:                                                       # Check if a move was chosen
+            session.move(direction)                                                 # Send it
+        lives, bonusMark = session.player.getLives(), session.progress.bonusMark    # Remember the lives before the tick
+        session.step(TICK_TIME)                                                     # Run the tick
+        failure = checkInvariants(session, lives, bonusMark)                        # Check the invariants
+        if failure != None:                                                         # Check if an invariant broke
+            return tick, failure                                                    # Stop at the first failure
+        if session.over:                                                            # Check if the player died
+            return tick, None                                                       # The episode ended
+    return maxTicks, None                                                           # The ticks ran out
+
+def soakEpisodes(seeds, player, maxTicks, startLevel):
+    '''
+    Plays a chunk of episodes in a worker process.
+    @param seeds The seed of every episode.
+    @param player The player name.
+    @param maxTicks The most ticks of an episode.
+    @param startLevel The level the games start at.
+    @return The ticks run and the list of seed, tick and description of every failure.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    ticks = 0                                                                       # No ticks yet
+    failures = []                                                                   # No failures yet
+    for seed in seeds:                                                              # Loop through the episodes
+        episodeTicks, failure = soakEpisode(seed, player, maxTicks, startLevel)     # Play the episode
+        ticks = ticks + episodeTicks                                                # Count its ticks
+        if failure != None:                                                         # Check if it failed
+            failures.append((seed, episodeTicks, failure))                          # Keep the failure
+    return ticks, failures                                                          # Return the chunk results
+
+def main(argv = None):
+    '''
+    Runs the soak from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    parser = argparse.ArgumentParser(prog = "QbertSoak", description = "Plays headless games with random or adversarial inputs and checks the invariants every tick.")
+    parser.add_argument("--episodes", type = int, default = 1000, help = "Episodes played, one seed each")
+    parser.add_argument("--max-ticks", type = int, default = 100000, help = "The most ticks of an episode")
+    parser.add_argument("--player", choices = PLAYERS, default = "adversarial", help = "The player of the episodes")
+    parser.add_argument("--level", type = int, default = 1, help = "The level the games start at")
+    parser.add_argument("--chunk", type = int, default = 20, help = "Episodes sent to a worker at once")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "Worker processes")
+    parser.add_argument("--seed", type = int, default = 0, help = "The seed of the first episode")
+    arguments = parser.parse_args(argv)                                                         # Parse the arguments
+    start = time.perf_counter()                                                                 # Start the timer
+    ticks = 0                                                                                   # No ticks yet
+    failures = []                                                                               # No failures yet
+    with ProcessPoolExecutor(max_workers = arguments.workers) as executor:                      # Start the workers
+        futures = [executor.submit(soakEpisodes, list(range(first, min(first + arguments.chunk, arguments.seed + arguments.episodes))),
+                                   arguments.player, arguments.max_ticks, arguments.level)
+                   for first in range(arguments.seed, arguments.seed + arguments.episodes, arguments.chunk)]     # Split the episodes in chunks
+        for future in as_completed(futures):                                                    # Loop through the chunks as they finish
+            chunkTicks, chunkFailures = future.result()                                         # Get the chunk results
+            ticks = ticks + chunkTicks                                                          # Count the ticks
+            failures.extend(chunkFailures)                                                      # Keep the failures
+    elapsed = time.perf_counter() - start                                                       # Stop the timer
+    print("%d episodes, %d ticks in %.1f s (%.0f ticks/s), %d failures" % (arguments.episodes, ticks, elapsed, ticks / max(elapsed, 1e-9), len(failures)))
+    if failures:                                                                                # Check if an invariant broke
+        failures.sort(key = lambda failure: (failure[1], failure[0]))                           # The soonest failure is the easiest to debug
+        for seed, tick, failure in failures[:10]:                                               # Loop through the first failures
+            print("seed %d tick %d: %s" % (seed, tick, failure))                                # Report it
+        seed, tick, failure = failures[0]                                                       # Get the soonest failure
+        print("Reproduce with: python -m QbertPackage.QbertSoak --seed %d --episodes 1 --max-ticks %d --player %s --level %d --workers 1"
+              % (seed, tick, arguments.player, arguments.level))
+        sys.exit(1)                                                                             # Fail the run
+
+if __name__ == "__main__":
+    main()
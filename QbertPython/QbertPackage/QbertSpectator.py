@@ -0,0 +1,520 @@
+'''
+This module streams the state of the game to the spectator displays of a
+tournament.
+
+It is enabled with the BLOBERT_SPECTATE environment variable, set to the port
+or to host:port. The simulation thread captures the board, the beings, the
+score and the lives after every tick and encodes them once as a binary delta
+against the previous tick, with a keyframe holding the whole state every
+second. A broadcaster thread writes the same bytes to every spectator, so a
+spectator costs a socket write per tick and nothing is encoded twice. A
+spectator that joins gets the last keyframe and the deltas after it, and a
+spectator that reads too slowly stops getting deltas until the next keyframe
+instead of making the cabinet buffer for it.
+
+Every frame is a header with the length of the body, the kind and the tick,
+little-endian:
+keyframe: game state, level, score, lives, board mask, beings and every being
+delta: a mask of the game fields that changed and their values, then the
+beings that changed with a mask of their fields that changed and their values
+
+Spectators only read. The module also runs viewers over loopback to measure
+the stream:
+python -m QbertPackage.QbertSpectator --connect 127.0.0.1:7790 --viewers 200 --seconds 10
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import asyncio
+import struct
+import sys
+import threading
+import time
+from QbertPackage import QbertChaser
+
+KEYFRAME = 0                            # The frame kind with the whole state
+DELTA = 1                               # The frame kind with the changes since the previous tick
+KEYFRAME_INTERVAL = 60                  # The ticks between keyframes
+MAX_BUFFER = 65536                      # The bytes queued for a spectator before it waits for a keyframe
+JUMP_SCALE = 1000                       # The jump movement is sent in thousandths of a cell
+
+HEADER = struct.Struct("<HBI")          # The body length, the kind and the tick
+GAME = struct.Struct("<BIQbIB")         # The game state, level, score, lives, board mask and number of beings
+BEING = struct.Struct("<BbbhhhB")             # The key, cell, jump movement, height and flags of a being
+FIELDS = (struct.Struct("<B"), struct.Struct("<I"), struct.Struct("<Q"), struct.Struct("<b"), struct.Struct("<I"))  # The game fields of a delta
+PARTS = ((0, 2, struct.Struct("<bb")), (2, 4, struct.Struct("<hh")), (4, 5, struct.Struct("<h")), (5, 6, struct.Struct("<B")))   # The slices of a being sent together
+BYTE = struct.Struct("<B")              # A mask or a count
+BEING_CHANGE = struct.Struct("<BB")     # The key of a being and the mask of its parts that changed
+REMOVED = 0x80                          # The being mask of a being that left
+
+FALLING = 0x10                          # The flag of a being falling behind the blocks
+CHASER = 0x20                           # The flag of an enemy that chases the player
+
+def getBeing(being, chaser):
+    '''
+    Returns the values of a being sent to the spectators.
+    @param being The QbertBeing.
+    @param chaser True if the being chases the player.
+    @return The cell, the jump movement in thousandths of a cell, the height and the flags.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    position = being.getPosition()                                                      # Get the cell
+    jump = being.getJumpMovement()                                                      # Get the jump movement
+    jumpX = max(-32768, min(32767, int(round(jump.x * JUMP_SCALE))))                    # Scale it, a long fall is clamped
+    jumpY = max(-32768, min(32767, int(round(jump.y * JUMP_SCALE))))
+    flags = being.state.value | (FALLING if being.isFalling else 0) | (CHASER if chaser else 0)     # Pack the animation state and the flags
+    return (int(position.x), int(position.y), jumpX, jumpY, int(being.height), flags)
+
+def captureState(game):
+    '''
+    Captures the state sent to the spectators, called in the simulation thread.
+    @param game The game.
+    @return The game state, level, score, lives, board mask and the beings by key.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    level = game.currentLevel                                                           # Get the current level
+    if level == None:                                                                   # Check if a game was started
+        return (game.gameState.value, game.level, 0, 0, 0, {})                          # There is no board yet
+    beings = {}                                                                         # Declare the beings
+    if level.player.getPosition() != None:                                              # Check if the player is on the board
+        beings[0] = getBeing(level.player, False)                                       # Add the player
+    for enemyCounter in range(len(level.enemies)):                                      # Loop through the enemies
+        enemy = level.enemies[enemyCounter]                                             # Get the enemy
+        if enemy.canBeDrawn():                                                          # Check if the enemy is on the board
+            beings[enemyCounter + 1] = getBeing(enemy, isinstance(enemy, QbertChaser.QbertChaser))   # Add the enemy
+    return (game.gameState.value, game.level, level.getCurrentScore(), level.playersLives(), level.getBoardMask(), beings)
+
+def encodeKeyframe(tick, state):
+    '''
+    Encodes the whole state.
+    @param tick The tick.
+    @param state The state captured.
+    @return The frame bytes.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    beings = state[5]                                                                   # Get the beings
+    body = [GAME.pack(state[0], state[1], state[2], state[3], state[4], len(beings))]   # Add the game fields
+    for key, values in beings.items():                                                  # Loop through the beings
+        body.append(BEING.pack(key, *values))                                           # Add the being
+    body = b"".join(body)                                                               # Join the body
+    return HEADER.pack(len(body), KEYFRAME, tick) + body                                # Add the header
+
+def encodeDelta(tick, previous, state):
+    '''
+    Encodes the changes between two states.
+    @param tick The tick.
+    @param previous The state of the previous tick.
+    @param state The state captured.
+    @return The frame bytes.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    mask = 0                                                                            # No game fields changed yet
+    body = [b""]                                                                        # Keep a place for the mask
+    for index in range(len(FIELDS)):                                                    # Loop through the game fields
+        if state[index] != previous[index]:                                             # Check if the field changed
+            mask = mask | (1 << index)                                                  # Flag it
+            body.append(FIELDS[index].pack(state[index]))                               # Add its value
+    body[0] = BYTE.pack(mask)                                                           # Write the mask
+    changes = []                                                                        # Declare the beings that changed
+    beings, previousBeings = state[5], previous[5]                                      # Get the beings
+    for key, values in beings.items():                                                  # Loop through the beings
+        old = previousBeings.get(key)                                                   # Get the being in the previous tick
+        if old == values:                                                               # Check if the being didn't change
+            continue                                                                    # Skip it
+        partMask = 0                                                                    # No parts changed yet
+        parts = []                                                                      # Declare the parts
+        for index in range(len(PARTS)):                                                 # Loop through the parts
+            start, end, packer = PARTS[index]                                           # Get the slice of the part
+            if old == None or old[start:end] != values[start:end]:                      # Check if the part changed or the being is new
+                partMask = partMask | (1 << index)                                      # Flag it
+                parts.append(packer.pack(*values[start:end]))                           # Add its values
+        changes.append(BEING_CHANGE.pack(key, partMask) + b"".join(parts))              # Add the being
+    for key in previousBeings:                                                          # Loop through the beings of the previous tick
+        if key not in beings:                                                           # Check if the being left
+            changes.append(BEING_CHANGE.pack(key, REMOVED))                             # Remove it
+    body.append(BYTE.pack(len(changes)))                                                # Add the number of beings that changed
+    body.extend(changes)                                                                # Add them
+    body = b"".join(body)                                                               # Join the body
+    return HEADER.pack(len(body), DELTA, tick) + body                                   # Add the header
+
+class SpectatorDecoder(object):
+    '''
+    Variables:
+    buffer: The bytes received that don't make a whole frame yet
+    tick: The tick of the last frame applied, None before the first keyframe
+    gameState: The game state value
+    level: The level number
+    score: The current score
+    lives: The player's lives
+    board: The board mask
+    beings: The cell, jump movement, height and flags of every being by key
+    keyframes: The number of keyframes applied
+    deltas: The number of deltas applied
+    '''
+
+    def __init__(self):
+        '''
+        Creates a new SpectatorDecoder that waits for a keyframe.
+        @param self The current object
+        @return A new instance of the SpectatorDecoder
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.buffer = b""                           # Nothing received yet
+        self.tick = None                            # No keyframe yet
+        self.gameState = 0                          # No state yet
+        self.level = 0                              # No level yet
+        self.score = 0                              # No score yet
+        self.lives = 0                              # No lives yet
+        self.board = 0                              # No blocks on yet
+        self.beings = {}                            # No beings yet
+        self.keyframes = 0                          # No keyframes yet
+        self.deltas = 0                             # No deltas yet
+
+    def feed(self, data):
+        '''
+        Applies the frames in the bytes received.
+        @param self The current object
+        @param data The bytes received.
+        @return The number of frames applied.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        buffer = self.buffer + data if self.buffer else data                            # Join the bytes left from before
+        offset = 0                                                                      # Start at the first frame
+        applied = 0                                                                     # No frames yet
+        while len(buffer) - offset >= HEADER.size:                                      # Loop while there is a header
+            length, kind, tick = HEADER.unpack_from(buffer, offset)                     # Read the header
+            end = offset + HEADER.size + length                                         # Get the end of the frame
+            if end > len(buffer):                                                       # Check if the body didn't arrive yet
+                break                                                                   # Wait for it
+            self.apply(kind, tick, memoryview(buffer)[offset + HEADER.size:end])        # Apply the frame
+            offset = end                                                                # Go to the next frame
+            applied = applied + 1                                                       # Count the frame
+        self.buffer = buffer[offset:]                                                   # Keep the bytes left
+        return applied                                                                  # Return the frames applied
+
+    def apply(self, kind, tick, body):
+        '''
+        Applies a frame.
+        @param self The current object
+        @param kind KEYFRAME or DELTA.
+        @param tick The tick of the frame.
+        @param body The body of the frame.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if kind == KEYFRAME:                                                            # Check if the frame has the whole state
+            self.gameState, self.level, self.score, self.lives, self.board, count = GAME.unpack_from(body, 0)   # Read the game fields
+            self.beings = {}                                                            # Forget the beings
+            for offset in range(GAME.size, GAME.size + count * BEING.size, BEING.size): # Loop through the beings
+                values = BEING.unpack_from(body, offset)                                # Read the being
+                self.beings[values[0]] = values[1:]                                     # Store it
+            self.keyframes = self.keyframes + 1                                         # Count the keyframe
+        elif self.tick != None:                                                         # Check if the deltas have a state to change
+            mask = body[0]                                                              # Read the game fields that changed
+            offset = 1                                                                  # Start after the mask
+            fields = [self.gameState, self.level, self.score, self.lives, self.board]   # Get the game fields
+            for index in range(len(FIELDS)):                                            # Loop through the game fields
+                if mask & (1 << index):                                                 # Check if the field changed
+                    fields[index] = FIELDS[index].unpack_from(body, offset)[0]          # Read it
+                    offset = offset + FIELDS[index].size                                # Go to the next one
+            self.gameState, self.level, self.score, self.lives, self.board = fields     # Store the game fields
+            count = body[offset]                                                        # Read the number of beings that changed
+            offset = offset + 1                                                         # Go to the first one
+            for changeCounter in range(count):                                          # Loop through the beings that changed
+                key, partMask = BEING_CHANGE.unpack_from(body, offset)                  # Read the being and its parts
+                offset = offset + BEING_CHANGE.size                                     # Go to its parts
+                if partMask == REMOVED:                                                 # Check if the being left
+                    self.beings.pop(key, None)                                          # Remove it
+                    continue
+                values = list(self.beings.get(key, (0,) * 6))                           # Get the being, a new one has every part
+                for index in range(len(PARTS)):                                         # Loop through the parts
+                    if partMask & (1 << index):                                         # Check if the part changed
+                        start, end, packer = PARTS[index]                               # Get its slice
+                        values[start:end] = packer.unpack_from(body, offset)            # Read it
+                        offset = offset + packer.size                                   # Go to the next one
+                self.beings[key] = tuple(values)                                        # Store the being
+            self.deltas = self.deltas + 1                                               # Count the delta
+        else:
+            return                                                                      # Wait for a keyframe
+        self.tick = tick                                                                # Remember the tick
+
+class SpectatorServer(object):
+    '''
+    Variables:
+    host: The host to listen on
+    port: The port to listen on
+    keyframeInterval: The ticks between keyframes
+    previous: The state of the previous tick, None when the next frame is a keyframe
+    sinceKeyframe: The ticks since the last keyframe
+    history: The last keyframe and the deltas after it, sent to the spectators that join
+    spectators: True for every spectator's writer that gets the deltas, False while it waits for a keyframe
+    framesSent: The frames written to the spectators
+    bytesSent: The bytes written to the spectators
+    resyncs: The times a slow spectator had to wait for a keyframe
+    loop: The event loop of the broadcaster thread
+    server: The asyncio server
+    ready: The event set when the server is listening
+    thread: The broadcaster thread
+    '''
+
+    def __init__(self, host, port, keyframeInterval = KEYFRAME_INTERVAL):
+        '''
+        Creates a new SpectatorServer and starts its thread.
+        @param self The current object
+        @param host The host to listen on.
+        @param port The port to listen on.
+        @param keyframeInterval The ticks between keyframes.
+        @return A new instance of the SpectatorServer
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.host = host                                                    # Set the host
+        self.port = port                                                    # Set the port
+        self.keyframeInterval = keyframeInterval                            # Set the keyframe interval
+        self.previous = None                                                # The first frame is a keyframe
+        self.sinceKeyframe = 0                                              # No ticks yet
+        self.history = []                                                   # No frames yet
+        self.spectators = {}                                                # No spectators yet
+        self.framesSent = 0                                                 # No frames sent yet
+        self.bytesSent = 0                                                  # No bytes sent yet
+        self.resyncs = 0                                                    # No slow spectators yet
+        self.server = None                                                  # The server is not started
+        self.loop = asyncio.new_event_loop()                                # Create the event loop
+        self.ready = threading.Event()                                      # Create the event that tells the server is listening
+        self.thread = threading.Thread(target = self.run, name = "SpectatorServer", daemon = True)   # Create the thread
+        self.thread.start()                                                 # Start the thread
+        self.ready.wait()                                                   # Wait for the server
+
+    def run(self):
+        '''
+        Runs the event loop of the broadcaster thread.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        asyncio.set_event_loop(self.loop)                                                   # Use the loop in the thread
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handleSpectator, self.host, self.port))   # Start listening
+            print("Spectators: listening on %s:%d" % (self.host, self.port), file = sys.stderr)
+        except OSError as error:
+            print("Spectators: can't listen on %s:%d: %s" % (self.host, self.port, error), file = sys.stderr)    # The game runs without spectators
+        self.ready.set()                                                                    # Let the game continue
+        if self.server != None:                                                             # Check if the server is listening
+            self.loop.run_forever()                                                         # Broadcast until closed
+            self.server.close()                                                             # Stop listening
+            self.loop.run_until_complete(self.server.wait_closed())                         # Wait for the server to stop
+        self.loop.close()                                                                   # Free the loop
+
+    def publish(self, game, tick):
+        '''
+        Encodes the state of a tick and hands it to the broadcaster, called in the simulation thread.
+        @param self The current object
+        @param game The game.
+        @param tick The tick.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.server == None or not self.spectators:                                      # Check if nobody is watching
+            self.previous = None                                                            # The next spectator starts with a keyframe
+            return                                                                          # Encode nothing
+        state = captureState(game)                                                          # Capture the state
+        keyframe = self.previous == None or self.sinceKeyframe >= self.keyframeInterval     # Check if a keyframe is due
+        if keyframe:
+            frame = encodeKeyframe(tick, state)                                             # Encode the whole state
+            self.sinceKeyframe = 0                                                          # Restart the interval
+        else:
+            frame = encodeDelta(tick, self.previous, state)                                 # Encode the changes
+        self.sinceKeyframe = self.sinceKeyframe + 1                                         # Count the tick
+        self.previous = state                                                               # Remember the state
+        self.loop.call_soon_threadsafe(self.broadcast, frame, keyframe)                     # Hand the frame to the broadcaster
+
+    def broadcast(self, frame, keyframe):
+        '''
+        Writes a frame to every spectator, called in the broadcaster thread.
+        @param self The current object
+        @param frame The frame bytes.
+        @param keyframe True if the frame is a keyframe.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if keyframe:                                                                        # Check if the frame has the whole state
+            self.history = [frame]                                                          # The older frames are not needed to join
+        elif self.history:                                                                  # Check if there is a keyframe to join from
+            self.history.append(frame)                                                      # Keep the delta for the next spectator
+        for writer, synced in self.spectators.items():                                      # Loop through the spectators
+            if not synced and not keyframe:                                                 # Check if the spectator waits for a keyframe
+                continue                                                                    # The delta is useless to it
+            if writer.transport.get_write_buffer_size() > MAX_BUFFER:                       # Check if the spectator reads too slowly
+                if synced:                                                                  # Check if it was getting the deltas
+                    self.spectators[writer] = False                                         # Wait for a keyframe
+                    self.resyncs = self.resyncs + 1                                         # Count the resync
+                continue                                                                    # Skip the frame
+            writer.write(frame)                                                             # Send the frame
+            self.spectators[writer] = True                                                  # The spectator has the state
+            self.framesSent = self.framesSent + 1                                           # Count the frame
+            self.bytesSent = self.bytesSent + len(frame)                                    # Count the bytes
+
+    async def handleSpectator(self, reader, writer):
+        '''
+        Sends the last keyframe and the deltas after it to a spectator, and keeps it until it disconnects.
+        @param self The current object
+        @param reader The stream reader.
+        @param writer The stream writer.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not self.spectators:                                                             # Check if nobody was watching
+            self.history = []                                                               # Nothing was encoded since, the next frame is a keyframe
+        elif self.history:                                                                  # Check if there is a keyframe to join from
+            writer.write(b"".join(self.history))                                            # Catch up with the game
+        self.spectators[writer] = bool(self.history)                                        # Get the deltas, or wait for the next keyframe
+        try:
+            while await reader.read(4096):                                                  # Loop until the spectator disconnects, it only reads
+                pass
+        except ConnectionError:
+            pass                                                                            # The spectator went away
+        finally:
+            del self.spectators[writer]                                                     # Forget the spectator
+            writer.close()                                                                  # Close the connection
+
+    def getReport(self):
+        '''
+        Returns a line about the spectators and what they were sent.
+        @param self The current object
+        @return The report text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return "Spectators: %d watching, %d frames and %d bytes sent, %d resyncs" % (len(self.spectators), self.framesSent, self.bytesSent, self.resyncs)
+
+    def close(self):
+        '''
+        Disconnects the spectators and stops the broadcaster thread.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.server != None and self.thread.is_alive():                                  # Check if the server is running
+            self.loop.call_soon_threadsafe(self.stop)                                       # Stop it in its thread
+        self.thread.join()                                                                  # Wait for the thread
+
+    def stop(self):
+        '''
+        Closes every spectator and stops the event loop, called in the broadcaster thread.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for writer in list(self.spectators):                                                # Loop through the spectators
+            writer.close()                                                                  # Disconnect it
+        self.loop.stop()                                                                    # Stop the loop
+
+async def watch(host, port, decoder, counts, seconds):
+    '''
+    Decodes the stream of a viewer for some time.
+    @param host The cabinet host.
+    @param port The spectator port.
+    @param decoder The SpectatorDecoder.
+    @param counts The list with the bytes received, added to.
+    @param seconds The time watched.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    reader, writer = await asyncio.open_connection(host, port)                      # Connect to the cabinet
+    end = time.perf_counter() + seconds                                             # Get the end
+    try:
+        while time.perf_counter() < end:                                            # Loop until the end
+            try:
+                data = await asyncio.wait_for(reader.read(65536), end - time.perf_counter())    # Read what arrived
+            except asyncio.TimeoutError:
+                break                                                               # Time is up
+            if not data:                                                            # Check if the cabinet closed
+                break                                                               # Stop watching
+            counts[0] = counts[0] + len(data)                                       # Count the bytes
+            decoder.feed(data)                                                      # Apply the frames
+    finally:
+        writer.close()                                                              # Disconnect
+
+async def watchAll(host, port, viewers, seconds):
+    '''
+    Runs viewers over loopback and reports the stream.
+    @param host The cabinet host.
+    @param port The spectator port.
+    @param viewers The number of viewers.
+    @param seconds The time watched.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    decoders = [SpectatorDecoder() for viewerCounter in range(viewers)]             # Create a decoder per viewer
+    counts = [0]                                                                    # No bytes yet
+    start = time.process_time()                                                     # Start the CPU clock
+    await asyncio.gather(*[watch(host, port, decoder, counts, seconds) for decoder in decoders])   # Watch
+    cpu = time.process_time() - start                                               # Get the CPU time of the viewers
+    first = decoders[0]                                                             # Get the first viewer
+    agreeing = sum(1 for decoder in decoders if decoder.tick == first.tick and decoder.beings == first.beings and decoder.board == first.board)
+    print("%d viewers, %.1f kB/s per viewer, %d keyframes and %d deltas each, %.3f ms of CPU per viewer per second"
+          % (viewers, counts[0] / viewers / seconds / 1000, first.keyframes, first.deltas, cpu * 1000 / viewers / seconds))
+    print("tick %s level %d score %d lives %d board %06x beings %s, %d viewers agree"
+          % (first.tick, first.level, first.score, first.lives, first.board, sorted(first.beings), agreeing))
+
+def main(argv = None):
+    '''
+    Runs viewers from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    parser = argparse.ArgumentParser(prog = "QbertSpectator", description = "Watches the spectator stream of a cabinet.")
+    parser.add_argument("--connect", default = "127.0.0.1:7790", help = "The cabinet as host:port")
+    parser.add_argument("--viewers", type = int, default = 1, help = "Viewers connected at once")
+    parser.add_argument("--seconds", type = float, default = 10, help = "The time watched")
+    arguments = parser.parse_args(argv)                                             # Parse the arguments
+    host, port = arguments.connect.rsplit(":", 1)                                   # Split the address
+    asyncio.run(watchAll(host, int(port), arguments.viewers, arguments.seconds))    # Watch
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+'''
+This module has the sprites of the gameplay screen.
+
+The blocks, the beings and the HUD texts are kept in a single
+pygame.sprite.LayeredDirty group. Every sprite has an explicit depth key used
+as its layer, so the group draws everything sorted in one pass, and only the
+sprites marked dirty and the areas they left are drawn again.
+
+The depth of a being falling behind the pyramid is its height on the screen,
+the blocks and the beings standing on them come after, sorted the same way,
+and the HUD is always on top.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import pygame
+from QbertPackage import QbertView
+
+BEHIND = 0          # The depth of the beings falling behind the pyramid
+BLOCKS = 10000      # The depth of the blocks
+FRONT = 20000       # The depth of the beings in front of the blocks
+HUD = 30000         # The depth of the HUD
+
+def getDepth(band, y):
+    '''
+    Returns the depth key of something drawn at a height of the screen.
+    @param band The depth of the group it belongs to.
+    @param y The top of the sprite in design pixels.
+    @return The depth key, higher is drawn later.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return band + min(max(int(y), 0), BLOCKS - 1)       # Sort by height inside the group
+
+class BlockSprite(pygame.sprite.DirtySprite):
+    '''
+    Variables:
+    images: The block image when it is off and when it is on
+    active: True if the block is on
+    '''
+
+    def __init__(self, block):
+        '''
+        Creates a new BlockSprite drawing both states of a block once.
+        @param self The current object
+        @param block The BoardBlock.
+        @return A new instance of the BlockSprite
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pygame.sprite.DirtySprite.__init__(self)                        # Create the sprite
+        self.images = (block.render(False), block.render(True))         # Draw the block off and on
+        self.image = self.images[0]                                     # Start off
+        self.rect = block.getBounds()                                   # Set the place of the block
+        self.active = False                                             # The block is off
+        self._layer = getDepth(BLOCKS, block.location.y)                # Sort it by its row
+
+    def setActive(self, active):
+        '''
+        Turns the block on or off.
+        @param self The current object
+        @param active True if the block is on.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if active != self.active:                       # Check if the block changed
+            self.active = active                        # Set the state
+            self.image = self.images[int(active)]       # Show the image of the state
+            self.dirty = 1                              # Draw it again
+
+class BeingSprite(pygame.sprite.DirtySprite):
+    '''
+    A being's current frame, moved every time the being moves.
+    '''
+
+    def __init__(self):
+        '''
+        Creates a new BeingSprite.
+        @param self The current object
+        @return A new instance of the BeingSprite
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pygame.sprite.DirtySprite.__init__(self)        # Create the sprite
+        self.image = None                               # No frame yet
+        self.rect = pygame.Rect(0, 0, 0, 0)             # No place yet
+
+    def setFrame(self, frame, position):
+        '''
+        Shows a frame at a position.
+        @param self The current object
+        @param frame The frame surface.
+        @param position The position in design pixels.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        topLeft = QbertView.scalePoint(position)                            # Get the position in render pixels
+        if frame is not self.image or topLeft != self.rect.topleft:         # Check if something changed
+            self.image = frame                                              # Set the frame
+            self.rect = frame.get_rect(topleft = topLeft)                   # Set the place
+            self.dirty = 1                                                  # Draw it again
+
+class TextSprite(pygame.sprite.DirtySprite):
+    '''
+    Variables:
+    font: The BitmapFont
+    text: The text shown
+    '''
+
+    def __init__(self, font, position):
+        '''
+        Creates a new TextSprite.
+        @param self The current object
+        @param font The BitmapFont.
+        @param position The top left of the text in design pixels.
+        @return A new instance of the TextSprite
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pygame.sprite.DirtySprite.__init__(self)                            # Create the sprite
+        self.font = font                                                    # Set the font
+        self.text = None                                                    # No text yet
+        self.image = pygame.Surface((0, 0), pygame.SRCALPHA)                # Nothing to show yet
+        self.rect = pygame.Rect(QbertView.scalePoint(position), (0, 0))     # Set the place
+        self._layer = HUD                                                   # Draw it on top
+
+    def setText(self, text):
+        '''
+        Shows a text, None hides the sprite.
+        @param self The current object
+        @param text The text.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if text != self.text:                                               # Check if the text changed
+            self.text = text                                                # Set the text
+            self.visible = int(text != None)                                # Hide it if there is no text
+            if text != None:                                                # Check if there is something to show
+                self.image = self.font.render(text)                         # Render the text once
+                self.rect = self.image.get_rect(topleft = self.rect.topleft)    # Resize the place
+            self.dirty = 1                                                  # Draw it again
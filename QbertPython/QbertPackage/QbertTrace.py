@@ -0,0 +1,262 @@
+'''
+This module records timed spans of every frame and subsystem in the Chrome
+trace-event format, to see which phase of a bad frame took the time.
+
+It is enabled with the BLOBERT_TRACE environment variable, set to the number
+of spans kept. The spans go to a ring buffer, so only the last moments are
+kept and nothing grows while the game runs. The buffer is written as a JSON
+file that chrome://tracing or Perfetto open when F11 is pressed, when the
+process gets SIGUSR2, and when a frame or a tick takes longer than the budget
+set by BLOBERT_TRACE_BUDGET in milliseconds. The files are written by a
+background thread in the directory set by BLOBERT_TRACE_DIR, and a slow
+stretch writes one file per second at most.
+
+The spans are written around the code with:
+with QbertTrace.span("updateEnemies"):
+    ...
+When the tracing is off, span returns a shared span that does nothing.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import collections
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import pygame
+
+HOTKEY = pygame.K_F11           # The key that writes the buffer
+DUMP_COOLDOWN = 1.0             # The shortest time between two files written for slow frames
+
+recorder = None                 # The TraceRecorder, None when the tracing is off
+
+class NullSpan(object):
+    '''
+    The span used when the tracing is off.
+    '''
+
+    def __enter__(self):
+        '''
+        Does nothing.
+        @param self The current object
+        @return The span.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return self                 # Return the span
+
+    def __exit__(self, kind, error, traceback):
+        '''
+        Does nothing.
+        @param self The current object
+        @param kind The type of the exception raised, if any.
+        @param error The exception raised, if any.
+        @param traceback The traceback of the exception, if any.
+        @return False so the exceptions are raised.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        return False                # Raise the exceptions
+
+NULL_SPAN = NullSpan()          # The span shared by all the code when the tracing is off
+
+class Span(object):
+    '''
+    Variables:
+    recorder: The TraceRecorder
+    name: The name shown in the trace viewer
+    category: The category of the span
+    budget: The longest the span should take in seconds, None if it has no budget
+    start: The time the span started in nanoseconds
+    '''
+
+    def __init__(self, recorder, name, category, budget):
+        '''
+        Creates a new Span.
+        @param self The current object
+        @param recorder The TraceRecorder.
+        @param name The name shown in the trace viewer.
+        @param category The category of the span.
+        @param budget The longest the span should take in seconds, None if it has no budget.
+        @return A new instance of the Span
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.recorder = recorder            # Set the recorder
+        self.name = name                    # Set the name
+        self.category = category            # Set the category
+        self.budget = budget                # Set the budget
+        self.start = 0                      # Not started yet
+
+    def __enter__(self):
+        '''
+        Starts the span.
+        @param self The current object
+        @return The span.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.start = time.perf_counter_ns()     # Start the span
+        return self                             # Return the span
+
+    def __exit__(self, kind, error, traceback):
+        '''
+        Ends the span and records it.
+        @param self The current object
+        @param kind The type of the exception raised, if any.
+        @param error The exception raised, if any.
+        @param traceback The traceback of the exception, if any.
+        @return False so the exceptions are raised.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        duration = time.perf_counter_ns() - self.start                                          # Get the duration
+        self.recorder.record(self.name, self.category, self.start, duration)                   # Record the span
+        if self.budget != None and duration > self.budget * 1000000000:                         # Check if the span went over its budget
+            self.recorder.dump("%s-over-budget" % self.name, True)                              # Write the buffer
+        return False                                                                            # Raise the exceptions
+
+class TraceRecorder(object):
+    '''
+    Variables:
+    events: The ring buffer with the name, category, start, duration and thread of the last spans
+    budget: The longest a frame or a tick should take in seconds
+    directory: The directory of the files
+    threadNames: The name of every thread that recorded a span
+    lastDump: The time the last file for a slow frame was written
+    '''
+
+    def __init__(self, capacity, budget, directory = "traces"):
+        '''
+        Creates a new TraceRecorder.
+        @param self The current object
+        @param capacity The number of spans kept.
+        @param budget The longest a frame or a tick should take in seconds.
+        @param directory The directory of the files.
+        @return A new instance of the TraceRecorder
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.events = collections.deque(maxlen = capacity)  # Create the ring buffer, appending is safe from any thread
+        self.budget = budget                                # Set the budget
+        self.directory = directory                          # Set the directory
+        self.threadNames = {}                               # No threads yet
+        self.lastDump = 0                                   # No files yet
+
+    def listen(self, signalNumber = getattr(signal, "SIGUSR2", None)):
+        '''
+        Writes the buffer when the process gets a signal, called in the main thread.
+        @param self The current object
+        @param signalNumber The signal, SIGUSR2 by default.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if signalNumber != None:                                                        # Check if the platform has the signal
+            signal.signal(signalNumber, lambda number, frame: self.dump("requested"))   # Write the buffer on the signal
+
+    def record(self, name, category, start, duration):
+        '''
+        Records a span that ended.
+        @param self The current object
+        @param name The name of the span.
+        @param category The category of the span.
+        @param start The time the span started in nanoseconds.
+        @param duration The duration in nanoseconds.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        thread = threading.get_ident()                                      # Get the thread
+        if thread not in self.threadNames:                                  # Check if the thread is new
+            self.threadNames[thread] = threading.current_thread().name      # Remember its name
+        self.events.append((name, category, start, duration, thread))       # Add the span, the oldest is dropped
+
+    def dump(self, reason, throttled = False):
+        '''
+        Writes the buffer as a trace-event file in a background thread.
+        @param self The current object
+        @param reason The reason written in the file name.
+        @param throttled True to skip the file if another one was written less than a cooldown ago.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        now = time.perf_counter()                                                   # Get the time
+        if throttled and now - self.lastDump < DUMP_COOLDOWN:                       # Check if a file was just written
+            return                                                                  # The buffer overlaps it
+        self.lastDump = now                                                         # Remember the file
+        path = os.path.join(self.directory, "%s-%s.json" % (time.strftime("%Y%m%d-%H%M%S"), reason))    # Get the path
+        threading.Thread(target = self.write, args = (list(self.events), dict(self.threadNames), path), name = "TraceWriter", daemon = True).start()
+
+    def write(self, events, threadNames, path):
+        '''
+        Writes spans as a trace-event file, called in a background thread.
+        @param self The current object
+        @param events The spans.
+        @param threadNames The name of every thread.
+        @param path The file path.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        pid = os.getpid()                                                                       # Get the process
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}} for thread, name in threadNames.items()]   # Name the threads
+        for name, category, start, duration, thread in events:                                 # Loop through the spans
+            trace.append({"name": name, "cat": category, "ph": "X", "ts": start / 1000, "dur": duration / 1000, "pid": pid, "tid": thread})    # Add a complete event in microseconds
+        os.makedirs(self.directory, exist_ok = True)                                            # Create the directory
+        with open(path, "w") as file:                                                           # Open the file
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)                    # Write the trace
+        print("Trace: wrote %s" % path, file = sys.stderr)
+
+def start(capacity, budget, directory = "traces"):
+    '''
+    Starts recording the spans.
+    @param capacity The number of spans kept.
+    @param budget The longest a frame or a tick should take in seconds.
+    @param directory The directory of the files.
+    @return The TraceRecorder.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    global recorder
+    recorder = TraceRecorder(capacity, budget, directory)   # Create the recorder
+    return recorder                                         # Return it
+
+def span(name, category = "game", budgeted = False):
+    '''
+    Returns a span to time a block of code with the with statement.
+    @param name The name shown in the trace viewer.
+    @param category The category of the span.
+    @param budgeted True if the span is a whole frame or tick that writes the buffer when it goes over the budget.
+    @return The Span, or the shared NULL_SPAN when the tracing is off.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    if recorder == None:                                                        # Check if the tracing is off
+        return NULL_SPAN                                                        # Do nothing
+    return Span(recorder, name, category, recorder.budget if budgeted else None)   # Time the block
@@ -0,0 +1,124 @@
+'''
+This module holds the internal render resolution of the game.
+
+Every layout constant in the game is in 1920x1080 design pixels. The game can
+render at a smaller internal resolution, the design positions and sizes are
+scaled when drawing and the images are scaled once when they are loaded. The
+display is opened with pygame.SCALED so the whole frame is scaled to the output
+once, by the renderer, when it is presented. The assets are found next to the
+modules, so the game can be started from any directory.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import os
+import pygame
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))  # The directory of the game assets
+DESIGN_SIZE = (1920, 1080)      # The resolution the layout is designed for
+renderSize = DESIGN_SIZE        # The internal render resolution
+scale = 1.0                     # The scale from design pixels to render pixels
+displayFullscreen = True        # True if the display fills the screen
+displayScaled = False           # True if the open display scales the frame to the output
+
+def setRenderSize(size):
+    '''
+    Sets the internal render resolution, it should keep the 16:9 aspect ratio.
+    @param size The width and height.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    global renderSize, scale
+    renderSize = (int(size[0]), int(size[1]))                                                   # Set the resolution
+    scale = min(renderSize[0] / DESIGN_SIZE[0], renderSize[1] / DESIGN_SIZE[1])                 # Fit the design in the resolution
+
+def parseRenderSize(text):
+    '''
+    Parses a resolution written as WIDTHxHEIGHT.
+    @param text The resolution text.
+    @return The width and height.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    width, height = text.lower().split("x")         # Split the width and height
+    return (int(width), int(height))                # Return the size
+
+def openDisplay(fullscreen = None):
+    '''
+    Opens the display at the internal render resolution, it can be opened again when the resolution changes.
+    @param fullscreen True to fill the screen, the last choice by default.
+    @return The display surface.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    global displayFullscreen, displayScaled
+    if fullscreen != None:                                          # Check if the choice was given
+        displayFullscreen = fullscreen                              # Remember it
+    flags = pygame.FULLSCREEN if displayFullscreen else 0           # Fill the screen if asked
+    if renderSize != DESIGN_SIZE:                                   # Check if the frame has to be scaled to the output
+        flags = flags | pygame.SCALED                               # Let the renderer scale the frame when it is presented
+    scaled = renderSize != DESIGN_SIZE                              # Check if the new display scales the frame
+    if pygame.display.get_surface() != None and scaled != displayScaled:    # Check if the scaling of the open display changes
+        caption = pygame.display.get_caption()                      # Remember the window name
+        pygame.display.quit()                                       # SDL can't add or remove the scaling renderer of an open window
+        pygame.display.init()                                       # Start the display again
+        pygame.display.set_caption(*caption)                        # Set the window name again
+    displayScaled = scaled                                          # Remember the scaling
+    return pygame.display.set_mode(renderSize, flags)               # Open the display
+
+def getAssetPath(fileName):
+    '''
+    Returns the path of a game asset, the assets are next to the package modules wherever the game is started from.
+    @param fileName The asset file name.
+    @return The asset path.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return os.path.join(PACKAGE_DIRECTORY, fileName)                # Join the package directory
+
+def scaleValue(value):
+    '''
+    Converts a length in design pixels to render pixels.
+    @param value The length in design pixels.
+    @return The length in render pixels.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return round(value * scale)                                     # Scale the value
+
+def scalePoint(point):
+    '''
+    Converts a point or a size in design pixels to render pixels.
+    @param point The x and y in design pixels.
+    @return The x and y in render pixels.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    return (round(point[0] * scale), round(point[1] * scale))       # Scale both coordinates
+
+def scaleImage(image):
+    '''
+    Scales an image made for the design resolution to the render resolution.
+    @param image The image surface.
+    @return The scaled surface, the same surface if there is nothing to scale.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    if scale == 1.0:                                                                    # Check if the image has to be scaled
+        return image                                                                    # Use it as it is
+    return pygame.transform.smoothscale(image, scalePoint(image.get_size()))            # Scale it once
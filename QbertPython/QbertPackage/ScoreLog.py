@@ -0,0 +1,199 @@
+'''
+This class represents the high score file as an append-only record log.
+
+Every record is 3 ASCII initials followed by a big endian 4 byte score, the same
+format the game always used, so old score files keep working. New scores are
+appended with a single write and the log is compacted into a temporary file that
+atomically replaces the old one. A separate lock file, which is never replaced,
+lets several game instances share the same score file.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import os
+import struct
+from QbertPackage import PlayerRecord
+try:
+    import fcntl                # The POSIX file locks
+except ImportError:
+    fcntl = None
+    import msvcrt               # The Windows file locks
+
+RECORD = struct.Struct(">3si")  # The record format: 3 initials and a big endian score
+
+class ScoreLock(object):
+    '''
+    Variables:
+    fileName: The lock file name
+    exclusive: True if the lock is exclusive
+    file: The open lock file
+    '''
+
+    def __init__(self, fileName, exclusive):
+        '''
+        Creates a new ScoreLock, the lock is taken when used in a with statement.
+        @param self The current object
+        @param fileName The lock file name.
+        @param exclusive True for a write lock, False for a read lock.
+        @return A new instance of the ScoreLock
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.fileName = fileName        # Set the file name
+        self.exclusive = exclusive      # Set the lock type
+        self.file = None                # The file is not open yet
+
+    def __enter__(self):
+        '''
+        Takes the lock, waiting for other instances to release it.
+        @param self The current object
+        @return The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.file = open(self.fileName, "a+b")                                              # Open or create the lock file
+        if fcntl != None:                                                                   # Check if the POSIX locks are available
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)    # Lock the file
+        else:
+            self.file.seek(0)                                                               # Lock always the first byte
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)                           # Lock the file, Windows only has exclusive locks
+        return self                                                                         # Return the lock
+
+    def __exit__(self, exceptionType, exception, traceback):
+        '''
+        Releases the lock.
+        @param self The current object
+        @param exceptionType The exception type, if any.
+        @param exception The exception, if any.
+        @param traceback The traceback, if any.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if fcntl != None:                                                   # Check if the POSIX locks are available
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)                  # Unlock the file
+        else:
+            self.file.seek(0)                                               # Unlock the first byte
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)          # Unlock the file
+        self.file.close()                                                   # Close the lock file
+        self.file = None                                                    # Forget the file
+
+class ScoreLog(object):
+    '''
+    Variables:
+    COMPACT_FACTOR: The times the kept records the log can grow before it is compacted
+    fileName: The score file name
+    lockName: The lock file name
+    keep: The number of records kept when compacting
+    '''
+    COMPACT_FACTOR = 8          # The times the kept records the log can grow before it is compacted
+
+    def __init__(self, fileName, keep):
+        '''
+        Creates a new ScoreLog.
+        @param self The current object
+        @param fileName The score file name.
+        @param keep The number of records kept when compacting.
+        @return A new instance of the ScoreLog
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.fileName = fileName                    # Set the file name
+        self.lockName = fileName + ".lock"          # Set the lock file name
+        self.keep = keep                            # Set the records to keep
+
+    def readRecords(self):
+        '''
+        Reads all the complete records of the log, a record cut by a crash is ignored.
+        @param self The current object
+        @return The list of PlayerRecords sorted by score, ties in the order they were saved.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if not os.path.isfile(self.fileName):                                               # Check if the file exists
+            return []                                                                       # There are no records
+        with open(self.fileName, "rb") as file:                                             # Open the file to read bytes
+            allBytes = file.read()                                                          # Read all the bytes
+        complete = len(allBytes) - len(allBytes) % RECORD.size                              # Ignore an incomplete record
+        records = [PlayerRecord.PlayerRecord(name.decode("ascii", "replace"), score)        # Parse all the records at once
+                   for name, score in RECORD.iter_unpack(memoryview(allBytes)[:complete])]
+        records.sort(key = lambda record: record.getScore(), reverse = True)               # Sort by score keeping the save order on ties
+        return records                                                                      # Return the records
+
+    def loadRecords(self):
+        '''
+        Loads the records while no other instance is writing.
+        @param self The current object
+        @return The list of PlayerRecords sorted by score.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with ScoreLock(self.lockName, False):       # Take the read lock
+            return self.readRecords()               # Read the records
+
+    def appendRecord(self, record):
+        '''
+        Appends a record to the log and compacts the log when it has grown too much.
+        @param self The current object
+        @param record The PlayerRecord.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.appendRecords([record])                # Append a single record
+
+    def appendRecords(self, records):
+        '''
+        Appends several records to the log with a single write.
+        @param self The current object
+        @param records The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        data = b"".join(RECORD.pack(bytes(record.getName(), "ascii"), record.getScore()) for record in records)    # Pack the records
+        with ScoreLock(self.lockName, True):                                                        # Take the write lock
+            file = os.open(self.fileName, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)     # Open the file to append
+            try:
+                size = os.fstat(file).st_size                                                       # Get the file size
+                if size % RECORD.size:                                                              # Check if a crash left an incomplete record
+                    os.ftruncate(file, size - size % RECORD.size)                                   # Remove the incomplete record
+                    size = size - size % RECORD.size                                                # Update the size
+                os.write(file, data)                                                                # Append the records
+                os.fsync(file)                                                                      # Make sure they reach the disk
+            finally:
+                os.close(file)                                                                      # Close the file
+            if (size + len(data)) // RECORD.size > self.keep * ScoreLog.COMPACT_FACTOR:             # Check if the log grew too much
+                self.compact()                                                                      # Compact it
+
+    def compact(self):
+        '''
+        Rewrites the log with only the best records, the caller must hold the write lock.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        records = self.readRecords()[:self.keep]                                                    # Keep the best records
+        temporaryName = self.fileName + ".tmp"                                                      # Get the temporary file name
+        with open(temporaryName, "wb") as file:                                                     # Open the temporary file
+            for record in records:                                                                  # Loop through the records
+                file.write(RECORD.pack(bytes(record.getName(), "ascii"), record.getScore()))        # Write the record
+            file.flush()                                                                            # Flush the buffer
+            os.fsync(file.fileno())                                                                 # Make sure it reaches the disk
+        os.replace(temporaryName, self.fileName)                                                    # Replace the log atomically
@@ -0,0 +1,206 @@
+'''
+This class represents a background thread that saves the scores without stalling the game loop.
+
+The game hands the records to a bounded queue and returns at once. The thread
+waits a moment for more records and writes everything queued in a single call
+to every sink, so rapid saves are coalesced into one write. The game can also
+hand it a function, such as a query of the score history, that runs in the
+thread after the records queued before it are written. A record stays
+pending until every sink wrote it; a sink that fails is given the records it
+missed again on the next write or after a retry time, and the sinks that
+succeeded are not given them twice.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import queue
+import sys
+import threading
+import time
+import traceback
+
+class ScoreWriter(object):
+    '''
+    Variables:
+    COALESCE_TIME: The time the thread waits for more records before writing
+    RETRY_TIME: The time the thread waits before giving a failed sink its records again
+    sinks: The functions that write a list of records
+    queue: The bounded queue of records to write
+    overflow: The records and functions that didn't fit in the queue
+    pending: The records submitted and not written by every sink yet
+    taken: The number of pending records the thread took from the queue
+    written: The number of pending records every sink wrote, in the order of the sinks
+    lock: The lock that protects the pending records
+    writing: The lock held while a sink writes, so a reader sees its file and the pending records agree
+    thread: The writer thread
+    closed: True if the writer was closed
+    '''
+    COALESCE_TIME = 0.05        # The time the thread waits for more records before writing
+    RETRY_TIME = 5              # The time the thread waits before giving a failed sink its records again
+
+    def __init__(self, sinks, maxSize = 64):
+        '''
+        Creates a new ScoreWriter and starts its thread.
+        @param self The current object
+        @param sinks The functions that write a list of records.
+        @param maxSize The size of the queue.
+        @return A new instance of the ScoreWriter
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.sinks = sinks                                                  # Set the sinks
+        self.queue = queue.Queue(maxSize)                                   # Create the bounded queue
+        self.overflow = []                                                  # Nothing overflowed yet
+        self.pending = []                                                   # Nothing pending yet
+        self.taken = 0                                                      # Nothing taken yet
+        self.written = [0] * len(sinks)                                     # Nothing written yet
+        self.lock = threading.Lock()                                        # Create the lock
+        self.writing = threading.Lock()                                     # Create the write lock
+        self.closed = False                                                 # The writer is open
+        self.thread = threading.Thread(target = self.run, name = "ScoreWriter", daemon = True)   # Create the thread
+        self.thread.start()                                                 # Start the thread
+
+    def submit(self, record):
+        '''
+        Queues a record to be written, never waits.
+        @param self The current object
+        @param record The PlayerRecord.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                                         # Take the lock
+            self.pending.append(record)                         # Remember the record until it is written
+        self.enqueue(record)                                    # Queue the record
+
+    def call(self, function):
+        '''
+        Runs a function in the thread once the records submitted before it are written, never waits.
+        @param self The current object
+        @param function The function, called without arguments.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.enqueue(function)                                  # Queue the function after the records
+
+    def enqueue(self, item):
+        '''
+        Queues a record or a function after the ones waiting for room, never waits.
+        @param self The current object
+        @param item The PlayerRecord or the function.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        self.overflow.append(item)                              # Add the item after the ones waiting
+        while self.overflow:                                    # Loop through the waiting items
+            try:
+                self.queue.put_nowait(self.overflow[0])         # Queue the item
+            except queue.Full:
+                return                                          # Try again on the next submit or on close
+            del self.overflow[0]                                # The item is queued
+
+    def getPending(self, sink):
+        '''
+        Returns the records submitted that a sink didn't write yet, hold the write lock to read the sink's file at the same time.
+        @param self The current object
+        @param sink The sink.
+        @return The list of PlayerRecords.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        with self.lock:                                                 # Take the lock
+            return self.pending[self.written[self.sinks.index(sink)]:]  # Return a copy of the ones after the written ones
+
+    def run(self):
+        '''
+        Writes the queued records until the writer is closed.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        running = True                                                          # The thread is running
+        while running:                                                          # Loop until the writer is closed
+            items = []                                                          # Nothing taken yet
+            failed = min(self.written, default = 0) < self.taken                # Check if a sink missed records
+            try:
+                items.append(self.queue.get(timeout = ScoreWriter.RETRY_TIME if failed else None))     # Wait for a record
+                while True:                                                     # Coalesce the records that follow
+                    items.append(self.queue.get(timeout = ScoreWriter.COALESCE_TIME))   # Wait for another record
+            except queue.Empty:
+                pass                                                            # No more records for now
+            if None in items:                                                   # Check if the writer was closed
+                running = False                                                 # Stop after this write
+            functions = [item for item in items if callable(item)]              # Get the functions
+            self.taken = self.taken + len(items) - len(functions) - items.count(None)   # The records are in the pending ones in the same order
+            self.write()                                                        # Give every sink the records it missed
+            for function in functions:                                          # Loop through the functions
+                try:
+                    function()                                                  # Run it after the write
+                except Exception:
+                    traceback.print_exc(file = sys.stderr)                      # Report the error and keep writing
+
+    def write(self):
+        '''
+        Gives every sink the taken records it didn't write, and forgets the ones every sink wrote.
+        @param self The current object
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        for index, sink in enumerate(self.sinks):                               # Loop through the sinks
+            with self.lock:                                                     # Take the lock
+                records = self.pending[self.written[index]:self.taken]          # Get the records the sink missed
+            if not records:                                                     # Check if the sink is up to date
+                continue                                                        # Skip it
+            with self.writing:                                                  # Let no reader in until the sink and the pending records agree
+                try:
+                    sink(records)                                               # Write the records
+                except Exception:
+                    traceback.print_exc(file = sys.stderr)                      # Report the error, the records stay pending for the sink
+                    continue                                                    # Keep the other sinks
+                with self.lock:                                                 # Take the lock
+                    self.written[index] = self.taken                            # The sink wrote them
+        with self.lock:                                                         # Take the lock
+            done = min(self.written, default = self.taken)                      # Get the records every sink wrote
+            del self.pending[:done]                                             # Forget them
+            self.written = [count - done for count in self.written]             # Count from the first pending record
+            self.taken = self.taken - done                                      # Count from the first pending record
+
+    def close(self, timeout = None):
+        '''
+        Writes every record still queued and stops the thread.
+        @param self The current object
+        @param timeout The longest time to wait, None to wait until everything is written.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.closed:                                                         # Check if it was already closed
+            return                                                              # Nothing to do
+        self.closed = True                                                      # Close the writer
+        deadline = None if timeout == None else time.monotonic() + timeout      # Get the time to give up
+        remaining = lambda: None if deadline == None else max(0, deadline - time.monotonic())     # The time left
+        try:
+            while self.overflow:                                                # Loop through the records that didn't fit
+                self.queue.put(self.overflow[0], timeout = remaining())         # Queue the record, waiting for room
+                del self.overflow[0]                                            # The record is queued
+            self.queue.put(None, timeout = remaining())                         # Queue the close marker
+        except queue.Full:
+            with self.lock:                                                     # Take the lock
+                print("Scores: %d records not saved in time" % len(self.pending), file = sys.stderr)   # Report the records left
+            return                                                              # Give up
+        self.thread.join(remaining())                                           # Wait for the thread to write everything
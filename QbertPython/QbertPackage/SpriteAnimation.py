@@ -6,6 +6,36 @@ Class that Animates a sprite list.
 @since: 13 nov. 2022
 '''
 import pygame
+from QbertPackage import QbertView
+from QbertPackage import QbertQuality
+
+frameCache = {}         # The frames already cut by sprite sheet, line and resolution
+
+def cutFrames(image, frames, spriteWidth, spriteHeight, start):
+    '''
+    Returns the frames of a line of a sprite sheet at the render resolution, cutting them only once.
+    @param image The sprite sheet.
+    @param frames The number of frames.
+    @param spriteWidth The sprite width.
+    @param spriteHeight The sprite height.
+    @param start The line.
+    @return The list of frame surfaces.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    key = (id(image), frames, spriteWidth, spriteHeight, start, QbertView.scale)                            # The frames only depend on the sheet, the line and the resolution
+    if key not in frameCache:                                                                               # Check if the frames were not cut yet
+        converted = image.convert_alpha()                                                                   # Loads the image
+        rectangles = [None] * frames                                                                        # Create the rectangles
+        for frameCounter in range(frames):                                                                  # Loop through the rectangles
+            rectangles[frameCounter] = pygame.Surface((spriteWidth, spriteHeight), pygame.SRCALPHA, 32).convert_alpha()         # Create the Rectangle
+            rectangles[frameCounter].blit(converted, (0,0),  # Blit the image into the rectangle
+                            (spriteWidth * frameCounter, start * spriteHeight, spriteWidth, spriteHeight))
+            rectangles[frameCounter] = QbertView.scaleImage(rectangles[frameCounter])    # Scale the frame to the render resolution
+        frameCache[key] = (image, rectangles)                                                               # Keep the sheet so its id is not reused
+    return frameCache[key][1]                                                                               # Return the frames
 
 class SpriteAnimation(object):
     '''
@@ -15,6 +45,8 @@ class SpriteAnimation(object):
     timeToUpdate: Time to update
     timeElapsed: The tie elapsed since last update
     image: The texture
+    sheet: The number of frames, the sprite size and the line in the texture
+    scale: The render scale the frames were cut for
     rectangles: The Rectangles
     position: The position
     '''
@@ -23,7 +55,7 @@ class SpriteAnimation(object):
         '''
         Creates a new instance of a SpriteAnimation given the texture and number of frames.
         @param self The current object
-        @param image The animation texture
+        @param image The animation texture, None for a headless animation that only counts its frames
         @param frames The number of frames
         @param spriteWidth The sprite width
         @param spriteHeight The sprite height
@@ -38,12 +70,13 @@ class SpriteAnimation(object):
         self.isLooping = False                                                                                  # Set isLooping to False
         self.timeToUpdate = 1/20                                                                                # Set the timeToupdate to 1/20
         self.timeElapsed = 0                                                                                    # Set the timeElapsed to 0
-        self.image = image.convert_alpha()                                                                      # Loads the image
-        self.rectangles = [None] * frames                                                                       # Create the rectangles
-        for frameCounter in range(frames):                                                                      # Loop through the rectangles
-            self.rectangles[frameCounter] = pygame.Surface((spriteWidth, spriteHeight), pygame.SRCALPHA, 32).convert_alpha()         # Create the Rectangle
-            self.rectangles[frameCounter].blit(self.image, (0,0),  # Blit the image into the rectangle
-                            (spriteWidth * frameCounter, start * spriteHeight, spriteWidth, spriteHeight))
+        if image == None:                                                                                       # Check if the animation is headless
+            self.image, self.rectangles = None, [None] * frames                                                 # Count the frames without surfaces
+            return
+        self.image = image                                                                                      # Keep the sheet to cut it again at another resolution
+        self.sheet = (frames, spriteWidth, spriteHeight, start)                                                 # Keep where the frames are
+        self.scale = QbertView.scale                                                                            # Remember the resolution
+        self.rectangles = cutFrames(image, frames, spriteWidth, spriteHeight, start)                            # Share the frames, they are never changed
         
     def setFramesPersecond(self, framesPerSecond):
         '''
@@ -67,8 +100,24 @@ class SpriteAnimation(object):
         @version 1.0
         @since 13 nov. 2022
         '''
-        screen.blit(self.rectangles[self.frameIndex], (position.x, position.y))       # Display the frame
+        screen.blit(self.getFrame(), QbertView.scalePoint(position))  # Display the frame
         
+    def getFrame(self):
+        '''
+        Returns the current frame, cut again if the render resolution changed.
+        At a low quality only every other frame is shown.
+        @param self The current object
+        @return The frame surface at the render resolution.
+
+        @author: Dario Urdapilleta
+        @version 1.0
+        @since 19 oct. 2026
+        '''
+        if self.scale != QbertView.scale:                               # Check if the render resolution changed
+            self.scale = QbertView.scale                                # Remember the resolution
+            self.rectangles = cutFrames(self.image, *self.sheet)        # Get the frames at the new resolution
+        return self.rectangles[self.frameIndex - self.frameIndex % QbertQuality.getFrameStep()]     # Return the frame, held for a step
+
     def update(self, time):
         '''
         Updates the sprite animation
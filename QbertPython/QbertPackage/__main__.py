@@ -0,0 +1,112 @@
+'''
+This module starts the game from the command line.
+
+The flags are parsed before the game is imported, so the help shows at once
+and the headless mode can choose the SDL drivers before pygame starts. The
+import report runs the import of the game in a new interpreter with
+-X importtime and shows the modules that take most of the startup.
+
+Usage:
+python -m QbertPackage
+python -m QbertPackage --windowed --resolution 1280x720 --fps 60
+python -m QbertPackage --headless
+python -m QbertPackage --import-report
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))      # The directory of the game
+SCORE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".blobert") # The directory the scores are kept in by default
+SEED_SCORES = "scores.dat"                                          # The score file shipped with the game, it is never written
+REPORT_MODULE = "QbertPackage.Qbert"                                # The module imported by the import report
+
+def reportImports(top):
+    '''
+    Imports the game in a new interpreter and shows where the startup time goes.
+    @param top The number of modules shown.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    environment = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT = "1")                            # The report should only have the times
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(PACKAGE_DIRECTORY), environment.get("PYTHONPATH")]))    # Find the package
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + REPORT_MODULE],
+                            env = environment, capture_output = True, text = True)              # Import the game
+    rows = []                                                                                   # The self time, cumulative time, name and top import of every module
+    stack = []                                                                                  # The modules still being imported, innermost last
+    for line in reversed(result.stderr.splitlines()):                                           # A module is printed after its imports, so read from the end
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:       # Check if it is a time line
+            continue                                                                            # Skip the header and the errors
+        selfTime, cumulative, name = line[len("import time:"):].split("|")                      # Split the columns
+        depth = (len(name) - len(name.lstrip())) // 2                                           # Get the import depth from the indentation
+        del stack[depth:]                                                                       # Leave the modules at the same depth or deeper
+        stack.append(name.strip())                                                              # Enter the module
+        rows.append((int(selfTime) / 1000, int(cumulative) / 1000, name.strip(), stack[min(1, len(stack) - 1)]))
+    if not rows:                                                                                # Check if the import failed
+        print(result.stderr, file = sys.stderr)                                                 # Show the error
+        sys.exit(1)                                                                             # Fail the report
+    total = sum(row[0] for row in rows)                                                         # Get the time of every import
+    print("Import: %s took %.1f ms, %d modules" % (REPORT_MODULE, total, len(rows)))
+    print("%9s %9s  %-44s %s" % ("self ms", "cumul ms", "module", "imported by"))
+    for selfTime, cumulative, name, owner in sorted(rows, reverse = True)[:top]:               # Loop through the slowest modules
+        print("%9.1f %9.1f  %-44s %s" % (selfTime, cumulative, name, owner if owner != name else ""))
+
+def prepareScores(directory):
+    '''
+    Creates the score directory, a new one starts with the scores shipped with the game.
+    @param directory The directory of the score files.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    os.makedirs(directory, exist_ok = True)                                                     # Create the directory
+    path = os.path.join(directory, SEED_SCORES)                                                 # Get the score file
+    if not os.path.exists(path):                                                                # Check if the directory is new
+        shutil.copyfile(os.path.join(PACKAGE_DIRECTORY, SEED_SCORES), path)                     # Start with the shipped scores
+
+def main(argv = None):
+    '''
+    Runs the game from the command line.
+    @param argv The command line arguments.
+
+    @author: Dario Urdapilleta
+    @version 1.0
+    @since 19 oct. 2026
+    '''
+    parser = argparse.ArgumentParser(prog = "QbertPackage", description = "Plays Blo*Bert.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--fullscreen", dest = "fullscreen", action = "store_true", default = True, help = "Fill the screen, the default")
+    mode.add_argument("--windowed", dest = "fullscreen", action = "store_false", help = "Open a window")
+    parser.add_argument("--resolution", help = "The render resolution as WIDTHxHEIGHT, BLOBERT_RESOLUTION by default")
+    parser.add_argument("--fps", type = int, default = 0, help = "The most frames drawn per second, every snapshot by default")
+    parser.add_argument("--headless", action = "store_true", help = "Run without a screen or sound, to stream the game to spectators")
+    parser.add_argument("--scores", default = SCORE_DIRECTORY, help = "The directory of the score files, %s by default" % SCORE_DIRECTORY)
+    parser.add_argument("--import-report", action = "store_true", help = "Show where the startup time goes and exit")
+    parser.add_argument("--top", type = int, default = 20, help = "The modules shown by the import report")
+    arguments = parser.parse_args(argv)                                                         # Parse the arguments
+    if arguments.import_report:                                                                 # Check if only the report was asked
+        reportImports(arguments.top)                                                            # Show it
+        return
+    if arguments.resolution != None:                                                            # Check if the resolution was given
+        width, _, height = arguments.resolution.lower().partition("x")                          # Split the width and height
+        if not (width.isdigit() and height.isdigit()):                                          # Check if it is a resolution
+            parser.error("--resolution has to be WIDTHxHEIGHT")                                 # Stop
+    if arguments.headless:                                                                      # Check if there is no screen
+        os.environ["SDL_VIDEODRIVER"] = "dummy"                                                 # Draw offscreen
+        os.environ["SDL_AUDIODRIVER"] = "dummy"                                                 # Play no sound
+        arguments.fullscreen = False                                                            # There is no screen to fill
+    prepareScores(arguments.scores)                                                             # The scores shipped in the package are only a seed
+    from QbertPackage import Qbert                                                              # Import the game once the drivers are chosen
+    Qbert.main(arguments.fullscreen, arguments.resolution, arguments.fps, arguments.scores)     # Play
+
+if __name__ == "__main__":
+    main()
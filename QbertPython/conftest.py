@@ -0,0 +1,12 @@
+'''
+Lets the tests import the QbertPackage from this directory.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")                    # Keep the test output clean
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))              # Find the package
@@ -0,0 +1,52 @@
+'''
+Tests the ranks of the full score history.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import os
+import tempfile
+import unittest
+from QbertPackage import PlayerRecord
+from QbertPackage import LeaderboardStore
+
+class LeaderboardStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.directory.name, "scores.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testRanksWithTies(self):
+        '''
+        A score ranks after the better scores, tied with the scores equal to it.
+        '''
+        store = LeaderboardStore.LeaderboardStore(self.fileName)
+        store.addRecords([PlayerRecord.PlayerRecord(name, score) for name, score in
+                          (("AAA", 500), ("BBB", 400), ("CCC", 400), ("DDD", 300), ("EEE", 200))])
+        ranks = [store.getRank(score) for score in (600, 500, 450, 400, 350, 250, 150, 0)]
+        self.assertEqual(ranks, [1, 1, 2, 2, 4, 5, 6, 6])                  # The two 400 take ranks 2 and 3
+        self.assertEqual(store.getCount(), 5)
+        store.close()
+
+    def testRanksSurviveReopening(self):
+        '''
+        The rank tree saved by a cabinet is used by the next one.
+        '''
+        store = LeaderboardStore.LeaderboardStore(self.fileName)
+        store.addRecord(PlayerRecord.PlayerRecord("AAA", 500))
+        store.addRecord(PlayerRecord.PlayerRecord("BBB", 400))
+        store.close()
+        store = LeaderboardStore.LeaderboardStore(self.fileName)          # Open the same database again
+        store.addRecord(PlayerRecord.PlayerRecord("AAA", 450))
+        self.assertEqual(store.getCount(), 3)
+        self.assertEqual(store.getRank(450), 2)
+        self.assertEqual(store.getBestScore("AAA"), 500)                  # The lower score doesn't replace the best one
+        self.assertEqual([record.getScore() for record in store.getTopScores(2)], [500, 450])
+        store.close()
+
+if __name__ == "__main__":
+    unittest.main()
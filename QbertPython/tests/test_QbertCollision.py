@@ -0,0 +1,48 @@
+'''
+Tests the swept collisions of the beings that move up to MAX_STEP in a tick.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import unittest
+from QbertPackage import QbertCollision
+
+STEP = QbertCollision.MAX_STEP                  # The longest move that is still swept
+GAP = QbertCollision.COLLISION_RADIUS - 0.03    # The side distance of two beings that pass each other
+
+class QbertCollisionTest(unittest.TestCase):
+
+    def testBeingsCrossingInATickCollide(self):
+        '''
+        Two beings that pass each other moving MAX_STEP collide although they are apart at both ends of the tick.
+        '''
+        start, end = (0, 0, 0), (STEP, 0, 0)                            # The player moves right
+        otherStart, otherEnd = (STEP, GAP, 0), (0, GAP, 0)              # The enemy moves left beside it
+        self.assertGreaterEqual(QbertCollision.getDistance(start, otherStart), QbertCollision.COLLISION_RADIUS)
+        self.assertGreaterEqual(QbertCollision.getDistance(end, otherEnd), QbertCollision.COLLISION_RADIUS)
+        self.assertLess(QbertCollision.getClosestDistance(start, end, otherStart, otherEnd), QbertCollision.COLLISION_RADIUS)
+
+    def testGridFindsBeingsInNeighbouringCells(self):
+        '''
+        The grid finds a being that crossed the player from the cell next to it.
+        '''
+        grid = QbertCollision.CollisionGrid()
+        otherStart, otherEnd = (0.5 + STEP / 2, GAP, 0), (0.5 - STEP / 2, GAP, 0)    # The enemy crosses a cell border
+        grid.add("enemy", otherStart, otherEnd)
+        start, end = (0.5 - STEP / 2, 0, 0), (0.5 + STEP / 2, 0, 0)                  # The player crosses it the other way
+        self.assertNotEqual(QbertCollision.getCellKey(end), QbertCollision.getCellKey(otherEnd))
+        self.assertEqual(list(grid.query(start, end, QbertCollision.COLLISION_RADIUS)), ["enemy"])
+
+    def testBeingsMovingTogetherDontCollide(self):
+        '''
+        Two beings that move MAX_STEP side by side farther than the radius don't collide.
+        '''
+        grid = QbertCollision.CollisionGrid()
+        grid.add("enemy", (0, 0.6, 0), (STEP, 0.6, 0))                 # The enemy moves beside the player
+        start, end = (0, 0, 0), (STEP, 0, 0)
+        self.assertGreaterEqual(QbertCollision.getClosestDistance(start, end, (0, 0.6, 0), (STEP, 0.6, 0)), QbertCollision.COLLISION_RADIUS)
+        self.assertEqual(list(grid.query(start, end, QbertCollision.COLLISION_RADIUS)), [])
+
+if __name__ == "__main__":
+    unittest.main()
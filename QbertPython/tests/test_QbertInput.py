@@ -0,0 +1,66 @@
+'''
+Tests the moves buffered while the player is jumping.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import random
+import unittest
+from QbertPackage import QbertInput
+from QbertPackage import QbertHost
+from QbertPackage import GameThread
+
+TICK_TIME = 1 / GameThread.GameThread.TICK_RATE         # The time of a tick
+
+class InputBufferTest(unittest.TestCase):
+
+    def testMovePressedEarlyInAJumpIsKept(self):
+        '''
+        A move pressed at the start of a jump longer than MAX_AGE is applied when it lands.
+        '''
+        buffer = QbertInput.InputBuffer()
+        self.assertEqual(buffer.pop(0), None)                           # The player can jump and there is no move
+        buffer.wait()                                                   # The player jumps
+        buffer.push(2, 0.1)                                             # The move is pressed early in the jump
+        self.assertEqual(buffer.pop(0.1 + QbertInput.InputBuffer.MAX_AGE * 2), 2)    # The jump lands
+        self.assertEqual(buffer.dropped, 0)
+
+    def testMoveLeftWaitingIsDropped(self):
+        '''
+        A move that waits longer than MAX_AGE once the player can jump is dropped.
+        '''
+        buffer = QbertInput.InputBuffer()
+        buffer.wait()                                                   # The player jumps
+        buffer.push(2, 0.1)                                             # The move is pressed in the jump
+        self.assertEqual(buffer.pop(1 + QbertInput.InputBuffer.MAX_AGE * 2), 2)    # It is used when the jump lands
+        buffer.pop(2)                                                   # The player can jump from now on
+        buffer.push(3, 1)                                               # A move pressed before the player could jump
+        self.assertEqual(buffer.pop(2 + QbertInput.InputBuffer.MAX_AGE * 2), None)  # It waited too long
+        self.assertEqual(buffer.dropped, 1)
+
+    def testHostSessionAppliesMoveSentEarlyInAJump(self):
+        '''
+        A move sent a few ticks into a jump of a headless game is applied on landing.
+        '''
+        random.seed(1)
+        session = QbertHost.HostSession(1)
+        while session.player.isMoving:                                  # Wait for the player to drop on the top block
+            session.step(TICK_TIME)
+        session.move(2)                                                 # Jump down
+        for tick in range(6):
+            session.step(TICK_TIME)                                     # Start the jump
+        self.assertTrue(session.player.isMoving)
+        session.move(3)                                                 # Send the next move early in the jump
+        jumpTicks = 0
+        while session.player.isMoving:                                  # Wait for the jump to land
+            session.step(TICK_TIME)
+            jumpTicks = jumpTicks + 1
+            self.assertLess(jumpTicks, 600)
+        session.step(TICK_TIME)                                         # The next move is taken
+        self.assertTrue(session.player.isMoving)
+        self.assertEqual(session.inputBuffer.dropped, 0)
+        self.assertEqual(len(session.inputBuffer.latencies), 2)
+
+if __name__ == "__main__":
+    unittest.main()
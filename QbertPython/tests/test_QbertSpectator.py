@@ -0,0 +1,57 @@
+'''
+Tests the keyframes and deltas streamed to the spectators.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import unittest
+from QbertPackage import QbertSpectator
+
+FIRST = (2, 1, 150, 3, 0b101, {0: (0, 0, 0, 0, 10, 1), 1: (1, 2, 500, -250, 0, 2)})     # The state of the keyframe
+SECOND = (2, 1, 175, 3, 0b111, {0: (0, 0, 0, 0, 10, 1), 1: (1, 2, 750, -500, 0, 2), 2: (3, 1, 0, 0, 20, 0x22)})    # A score, a move and a new enemy
+THIRD = (2, 2, 175, 2, 0, {0: (1, 1, -1000, 0, 0, 0x11)})                                 # A new level, a lost life and the enemies gone
+
+class SpectatorStreamTest(unittest.TestCase):
+
+    def assertDecoded(self, decoder, state):
+        self.assertEqual((decoder.gameState, decoder.level, decoder.score, decoder.lives, decoder.board), state[:5])
+        self.assertEqual(decoder.beings, state[5])
+
+    def testKeyframeAndDeltasRebuildTheState(self):
+        '''
+        A spectator rebuilds every tick from a keyframe and the deltas after it.
+        '''
+        decoder = QbertSpectator.SpectatorDecoder()
+        self.assertEqual(decoder.feed(QbertSpectator.encodeKeyframe(1, FIRST)), 1)
+        self.assertDecoded(decoder, FIRST)
+        self.assertEqual(decoder.feed(QbertSpectator.encodeDelta(2, FIRST, SECOND)), 1)
+        self.assertDecoded(decoder, SECOND)
+        self.assertEqual(decoder.feed(QbertSpectator.encodeDelta(3, SECOND, THIRD)), 1)
+        self.assertDecoded(decoder, THIRD)
+        self.assertEqual((decoder.tick, decoder.keyframes, decoder.deltas), (3, 1, 2))
+
+    def testDeltaOnlySendsTheChanges(self):
+        '''
+        A delta of a tick where nothing changed only has the header and the empty masks.
+        '''
+        frame = QbertSpectator.encodeDelta(2, FIRST, FIRST)
+        self.assertEqual(len(frame), QbertSpectator.HEADER.size + 2 * QbertSpectator.BYTE.size)     # The field mask and no beings
+        self.assertLess(len(QbertSpectator.encodeDelta(2, FIRST, SECOND)), len(QbertSpectator.encodeKeyframe(2, SECOND)))
+
+    def testDeltasBeforeAKeyframeAreIgnored(self):
+        '''
+        A spectator that joins between keyframes waits for the next one, even if the frames arrive split.
+        '''
+        decoder = QbertSpectator.SpectatorDecoder()
+        stream = QbertSpectator.encodeDelta(2, FIRST, SECOND) + QbertSpectator.encodeKeyframe(3, SECOND) + QbertSpectator.encodeDelta(4, SECOND, THIRD)
+        frames = 0
+        for offset in range(0, len(stream), 5):                         # The bytes arrive a few at a time
+            frames = frames + decoder.feed(stream[offset:offset + 5])
+        self.assertEqual(frames, 3)                                     # Every frame was read
+        self.assertEqual(decoder.buffer, b"")
+        self.assertDecoded(decoder, THIRD)
+        self.assertEqual((decoder.tick, decoder.keyframes, decoder.deltas), (4, 1, 1))     # The first delta was skipped
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+'''
+Tests the score log that keeps the saved scores across crashes.
+
+@author: Dario Urdapilleta
+@version 1.0
+@since: 19 oct. 2026
+'''
+import os
+import tempfile
+import unittest
+from QbertPackage import PlayerRecord
+from QbertPackage import ScoreLog
+
+class ScoreLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.directory.name, "scores.dat")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testTornTailIsIgnoredAndTruncated(self):
+        '''
+        A record cut by a crash is not read and is removed by the next append.
+        '''
+        log = ScoreLog.ScoreLog(self.fileName, 10)
+        log.appendRecords([PlayerRecord.PlayerRecord("AAA", 300), PlayerRecord.PlayerRecord("BBB", 200)])
+        with open(self.fileName, "ab") as file:
+            file.write(ScoreLog.RECORD.pack(b"CCC", 900)[:4])           # A crash cuts the next record
+        self.assertEqual([record.getScore() for record in log.readRecords()], [300, 200])
+        log.appendRecord(PlayerRecord.PlayerRecord("DDD", 100))         # The next save removes the cut record
+        self.assertEqual(os.path.getsize(self.fileName), 3 * ScoreLog.RECORD.size)
+        records = log.readRecords()
+        self.assertEqual([record.getName() for record in records], ["AAA", "BBB", "DDD"])
+        self.assertEqual([record.getScore() for record in records], [300, 200, 100])
+
+    def testLogGrowingTooMuchIsCompacted(self):
+        '''
+        The log keeps the best records, ties in the order they were saved, once it grows past COMPACT_FACTOR.
+        '''
+        log = ScoreLog.ScoreLog(self.fileName, 2)
+        limit = 2 * ScoreLog.ScoreLog.COMPACT_FACTOR
+        log.appendRecords([PlayerRecord.PlayerRecord("AAA", 100)] * limit)     # The log is full but not compacted
+        self.assertEqual(os.path.getsize(self.fileName), limit * ScoreLog.RECORD.size)
+        log.appendRecords([PlayerRecord.PlayerRecord("BBB", 500), PlayerRecord.PlayerRecord("CCC", 500)])   # Grow past the limit
+        self.assertEqual(os.path.getsize(self.fileName), 2 * ScoreLog.RECORD.size)
+        records = log.readRecords()
+        self.assertEqual([record.getName() for record in records], ["BBB", "CCC"])
+        self.assertFalse(os.path.exists(self.fileName + ".tmp"))       # The temporary file replaced the log
+
+    def testCompactKeepsTheBestRecords(self):
+        '''
+        Compacting keeps only the best records and a tie keeps the record saved first.
+        '''
+        log = ScoreLog.ScoreLog(self.fileName, 3)
+        log.appendRecords([PlayerRecord.PlayerRecord(name, score) for name, score in
+                           (("AAA", 100), ("BBB", 400), ("CCC", 200), ("DDD", 400), ("EEE", 200))])
+        log.compact()
+        records = log.readRecords()
+        self.assertEqual([record.getName() for record in records], ["BBB", "DDD", "CCC"])
+        self.assertEqual([record.getScore() for record in records], [400, 400, 200])
+
+if __name__ == "__main__":
+    unittest.main()